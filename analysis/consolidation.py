@@ -56,4 +56,137 @@ def detect_consolidation_pattern(df, period=20, threshold_pct=8.0) -> Consolidat
             detected=False, duration=0, range_pct=0, 
             breakout_type='none', breakout_strength=0,
             support=0, resistance=0
-        )
\ No newline at end of file
+        )
+
+def consolidation_feature_frame(df, period=20, threshold_pct=8.0) -> pd.DataFrame:
+    """
+    Kayan konsolidasyon özellikleri - her bar için detect_consolidation_pattern karşılığı (yuvarlamasız).
+    Sütunlar: Consolidation, Consolidation_Range_Pct, Consolidation_Breakout,
+              Consolidation_Strength, Consolidation_Support, Consolidation_Resistance
+    """
+    high_range = df['high'].rolling(period, min_periods=period).max().to_numpy(dtype=float)
+    low_range = df['low'].rolling(period, min_periods=period).min().to_numpy(dtype=float)
+    close = df['close'].to_numpy(dtype=float)
+    rel_vol = df['Relative_Volume'].to_numpy(dtype=float) if 'Relative_Volume' in df.columns else np.ones(len(df))
+    rsi = df['RSI'].to_numpy(dtype=float) if 'RSI' in df.columns else np.full(len(df), 50.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mid_price = (high_range + low_range) / 2
+        range_pct = (high_range - low_range) / mid_price * 100
+    is_consolidating = range_pct < threshold_pct
+    breakout_type, breakout_strength = _breakout_state(is_consolidating, close, high_range, rel_vol, rsi)
+
+    return pd.DataFrame({
+        'Consolidation': is_consolidating,
+        'Consolidation_Range_Pct': range_pct,
+        'Consolidation_Breakout': breakout_type,
+        'Consolidation_Strength': breakout_strength,
+        'Consolidation_Support': low_range,
+        'Consolidation_Resistance': high_range
+    }, index=df.index)
+
+
+def _breakout_state(is_consolidating, close, resistance, rel_vol, rsi):
+    """Kırılım tipi ve gücü (detect_consolidation_pattern kuralları, vektörel)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        upward = is_consolidating & (close > resistance)
+        potential = is_consolidating & ~upward & (close > resistance * 0.98) & (rel_vol > 1.3)
+        upward_strength = (
+            np.minimum((close - resistance) / resistance * 100 * 10, 40) +
+            np.minimum((rel_vol - 1) * 30, 30) +
+            np.where(rsi > 50, 20, 10)
+        )
+    breakout_type = np.select([upward, potential], ['upward', 'potential_upward'], 'none')
+    breakout_strength = np.select([upward, potential], [upward_strength, 60.0], 0.0)
+    return breakout_type, breakout_strength
+
+
+class RangeTable:
+    """
+    Seyrek tablo (sparse table) - O(n log n) kurulum, O(1) aralık max/min sorgusu.
+    NaN değerler atlanır (pandas rolling max/min gibi).
+    """
+    def __init__(self, highs: np.ndarray, lows: np.ndarray):
+        self.max_levels = [np.asarray(highs, dtype=float)]
+        self.min_levels = [np.asarray(lows, dtype=float)]
+        span = 1
+        while span * 2 <= len(self.max_levels[0]):
+            prev_max, prev_min = self.max_levels[-1], self.min_levels[-1]
+            self.max_levels.append(np.fmax(prev_max[:-span], prev_max[span:]))
+            self.min_levels.append(np.fmin(prev_min[:-span], prev_min[span:]))
+            span *= 2
+
+    def query(self, start: np.ndarray, length: int):
+        """[start, start + length) aralıklarının (max, min) değerleri - start dizisi için vektörel"""
+        level = length.bit_length() - 1
+        offset = length - (1 << level)
+        maxes, mins = self.max_levels[level], self.min_levels[level]
+        return (np.fmax(maxes[start], maxes[start + offset]),
+                np.fmin(mins[start], mins[start + offset]))
+
+
+def consolidation_bases(df, min_period=10, max_period=60, threshold_pct=8.0) -> pd.DataFrame:
+    """
+    Çok pencereli konsolidasyon taraması - her bar için min_period..max_period arası
+    tüm pencere uzunlukları tek geçişte (seyrek tablo ile O(1) sorgu) test edilir.
+
+    Taban, mevcut bardan ÖNCEKİ barlarda aranır; böylece mevcut barın tabandan
+    kırılımı ölçülebilir. Aralık pencere uzadıkça büyüyemeyeceği için (azalmaz),
+    eşiği sağlayan en uzun pencere raporlanır.
+    Sütunlar: Base_Length (0 = taban yok), Base_Range_Pct, Base_Support,
+              Base_Resistance, Base_Breakout, Base_Breakout_Strength
+    """
+    n = len(df)
+    base_length = np.zeros(n, dtype=int)
+    base_range_pct = np.full(n, np.nan)
+    base_support = np.full(n, np.nan)
+    base_resistance = np.full(n, np.nan)
+
+    table = RangeTable(df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float))
+    bars = np.arange(n)
+    for length in range(min_period, min(max_period, n - 1) + 1):
+        ends = bars[length:]  # taban [end - length, end), mevcut bar = end
+        high_range, low_range = table.query(ends - length, length)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            range_pct = (high_range - low_range) / ((high_range + low_range) / 2) * 100
+        qualifies = range_pct < threshold_pct
+        rows = ends[qualifies]
+        base_length[rows] = length
+        base_range_pct[rows] = range_pct[qualifies]
+        base_support[rows] = low_range[qualifies]
+        base_resistance[rows] = high_range[qualifies]
+
+    close = df['close'].to_numpy(dtype=float)
+    rel_vol = df['Relative_Volume'].to_numpy(dtype=float) if 'Relative_Volume' in df.columns else np.ones(n)
+    rsi = df['RSI'].to_numpy(dtype=float) if 'RSI' in df.columns else np.full(n, 50.0)
+    breakout_type, breakout_strength = _breakout_state(base_length > 0, close, base_resistance, rel_vol, rsi)
+
+    return pd.DataFrame({
+        'Base_Length': base_length,
+        'Base_Range_Pct': base_range_pct,
+        'Base_Support': base_support,
+        'Base_Resistance': base_resistance,
+        'Base_Breakout': breakout_type,
+        'Base_Breakout_Strength': breakout_strength
+    }, index=df.index)
+
+
+def detect_consolidation_multi(df, min_period=10, max_period=60, threshold_pct=8.0) -> ConsolidationPattern:
+    """Son bar için en uzun konsolidasyon tabanı ve kırılım durumu"""
+    if df is None or len(df) <= min_period:
+        return ConsolidationPattern(
+            detected=False, duration=0, range_pct=0,
+            breakout_type='none', breakout_strength=0,
+            support=0, resistance=0
+        )
+    latest = consolidation_bases(df.tail(max_period + 1), min_period, max_period, threshold_pct).iloc[-1]
+    detected = bool(latest['Base_Length'] > 0)
+    return ConsolidationPattern(
+        detected=detected,
+        duration=int(latest['Base_Length']),
+        range_pct=round(float(latest['Base_Range_Pct']), 2) if detected else 0,
+        breakout_type=latest['Base_Breakout'],
+        breakout_strength=round(float(latest['Base_Breakout_Strength']), 2),
+        support=round(float(latest['Base_Support']), 2) if detected else 0,
+        resistance=round(float(latest['Base_Resistance']), 2) if detected else 0
+    )
@@ -1,7 +1,14 @@
 # analysis/fibonacci.py
 import numpy as np
+import pandas as pd
 from core.types import FibonacciLevel
 
+FIB_RATIOS = [0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0, 1.272, 1.618]
+
+def fib_column(ratio: float) -> str:
+    """Oran için sütun adı - ör. 0.618 -> 'Fib_618_Dist_Pct'"""
+    return f"Fib_{int(round(ratio * 1000))}_Dist_Pct"
+
 def calculate_fibonacci_levels(df, lookback=100) -> dict:
     """
     Fibonacci geri çekilme ve genişleme seviyelerini hesaplar.
@@ -18,10 +25,9 @@ def calculate_fibonacci_levels(df, lookback=100) -> dict:
     if range_val == 0:
         return {"levels": []}
 
-    fib_ratios = [0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0, 1.272, 1.618]
     levels = []
 
-    for ratio in fib_ratios:
+    for ratio in FIB_RATIOS:
         if ratio <= 1.0:
             price = high - (range_val * ratio)
             zone = "retracement"
@@ -41,6 +47,27 @@ def calculate_fibonacci_levels(df, lookback=100) -> dict:
     levels.sort(key=lambda x: x.price)
     return {"levels": levels}
 
+def fibonacci_feature_frame(df, lookback=100) -> pd.DataFrame:
+    """
+    Kayan Fibonacci özellikleri - her bar için calculate_fibonacci_levels karşılığı.
+    Sütunlar: Fib_High, Fib_Low ve her oran için fiyata uzaklık yüzdesi (fib_column).
+    İlk 10 bar ve sıfır aralıklı barlar NaN.
+    """
+    high = df['high'].rolling(lookback, min_periods=1).max()
+    low = df['low'].rolling(lookback, min_periods=1).min()
+    close = df['close']
+    range_val = (high - low).where(lambda r: r != 0)
+    range_val.iloc[:9] = np.nan
+
+    features = {'Fib_High': high.where(range_val.notna()), 'Fib_Low': low.where(range_val.notna())}
+    for ratio in FIB_RATIOS:
+        if ratio <= 1.0:
+            price = high - (range_val * ratio)
+        else:
+            price = high + (range_val * (ratio - 1.0))
+        features[fib_column(ratio)] = (close - price).abs() / close * 100
+    return pd.DataFrame(features, index=df.index)
+
 def find_fibonacci_entry_zone(levels: list, current_price: float, tolerance_pct=1.5) -> dict:
     """
     Fibonacci seviyelerine göre giriş bölgesi önerisi.
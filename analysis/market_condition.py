@@ -18,29 +18,35 @@ def analyze_market_condition(tv, config) -> MarketAnalysis:
         if bist_data is None or len(bist_data) < 50:
             return _empty_market_analysis()
 
-        df = calculate_indicators(bist_data)
-        latest = df.iloc[-1]
-        trend_strength = _calculate_trend_strength(df, latest)
-        returns = df['close'].pct_change().dropna()
-        volatility = returns.std() * np.sqrt(252) * 100
-        volume_trend = latest['volume'] / df['volume'].rolling(20).mean().iloc[-1]
-        market_score = _calculate_market_score(trend_strength, volatility, volume_trend)
-        regime = _determine_market_regime(trend_strength, volatility, market_score)
-        recommendation = _generate_market_recommendation(regime, market_score)
-
-        return MarketAnalysis(
-            regime=regime,
-            trend_strength=round(trend_strength, 1),
-            volatility=round(volatility, 1),
-            volume_trend=round(volume_trend, 2),
-            market_score=round(market_score, 1),
-            recommendation=recommendation
-        )
+        return analyze_market_frame(calculate_indicators(bist_data))
     except Exception as e:
         import logging
         logging.error(f"Piyasa analizi hatası: {e}")
         return _empty_market_analysis()
 
+def analyze_market_frame(df) -> MarketAnalysis:
+    """İndikatörü hesaplanmış endeks verisinden piyasa analizi (XU100 veya sektör endeksi)"""
+    if df is None or len(df) < 50:
+        return _empty_market_analysis()
+
+    latest = df.iloc[-1]
+    trend_strength = _calculate_trend_strength(df, latest)
+    returns = df['close'].pct_change().dropna()
+    volatility = returns.std() * np.sqrt(252) * 100 if len(returns) > 1 else 25.0
+    volume_trend = latest['volume'] / df['volume'].rolling(20).mean().iloc[-1] if 'volume' in df.columns else 1.0
+    market_score = _calculate_market_score(trend_strength, volatility, volume_trend)
+    regime = _determine_market_regime(trend_strength, volatility, market_score)
+    recommendation = _generate_market_recommendation(regime, market_score)
+
+    return MarketAnalysis(
+        regime=regime,
+        trend_strength=round(trend_strength, 1),
+        volatility=round(volatility, 1),
+        volume_trend=round(volume_trend, 2),
+        market_score=round(market_score, 1),
+        recommendation=recommendation
+    )
+
 def _calculate_trend_strength(df, latest):
     strength = 0
     if latest['close'] > latest['EMA20'] > latest['EMA50']:
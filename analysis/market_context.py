@@ -0,0 +1,137 @@
+# analysis/market_context.py
+"""
+Piyasa bağlamı servisi - XU100 ve sektör endeksleri.
+
+Endeksler eşzamanlı çekilir ve analiz edilir; sonuç değişmez bir MarketSnapshot
+olarak yayımlanır. Tarayıcı thread'leri sadece güncel snapshot referansını okur
+(okuma yolunda kilit yok). Yenileme talep üzerine (tarama / yeniden tarama turu)
+zaman aralığıyla kontrol edilir, fakat snapshot sadece endekslerde yeni /
+güncellenmiş bar varsa yeniden kurulur. Sektör rejimleri, sektör üyeliği
+tanımlı sembollerin skor bağlamında genel piyasanın yerine kullanılır.
+"""
+import logging
+import threading
+import concurrent.futures
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+from tvDatafeed import Interval
+
+from core.types import MarketAnalysis
+from indicators.ta_manager import calculate_indicators
+from analysis.market_condition import analyze_market_frame, _empty_market_analysis
+
+DEFAULT_SECTOR_INDICES = ('XBANK', 'XUSIN', 'XHOLD')
+
+
+def sector_map(members: Mapping[str, Sequence[str]]) -> Dict[str, str]:
+    """{sektör endeksi: [semboller]} -> {sembol: sektör endeksi}"""
+    return {symbol: index for index, symbols in members.items() for symbol in symbols}
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Piyasa bağlamının değişmez anlık görüntüsü"""
+    market: MarketAnalysis
+    sectors: Mapping[str, MarketAnalysis]
+    bar_time: Optional[datetime]
+    created_at: datetime
+
+
+class MarketContextService:
+    """Zaman aralıklı, bar güdümlü piyasa bağlamı yenileyici"""
+    def __init__(self, fetch: Callable, benchmark: str = 'XU100',
+                 sectors: Sequence[str] = DEFAULT_SECTOR_INDICES, exchange: str = 'BIST',
+                 n_bars: int = 100, refresh_minutes: float = 15, max_workers: int = 4):
+        """
+        fetch: (symbol, exchange, interval, n_bars) -> DataFrame (ör. SwingHunterUltimate.safe_api_call)
+        """
+        self.fetch = fetch
+        self.benchmark = benchmark
+        self.indices = [benchmark] + [s for s in sectors if s != benchmark]
+        self.exchange = exchange
+        self.n_bars = n_bars
+        self.refresh_interval = timedelta(minutes=refresh_minutes)
+        self.max_workers = max_workers
+
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._analyses: Dict[str, MarketAnalysis] = {}
+        self._bar_keys: Dict[str, tuple] = {}
+        self._last_check: Optional[datetime] = None
+        self._refresh_lock = threading.Lock()
+
+    def current(self) -> Optional[MarketSnapshot]:
+        """Güncel snapshot (henüz yenilenmediyse None) - kilitsiz"""
+        return self._snapshot
+
+    def refresh_if_stale(self) -> MarketSnapshot:
+        """Yenileme aralığı dolduysa yenile, değilse mevcut snapshot'ı döndür"""
+        snapshot = self._snapshot
+        last_check = self._last_check
+        if snapshot is not None and last_check is not None and datetime.now() - last_check < self.refresh_interval:
+            return snapshot
+        return self.refresh()
+
+    def refresh(self, force: bool = False) -> MarketSnapshot:
+        """Endeksleri eşzamanlı çek; değişen endeksleri yeniden analiz edip yeni snapshot yayımla"""
+        with self._refresh_lock:
+            if not force and self._snapshot is not None and self._last_check is not None \
+                    and datetime.now() - self._last_check < self.refresh_interval:
+                return self._snapshot  # başka bir thread az önce yeniledi
+
+            frames = self._fetch_all()
+            self._last_check = datetime.now()
+
+            changed = {}
+            for index, df in frames.items():
+                key = (df.index[-1], float(df['close'].iloc[-1])) if df is not None and not df.empty else None
+                if force or key is None or key != self._bar_keys.get(index) or index not in self._analyses:
+                    changed[index] = (key, df)
+
+            if not changed and self._snapshot is not None:
+                return self._snapshot
+
+            for index, analysis in self._analyze_all({i: df for i, (_, df) in changed.items()}).items():
+                self._analyses[index] = analysis
+                self._bar_keys[index] = changed[index][0]
+
+            benchmark_frame = frames.get(self.benchmark)
+            snapshot = MarketSnapshot(
+                market=self._analyses.get(self.benchmark, _empty_market_analysis()),
+                sectors=MappingProxyType({i: a for i, a in self._analyses.items() if i != self.benchmark}),
+                bar_time=benchmark_frame.index[-1] if benchmark_frame is not None and not benchmark_frame.empty else None,
+                created_at=self._last_check
+            )
+            self._snapshot = snapshot
+            logging.info(
+                f"📊 Piyasa bağlamı yenilendi: {self.benchmark} {snapshot.market.regime}"
+                + "".join(f" | {i}: {a.regime}" for i, a in snapshot.sectors.items())
+            )
+            return snapshot
+
+    def _fetch_all(self) -> Dict[str, Optional[object]]:
+        def load(index):
+            try:
+                return index, self.fetch(index, self.exchange, Interval.in_daily, self.n_bars)
+            except Exception as e:
+                logging.error(f"Endeks verisi alınamadı {index}: {e}")
+                return index, None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(executor.map(load, self.indices))
+
+    def _analyze_all(self, frames: Dict[str, object]) -> Dict[str, MarketAnalysis]:
+        def analyze(item):
+            index, df = item
+            try:
+                if df is None or len(df) < 50:
+                    return index, _empty_market_analysis()
+                return index, analyze_market_frame(calculate_indicators(df))
+            except Exception as e:
+                logging.error(f"Endeks analizi hatası {index}: {e}")
+                return index, _empty_market_analysis()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(executor.map(analyze, frames.items()))
@@ -1,9 +1,97 @@
 # analysis/multi_timeframe.py - DÜZELTMİŞ VERSİYON
 import pandas as pd
 import logging
+from typing import Sequence
 from core.types import MultiTimeframeAnalysis
 from indicators.ta_manager import calculate_indicators
 
+OHLCV_AGGREGATION = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+# Zaman dilimi başına gereken en az bar - 250 günlük bardan ~12 aylık bar çıkar
+MIN_TIMEFRAME_BARS = {'weekly': 20, 'monthly': 10}
+FULL_INDICATOR_BARS = 20   # altındaki serilerde hafif indikatör seti (_short_timeframe_latest)
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Günlük barları üst zaman dilimine topla (ağ çağrısı yok).
+    timeframe: 'weekly' / 'monthly'
+    """
+    if timeframe == 'weekly':
+        keys = df.index.to_period('W-FRI').to_timestamp()
+    elif timeframe == 'monthly':
+        keys = df.index.to_period('M').to_timestamp()
+    else:
+        raise ValueError(f"Desteklenmeyen zaman dilimi: {timeframe}")
+    aggregation = {col: how for col, how in OHLCV_AGGREGATION.items() if col in df.columns}
+    return df[list(aggregation)].groupby(keys).agg(aggregation)
+
+def _short_timeframe_latest(bars: pd.DataFrame) -> pd.Series:
+    """
+    Kısa seriler (ör. ~12 aylık bar) için hafif indikatör seti: 6/12 barlık hızlı/yavaş EMA ve
+    6 barlık RSI - _determine_trend'in beklediği adlarla (EMA20 = hızlı, EMA50 = yavaş)
+    """
+    close = bars['close']
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 6, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 6, adjust=False).mean()
+    rsi = 100 - 100 / (1 + gain / loss.where(loss > 0))
+    return pd.Series({
+        'close': close.iloc[-1],
+        'EMA20': close.ewm(span=6, adjust=False).mean().iloc[-1],
+        'EMA50': close.ewm(span=12, adjust=False).mean().iloc[-1],
+        'RSI': rsi.fillna(100.0).iloc[-1]
+    })
+
+def analyze_multi_timeframe_from_frame(df_daily: pd.DataFrame,
+                                       timeframes: Sequence[str] = ('weekly', 'monthly')) -> MultiTimeframeAnalysis:
+    """
+    Tarayıcının zaten hesapladığı günlük indikatör tablosundan MTF analizi.
+    Haftalık/aylık görünüm günlük barlardan türetilir. Zaman dilimi başına MIN_TIMEFRAME_BARS'tan
+    az barı olanlar atlanır; haftalık görünüm zorunludur.
+    """
+    try:
+        if df_daily is None or len(df_daily) < 50:
+            return _fallback_mtf_analysis()
+        if 'EMA20' not in df_daily.columns:
+            df_daily = calculate_indicators(df_daily)
+        latest_daily = df_daily.iloc[-1]
+
+        trends = {}
+        latest_weekly = None
+        for timeframe in dict.fromkeys(('weekly',) + tuple(timeframes)):
+            if timeframe not in MIN_TIMEFRAME_BARS:
+                logging.warning(f"Desteklenmeyen MTF zaman dilimi atlandı: {timeframe}")
+                continue
+            bars = resample_ohlcv(df_daily, timeframe)
+            if len(bars) < MIN_TIMEFRAME_BARS[timeframe]:
+                continue
+            if len(bars) >= FULL_INDICATOR_BARS:
+                latest = calculate_indicators(bars).iloc[-1]
+            else:
+                latest = _short_timeframe_latest(bars)
+            trends[timeframe] = _determine_trend(latest)
+            if timeframe == 'weekly':
+                latest_weekly = latest
+
+        if latest_weekly is None:
+            return _fallback_mtf_analysis()
+
+        daily_trend = _determine_trend(latest_daily)
+        weekly_trend = trends['weekly']
+        alignment = (daily_trend == "uptrend" and weekly_trend == "uptrend")
+
+        return MultiTimeframeAnalysis(
+            daily_trend=daily_trend,
+            weekly_trend=weekly_trend,
+            alignment=alignment,
+            weekly_rsi=round(latest_weekly.get('RSI', 50), 1),
+            weekly_macd_positive=latest_weekly.get('MACD_Level', 0) > latest_weekly.get('MACD_Signal', 0),
+            recommendation=_generate_mtf_recommendation(daily_trend, weekly_trend, alignment),
+            timeframes=trends
+        )
+    except Exception as e:
+        logging.error(f"MTF analiz hatası: {e}")
+        return _fallback_mtf_analysis()
+
 def analyze_multi_timeframe_from_data(df_daily: pd.DataFrame, df_weekly: pd.DataFrame) -> MultiTimeframeAnalysis:
     """
     Günlük ve haftalık timeframe analizi - DataFrame'lerden.
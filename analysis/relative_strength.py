@@ -0,0 +1,85 @@
+# analysis/relative_strength.py
+"""
+Kesitsel göreceli güç (RS) sıralaması.
+
+Taranan evrenin kapanışları tek bir tarih x sembol matrisine hizalanır;
+her ufuk için endekse göre göreceli getiri ve evren içi yüzdelik sıra
+birkaç vektörel işlemle hesaplanır. Maliyet sembol başına değil, tarama başına sabittir.
+"""
+import logging
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+RS_HORIZONS = (21, 63, 126)          # ~1, 3, 6 ay
+RS_WEIGHTS = (0.4, 0.35, 0.25)
+
+
+def rs_column(horizon: int) -> str:
+    return f"RS_{horizon}"
+
+def rs_rank_column(horizon: int) -> str:
+    return f"RS_Rank_{horizon}"
+
+def close_matrix(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Sembol DataFrame'lerinin kapanışlarını tarih x sembol matrisine hizala"""
+    closes = {symbol: df['close'] for symbol, df in frames.items() if df is not None and not df.empty}
+    if not closes:
+        return pd.DataFrame()
+    return pd.DataFrame(closes).sort_index()
+
+def relative_strength_frame(closes: pd.DataFrame, benchmark: pd.Series,
+                            horizons: Sequence[int] = RS_HORIZONS,
+                            weights: Optional[Sequence[float]] = RS_WEIGHTS) -> pd.DataFrame:
+    """
+    Sembol başına (index = sembol) göreceli güç tablosu.
+    RS_{h}: h bardaki getirinin endeks getirisine göre fazlası (%) - (1+r)/(1+r_endeks) - 1
+    RS_Rank_{h}: RS_{h}'nin evren içi yüzdelik sırası (0-100)
+    RS_Score: mevcut ufuk sıralarının ağırlıklı ortalaması (0-100)
+    Geçmişi yetersiz semboller ilgili ufukta NaN alır.
+    """
+    if closes.empty or benchmark is None or benchmark.empty:
+        return pd.DataFrame()
+
+    # Endeks takvimine hizala - tatil / eksik barlarda son kapanış taşınır
+    aligned = closes.reindex(benchmark.index).ffill()
+    values = aligned.to_numpy(dtype=float)
+    index_values = benchmark.to_numpy(dtype=float)
+    horizons = [h for h in horizons if h < len(index_values)]
+    if not horizons:
+        return pd.DataFrame(index=closes.columns)
+
+    past = np.array([len(index_values) - 1 - h for h in horizons])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = values[-1] / values[past] - 1                        # ufuk x sembol
+        index_returns = index_values[-1] / index_values[past] - 1       # ufuk
+        relative = ((1 + returns) / (1 + index_returns)[:, None] - 1) * 100
+
+    relative_frame = pd.DataFrame(relative.T, index=closes.columns, columns=[rs_column(h) for h in horizons])
+    ranks = relative_frame.rank(pct=True) * 100
+    ranks.columns = [rs_rank_column(h) for h in horizons]
+
+    horizon_weights = np.asarray(weights[:len(horizons)] if weights is not None else [1.0] * len(horizons), dtype=float)
+    rank_values = ranks.to_numpy()
+    available = ~np.isnan(rank_values)
+    weight_sum = (available * horizon_weights).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.where(available, rank_values, 0.0) @ horizon_weights / weight_sum
+
+    result = pd.concat([relative_frame.round(2), ranks.round(1)], axis=1)
+    result['RS_Score'] = np.round(score, 1)
+    result.index.name = 'symbol'
+    return result
+
+def rank_relative_strength(closes: pd.DataFrame, benchmark_df: pd.DataFrame,
+                           horizons: Sequence[int] = RS_HORIZONS,
+                           weights: Optional[Sequence[float]] = RS_WEIGHTS) -> pd.DataFrame:
+    """Kapanış matrisi (close_matrix) ve endeks DataFrame'inden RS tablosu - hata durumunda boş tablo"""
+    try:
+        if benchmark_df is None or benchmark_df.empty:
+            return pd.DataFrame()
+        return relative_strength_frame(closes, benchmark_df['close'], horizons, weights)
+    except Exception as e:
+        logging.error(f"Göreceli güç hesaplama hatası: {e}")
+        return pd.DataFrame()
@@ -0,0 +1,105 @@
+# analysis/sr_tracker.py
+"""
+Artımlı destek/direnç takibi.
+
+Her taramada son 100 barın pivotlarını baştan bulmak yerine sembol başına
+onaylanmış pivotlar saklanır. Yeni bar geldiğinde sadece sağ penceresi
+(pivot_width bar) kapanan aday kontrol edilir, pencereden çıkan pivotlar atılır.
+Gün içi taramada güncellenen son bar, ona dayanan pivotlar yeniden kontrol edilerek işlenir.
+Sonuç SupportResistanceFinder.find_levels ile aynıdır.
+"""
+import logging
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis.support_resistance import SupportResistanceFinder, find_pivots
+
+
+class SupportResistanceTracker:
+    """Tek sembol için durum tutan S/R seviye takipçisi (pickle ile saklanabilir)"""
+    def __init__(self, lookback: int = 100, tolerance: float = 0.015, pivot_width: int = 3):
+        self.lookback = lookback
+        self.tolerance = tolerance
+        self.pivot_width = pivot_width
+        self.last_timestamp = None
+        self.last_bar = None
+        self.pivot_highs: deque = deque()  # (zaman, değer) - zamana göre sıralı
+        self.pivot_lows: deque = deque()
+        self.levels: Dict = {}
+
+    def reset(self):
+        self.last_timestamp = None
+        self.last_bar = None
+        self.pivot_highs.clear()
+        self.pivot_lows.clear()
+        self.levels = {}
+
+    def update(self, df: pd.DataFrame, finder: Optional[SupportResistanceFinder] = None) -> Dict:
+        """
+        Yeni barları işle ve güncel seviyeleri döndür.
+        df: Sembolün bar geçmişi (önceki çağrıdaki son barı içermeli, yoksa baştan kurulur).
+        """
+        finder = finder or SupportResistanceFinder(pivot_width=self.pivot_width)
+        if df is None or len(df) < 20:
+            self.reset()
+            self.levels = finder.find_levels(df, self.lookback, self.tolerance, self.pivot_width)
+            return self.levels
+
+        try:
+            size = min(self.lookback or len(df), len(df))
+            index = df.index[-size:]
+            highs, lows, closes, opens = (df[column].to_numpy(dtype=float)[-size:]
+                                          for column in ('high', 'low', 'close', 'open'))
+            last_bar = (highs[-1], lows[-1], closes[-1], opens[-1])
+            if index[-1] == self.last_timestamp and last_bar == self.last_bar and self.levels:
+                return self.levels
+
+            start = self._first_unconfirmed_position(index)
+            self._confirm_pivots(index, highs, lows, start)
+            self._expire_pivots(index)
+            self.last_timestamp = index[-1]
+            self.last_bar = last_bar
+
+            self.levels = finder.build_levels(
+                highs, lows, closes, opens,
+                [value for _, value in self.pivot_highs],
+                [value for _, value in self.pivot_lows],
+                self.tolerance
+            )
+        except Exception as e:
+            logging.error(f"S/R takip hatası: {e}")
+            self.reset()
+            self.levels = finder.find_levels(df, self.lookback, self.tolerance, self.pivot_width)
+        return self.levels
+
+    def _first_unconfirmed_position(self, index: pd.Index) -> int:
+        """Pencerede henüz onaylanmamış ilk pivot adayının konumu (bilinmeyen geçmişte 0)"""
+        if self.last_timestamp is None:
+            return 0
+        last_position = index.searchsorted(self.last_timestamp)
+        if last_position >= len(index) or index[last_position] != self.last_timestamp:
+            self.reset()
+            return 0
+        # Önceki son bar güncellenmiş olabilir - ona dayanan son onaylı aday da yeniden kontrol edilir
+        return max(0, last_position - self.pivot_width)
+
+    def _confirm_pivots(self, index: pd.Index, highs: np.ndarray, lows: np.ndarray, start: int):
+        """start konumundan itibaren sağ penceresi kapanan pivotları (yeniden) ekle"""
+        offset = max(0, start - self.pivot_width)
+        for values, kind, pivots in ((highs, 'high', self.pivot_highs), (lows, 'low', self.pivot_lows)):
+            while pivots and pivots[-1][0] >= index[start]:
+                pivots.pop()
+            for position in find_pivots(values[offset:], self.pivot_width, kind=kind) + offset:
+                pivots.append((index[position], values[position]))
+
+    def _expire_pivots(self, index: pd.Index):
+        """Pencerenin sol kenarından pivot_width bar içeride kalmayan pivotları at"""
+        if len(index) <= self.pivot_width:
+            return
+        oldest_allowed = index[self.pivot_width]
+        for pivots in (self.pivot_highs, self.pivot_lows):
+            while pivots and pivots[0][0] < oldest_allowed:
+                pivots.popleft()
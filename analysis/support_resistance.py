@@ -3,103 +3,158 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List
 
+def find_pivots(values: np.ndarray, width: int = 3, min_move_pct: float = 0.5, kind: str = 'high') -> np.ndarray:
+    """
+    Pivot tepe/dip indeksleri - kaydırılmış karşılaştırmalarla (NumPy).
+
+    Pivot: değer soldaki ve sağdaki `width` bardan kesin büyük (tepe) / küçük (dip)
+    ve soldaki her bardan en az %min_move_pct uzakta (onay).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 2 * width + 1:
+        return np.zeros(0, dtype=int)
+
+    center = values[width:n - width]
+    min_move = center * (min_move_pct / 100)
+    is_pivot = np.ones(len(center), dtype=bool)
+    for k in range(1, width + 1):
+        left = values[width - k:n - width - k]
+        right = values[width + k:n - width + k]
+        if kind == 'high':
+            is_pivot &= (center > left) & (center > right) & ~(center - left < min_move)
+        else:
+            is_pivot &= (center < left) & (center < right) & ~(left - center < min_move)
+    return np.flatnonzero(is_pivot) + width
+
+
+def _band_counts(sorted_values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Her [lower, upper] bandına düşen değer sayısı (sorted_values artan sıralı, NaN sonda)"""
+    counts = np.searchsorted(sorted_values, upper, side='right') - np.searchsorted(sorted_values, lower, side='left')
+    return np.maximum(counts, 0)
+
+
+def level_strength(levels, values: np.ndarray, reversal: np.ndarray) -> List[int]:
+    """
+    Seviye gücü - tüm seviyeler için dokunma/sekme sayıları tek seferde
+    (sıralı dip/tepe dizisinde searchsorted ile ±%0.5 bant sayımı).
+
+    values: Dipler (destek) veya tepeler (direnç)
+    reversal: Sekme sayılan mumlar (destekte yükselen, dirençte düşen)
+    """
+    if len(levels) == 0:
+        return []
+    levels = np.asarray(levels, dtype=float)
+    lower = levels * 0.995
+    upper = levels * 1.005
+    touches = _band_counts(np.sort(values), lower, upper)
+    bounces = _band_counts(np.sort(values[reversal]), lower, upper)
+    recent_touches = _band_counts(np.sort(values[-20:]), lower, upper)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bounce_rate = np.where(touches > 0, bounces / touches, 0.0)
+    strength = (
+        np.select([touches >= 3, touches >= 2, touches >= 1], [40, 25, 10], 0) +
+        np.select([bounce_rate >= 0.7, bounce_rate >= 0.5, bounce_rate >= 0.3], [30, 20, 10], 0) +
+        np.where(recent_touches > 0, 20, 0)
+    )
+    return np.minimum(strength, 100).tolist()
+
+
 class SupportResistanceFinder:
     """Otomatik destek/direnç tespiti"""
-    def __init__(self, sensitivity=1.0):
+    def __init__(self, sensitivity=1.0, pivot_width=3):
         self.sensitivity = sensitivity
+        self.pivot_width = pivot_width
 
-    def find_levels(self, df, lookback=100, tolerance=0.015):
+    def find_levels(self, df, lookback=100, tolerance=0.015, pivot_width=None):
+        """
+        lookback: Kullanılacak bar sayısı (None = tüm geçmiş)
+        pivot_width: Pivot için her iki yanda gereken bar sayısı (varsayılan: self.pivot_width)
+        """
         try:
             if df is None or len(df) < 20:
                 return {'support': [], 'resistance': [], 'current_price': 0}
-            recent_df = df.tail(lookback)
-            highs = recent_df['high'].values
-            lows = recent_df['low'].values
-            closes = recent_df['close'].values
+            recent_df = df.tail(lookback) if lookback else df
+            width = pivot_width or self.pivot_width
+            highs = recent_df['high'].to_numpy(dtype=float)
+            lows = recent_df['low'].to_numpy(dtype=float)
+            closes = recent_df['close'].to_numpy(dtype=float)
+            opens = recent_df['open'].to_numpy(dtype=float)
 
-            # Resistance (pivot high)
-            resistance_levels = []
-            for i in range(3, len(highs) - 3):
-                if (highs[i] > highs[i-1] and highs[i] > highs[i-2] and highs[i] > highs[i-3] and
-                    highs[i] > highs[i+1] and highs[i] > highs[i+2] and highs[i] > highs[i+3]):
-                    confirmation = True
-                    for j in range(1, 4):
-                        if highs[i] - highs[i-j] < (highs[i] * 0.005):
-                            confirmation = False
-                            break
-                    if confirmation:
-                        resistance_levels.append(highs[i])
+            # Resistance (pivot high) / Support (pivot low)
+            resistance_levels = list(highs[find_pivots(highs, width, kind='high')])
+            support_levels = list(lows[find_pivots(lows, width, kind='low')])
+
+            return self.build_levels(highs, lows, closes, opens, resistance_levels, support_levels, tolerance)
+        except Exception as e:
+            import logging
+            logging.error(f"Support/Resistance hatası: {e}")
+            return {'support': [], 'resistance': [], 'current_price': df['close'].iloc[-1] if not df.empty else 0}
 
-            # Support (pivot low)
-            support_levels = []
-            for i in range(3, len(lows) - 3):
-                if (lows[i] < lows[i-1] and lows[i] < lows[i-2] and lows[i] < lows[i-3] and
-                    lows[i] < lows[i+1] and lows[i] < lows[i+2] and lows[i] < lows[i+3]):
-                    confirmation = True
-                    for j in range(1, 4):
-                        if lows[i-j] - lows[i] < (lows[i] * 0.005):
-                            confirmation = False
-                            break
-                    if confirmation:
-                        support_levels.append(lows[i])
+    def build_levels(self, highs, lows, closes, opens, resistance_levels, support_levels, tolerance=0.015):
+        """
+        Pivot seviyelerinden sonuç sözlüğü (fibonacci katmanı, kümeleme, güç).
+        highs/lows/closes/opens: Pencere barlarının NumPy dizileri (en az 20 bar).
+        """
+        resistance_levels = list(resistance_levels)
+        support_levels = list(support_levels)
+        current_price = closes[-1]
 
-            # Fibonacci pivot ek katman
-            fib_levels = self._find_fibonacci_pivots(recent_df)
-            resistance_levels.extend(fib_levels.get('resistance', []))
-            support_levels.extend(fib_levels.get('support', []))
+        # Fibonacci pivot ek katman
+        fib_levels = self._split_fibonacci_levels(np.nanmax(highs), np.nanmin(lows), current_price)
+        resistance_levels.extend(fib_levels['resistance'])
+        support_levels.extend(fib_levels['support'])
 
-            # Kümele
-            resistance_levels = self._cluster_levels(resistance_levels, tolerance)
-            support_levels = self._cluster_levels(support_levels, tolerance)
+        # Kümele
+        resistance_levels = self._cluster_levels(resistance_levels, tolerance)
+        support_levels = self._cluster_levels(support_levels, tolerance)
 
-            current_price = closes[-1]
-            filtered_support = sorted([s for s in support_levels if s < current_price * 0.999], reverse=True)[:5]
-            filtered_resistance = sorted([r for r in resistance_levels if r > current_price * 1.001])[:5]
+        filtered_support = sorted([s for s in support_levels if s < current_price * 0.999], reverse=True)[:5]
+        filtered_resistance = sorted([r for r in resistance_levels if r > current_price * 1.001])[:5]
 
-            support_strength = self._calculate_level_strength(filtered_support, recent_df, 'support')
-            resistance_strength = self._calculate_level_strength(filtered_resistance, recent_df, 'resistance')
+        # Destekte yükselen, dirençte düşen mum = sekme
+        support_strength = level_strength(filtered_support, lows, closes > opens)
+        resistance_strength = level_strength(filtered_resistance, highs, closes < opens)
 
-            return {
-                'support': filtered_support,
-                'resistance': filtered_resistance,
-                'support_strength': support_strength,
-                'resistance_strength': resistance_strength,
-                'current_price': current_price,
-                'nearest_support': filtered_support[-1] if filtered_support else current_price * 0.95,
-                'nearest_resistance': filtered_resistance[0] if filtered_resistance else current_price * 1.05,
-                'support_distance_pct': ((current_price - filtered_support[-1]) / current_price * 100) if filtered_support else 5.0,
-                'resistance_distance_pct': ((filtered_resistance[0] - current_price) / current_price * 100) if filtered_resistance else 5.0
-            }
-        except Exception as e:
-            import logging
-            logging.error(f"Support/Resistance hatası: {e}")
-            return {'support': [], 'resistance': [], 'current_price': df['close'].iloc[-1] if not df.empty else 0}
+        return {
+            'support': filtered_support,
+            'resistance': filtered_resistance,
+            'support_strength': support_strength,
+            'resistance_strength': resistance_strength,
+            'current_price': current_price,
+            'nearest_support': filtered_support[-1] if filtered_support else current_price * 0.95,
+            'nearest_resistance': filtered_resistance[0] if filtered_resistance else current_price * 1.05,
+            'support_distance_pct': ((current_price - filtered_support[-1]) / current_price * 100) if filtered_support else 5.0,
+            'resistance_distance_pct': ((filtered_resistance[0] - current_price) / current_price * 100) if filtered_resistance else 5.0
+        }
 
     def _find_fibonacci_pivots(self, df):
         try:
             if len(df) < 20:
                 return {'support': [], 'resistance': []}
-            swing_high = df['high'].max()
-            swing_low = df['low'].min()
-            fib_levels = {
-                0.236: swing_low + (swing_high - swing_low) * 0.236,
-                0.382: swing_low + (swing_high - swing_low) * 0.382,
-                0.500: swing_low + (swing_high - swing_low) * 0.500,
-                0.618: swing_low + (swing_high - swing_low) * 0.618,
-                0.786: swing_low + (swing_high - swing_low) * 0.786
-            }
-            current_price = df['close'].iloc[-1]
-            fib_support = []
-            fib_resistance = []
-            for price in fib_levels.values():
-                if price < current_price * 0.995:
-                    fib_support.append(price)
-                elif price > current_price * 1.005:
-                    fib_resistance.append(price)
-            return {'support': fib_support, 'resistance': fib_resistance}
+            return self._split_fibonacci_levels(df['high'].max(), df['low'].min(), df['close'].iloc[-1])
         except:
             return {'support': [], 'resistance': []}
 
+    def _split_fibonacci_levels(self, swing_high, swing_low, current_price):
+        """Fibonacci seviyelerini fiyatın altı (destek) / üstü (direnç) olarak ayır"""
+        fib_levels = {
+            0.236: swing_low + (swing_high - swing_low) * 0.236,
+            0.382: swing_low + (swing_high - swing_low) * 0.382,
+            0.500: swing_low + (swing_high - swing_low) * 0.500,
+            0.618: swing_low + (swing_high - swing_low) * 0.618,
+            0.786: swing_low + (swing_high - swing_low) * 0.786
+        }
+        fib_support = []
+        fib_resistance = []
+        for price in fib_levels.values():
+            if price < current_price * 0.995:
+                fib_support.append(price)
+            elif price > current_price * 1.005:
+                fib_resistance.append(price)
+        return {'support': fib_support, 'resistance': fib_resistance}
+
     def _cluster_levels(self, levels, tolerance):
         if not levels:
             return []
@@ -117,37 +172,9 @@ class SupportResistanceFinder:
         return clustered
 
     def _calculate_level_strength(self, levels, df, level_type='support'):
-        if not levels:
-            return []
-        strengths = []
-        for level in levels:
-            strength = 0
-            if level_type == 'support':
-                touches = sum((df['low'] <= level * 1.005) & (df['low'] >= level * 0.995))
-                bounces = sum((df['low'] <= level * 1.005) & (df['low'] >= level * 0.995) & (df['close'] > df['open']))
-            else:
-                touches = sum((df['high'] >= level * 0.995) & (df['high'] <= level * 1.005))
-                bounces = sum((df['high'] >= level * 0.995) & (df['high'] <= level * 1.005) & (df['close'] < df['open']))
-            if touches >= 3:
-                strength += 40
-            elif touches >= 2:
-                strength += 25
-            elif touches >= 1:
-                strength += 10
-            if touches > 0:
-                bounce_rate = bounces / touches
-                if bounce_rate >= 0.7:
-                    strength += 30
-                elif bounce_rate >= 0.5:
-                    strength += 20
-                elif bounce_rate >= 0.3:
-                    strength += 10
-            recent_touches = sum((df.tail(20)['low' if level_type == 'support' else 'high'] >= level * 0.995) & 
-                                (df.tail(20)['low' if level_type == 'support' else 'high'] <= level * 1.005))
-            if recent_touches > 0:
-                strength += 20
-            strengths.append(min(strength, 100))
-        return strengths
+        if level_type == 'support':
+            return level_strength(levels, df['low'].to_numpy(dtype=float), (df['close'] > df['open']).to_numpy())
+        return level_strength(levels, df['high'].to_numpy(dtype=float), (df['close'] < df['open']).to_numpy())
 
     def check_breakout(self, df, levels, volume_lookback=20):
         try:
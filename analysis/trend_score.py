@@ -1,12 +1,19 @@
 # analysis/trend_score.py
 import numpy as np
+import pandas as pd
 from core.types import FilterScore
+from core.universe import column_values
 
-def calculate_advanced_trend_score(df, symbol: str, config: dict, market_analysis=None) -> dict:
+def calculate_advanced_trend_score(df, symbol: str, config: dict, market_analysis=None, telemetry=None) -> dict:
     """
     Gelişmiş trend ve momentum skorunu hesaplar - DÜZELTİLMİŞ VERSİYON
+    telemetry: RejectionTelemetry - geçemeyen skorlar en zayıf bileşenle kaydedilir
     """
+    if telemetry is not None:
+        telemetry.evaluated('trend_score')
     if df is None or len(df) < 20:
+        if telemetry is not None:
+            telemetry.record(symbol, 'trend_score', 'Yetersiz veri', len(df) if df is not None else 0, 20)
         return {
             "total_score": 0, 
             "components": [], 
@@ -78,17 +85,12 @@ def calculate_advanced_trend_score(df, symbol: str, config: dict, market_analysi
     else:
         total_score = 0
 
-    # DEBUG için
-    debug_mode = config.get('debug_mode', False)
-    if debug_mode:
-        print(f"\n📊 {symbol} - TREND SKOR ANALİZİ:")
-        for comp in components:
-            print(f"   {comp.category}: {comp.score}/{comp.max_score} (ağırlık: {comp.weight})")
-        print(f"   Toplam Skor: {total_score}/100")
-    
     # Minimum trend skorunu kontrol et - GEVŞETİLMİŞ
     min_trend_score = config.get('min_trend_score', 40)  # 50'den 40'a düşürüldü
     passed = total_score >= min_trend_score
+    if not passed and telemetry is not None:
+        weakest = min(components, key=lambda comp: comp.score / comp.max_score)
+        telemetry.record(symbol, 'trend_score', weakest.category, total_score, min_trend_score)
     
     # Öneri oluştur
     if passed:
@@ -406,4 +408,101 @@ def calculate_simple_trend_score(df, config):
         elif rel_vol >= 0.6:
             score += 10
     
-    return min(score, 100)
\ No newline at end of file
+    return min(score, 100)
+
+def calculate_trend_score_series(frame, config: dict, market_analysis=None) -> pd.DataFrame:
+    """
+    Vektörel trend skoru - calculate_advanced_trend_score ile aynı kurallar, np.select tabloları.
+
+    frame: Bir sembolün tüm geçmişi (satır = bar) veya evren tablosu (satır = sembol).
+    Opsiyonel sütunlar: 'nearest_support' (satır bazlı destek), 'regime' (satır bazlı rejim).
+    Dönüş: Her bileşenin skoru + 'total_score' ve 'passed' sütunları.
+    """
+    col = lambda name, default: column_values(frame, name, default)
+    market_analysis = market_analysis if isinstance(market_analysis, dict) else {}
+    close = col('close', np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 1. EMA Alignment
+        ema20, ema50, ema200 = col('EMA20', 0), col('EMA50', 0), col('EMA200', 0)
+        above20 = close > ema20
+        stacked = above20 & (ema20 > ema50)
+        ema_score = np.where(
+            ema200 > 0,
+            np.select([stacked & (ema50 > ema200), stacked & (ema50 < ema200), stacked, above20, close > ema50],
+                      [25, 18, 20, 15, 10], 5),
+            np.select([stacked, above20, close > ema50], [20, 15, 10], 5)
+        )
+
+        # 2. RSI Momentum
+        rsi = col('RSI', 50)
+        rsi_score = np.select(
+            [(45 <= rsi) & (rsi <= 70), (40 <= rsi) & (rsi < 45), (70 < rsi) & (rsi <= 75),
+             (75 < rsi) & (rsi <= 80), rsi > 80, (35 <= rsi) & (rsi < 40), (30 <= rsi) & (rsi < 35), rsi < 30],
+            [20, 15, 12, 8, 3, 12, 10, 5], 0
+        )
+
+        # 3. MACD
+        macd, signal, hist = col('MACD_Level', 0), col('MACD_Signal', 0), col('MACD_Hist', 0)
+        macd_score = np.select([(macd > signal) & (hist > 0), macd > signal, (macd < signal) & (hist < 0)],
+                               [15, 12, 3], 8)
+
+        # 4. Volume Confirmation
+        vol_max = 15
+        rel_vol = col('Relative_Volume', 1.0)
+        vol_score = np.select(
+            [rel_vol >= 1.5, rel_vol >= 1.2, rel_vol >= 0.8, rel_vol >= 0.6, rel_vol >= 0.4],
+            [vol_max * 0.6, vol_max * 0.5, vol_max * 0.4, vol_max * 0.3, vol_max * 0.2], vol_max * 0.1
+        )
+        obv, obv_ema = col('OBV', 0), col('OBV_EMA', 0)
+        obv_score = np.where((obv_ema > 0) & (obv > obv_ema), vol_max * 0.4, vol_max * 0.2)
+        volume_score = np.round(vol_score + obv_score, 1)
+
+        # 5. ADX
+        adx, plus_di, minus_di = col('ADX', 0), col('DI_Plus', 0), col('DI_Minus', 0)
+        bullish_di = plus_di > minus_di
+        adx_score = np.select([(adx >= 20) & bullish_di, (adx >= 15) & bullish_di, adx < 15], [10, 7, 4], 2)
+
+        # 6. Price Action (destek yakınlığı)
+        if 'nearest_support' in frame.columns or 'levels' in market_analysis:
+            if 'nearest_support' in frame.columns:
+                nearest_support = col('nearest_support', 0)
+            else:
+                nearest_support = np.full(len(frame), market_analysis['levels'].get('nearest_support', 0), dtype=float)
+            nearest_support = np.where(nearest_support == 0, close * 0.9, nearest_support)
+            distance = (close - nearest_support) / close * 100
+            pa_score = np.select([distance <= 3, distance <= 6, distance <= 10], [10, 7, 5], 3)
+        else:
+            pa_score = np.full(len(frame), 5)
+
+        # 7. Market Regime
+        if 'regime' in frame.columns or 'regime' in market_analysis:
+            regime = frame['regime'].to_numpy() if 'regime' in frame.columns else np.full(len(frame), market_analysis['regime'], dtype=object)
+            regime_score = np.select([np.isin(regime, ['bullish', 'sideways']), regime == 'volatile'], [5, 4], 2)
+        else:
+            regime_score = np.full(len(frame), 3)
+
+    components = [
+        ('ema', ema_score, 25, config.get('ema_weight', 0.25)),
+        ('rsi', rsi_score, 20, config.get('rsi_weight', 0.20)),
+        ('macd', macd_score, 15, config.get('macd_weight', 0.15)),
+        ('volume', volume_score, 15, config.get('volume_weight', 0.15)),
+        ('adx', adx_score, 10, config.get('adx_weight', 0.10)),
+        ('price_action', pa_score, 10, config.get('pa_weight', 0.10)),
+        ('regime', regime_score, 5, config.get('regime_weight', 0.05)),
+    ]
+    total_raw = sum(score * weight for _, score, _, weight in components)
+    total_possible = sum(max_score * weight for _, _, max_score, weight in components)
+    total_score = np.round(total_raw / total_possible * 100, 1) if total_possible > 0 else np.zeros(len(frame))
+
+    # Yetersiz veri (< 20 bar) -> skor 0
+    if 'Bar_Count' in frame.columns:
+        insufficient = col('Bar_Count', 0) < 20
+    else:
+        insufficient = np.arange(len(frame)) < 19
+    total_score = np.where(insufficient, 0.0, total_score)
+
+    result = pd.DataFrame({name: score for name, score, _, _ in components}, index=frame.index)
+    result['total_score'] = total_score
+    result['passed'] = (total_score >= config.get('min_trend_score', 40)) & ~insufficient
+    return result
@@ -14,6 +14,7 @@ logger = logging.getLogger(__name__)
 
 # ✅ DÜZELTME: Core Trade'i kullan
 from core.types import Trade as CoreTrade
+from core.utils import freeze_config
 
 @dataclass
 class BacktestTrade:
@@ -77,12 +78,10 @@ class RealisticBacktester:
     """Gerçekçi swing trade backtest - DÜZELTİLMİŞ"""
     
     def __init__(self, config, commission_pct=0.2, slippage_pct=0.1):
-        self.config = config
+        self.config = freeze_config(config)
         self.commission_pct = commission_pct
         self.slippage_pct = slippage_pct
-        self.trades: List[BacktestTrade] = []
         self.max_positions = 5
-        self.performance_history = []
         
     def calculate_position_size(self, capital: float, risk_pct: float, 
                                entry_price: float, stop_loss: float) -> int:
@@ -127,6 +126,40 @@ class RealisticBacktester:
             logger.warning(f"Entry signal error at idx {idx}: {e}")
             return False
     
+    def entry_signal_series(self, analyzed_data: pd.DataFrame, hunter) -> np.ndarray:
+        """
+        Tüm barlar için entry sinyali - check_entry_signal ile bar bazında aynı sonuç.
+        analyzed_data: Tüm geçmiş için hesaplanmış indikatörler.
+        """
+        if analyzed_data is None or analyzed_data.empty:
+            return np.zeros(0, dtype=bool)
+        
+        try:
+            from filters.basic_filters import basic_filters_series
+            
+            signals = basic_filters_series(analyzed_data, hunter.cfg)
+            signals[:50] = False
+            return signals
+            
+        except Exception as e:
+            logger.error(f"Swing check error: {e}")
+            return np.zeros(len(analyzed_data), dtype=bool)
+    
+    def what_if_stops(self, df: pd.DataFrame, hunter=None, entry_mask=None, **grid) -> pd.DataFrame:
+        """
+        Stop/hedef ayar ızgarası - tam backtest çalıştırmadan (risk.stop_target_manager.stop_target_grid).
+        hunter verilirse sadece entry sinyali olan barlar değerlendirilir; entry_mask ile ayrıca
+        daraltılabilir (ör. belirli bir piyasa rejimindeki barlar).
+        """
+        from indicators.ta_manager import calculate_indicators
+        from risk.stop_target_manager import stop_target_grid
+        
+        analyzed = df if 'ATR14' in df.columns else calculate_indicators(df)
+        mask = np.ones(len(analyzed), dtype=bool) if entry_mask is None else np.asarray(entry_mask, dtype=bool)
+        if hunter is not None:
+            mask &= self.entry_signal_series(analyzed, hunter)
+        return stop_target_grid(analyzed, entry_mask=mask, **grid)
+    
     def _is_swing_ok_historical(self, df: pd.DataFrame, latest: pd.Series, hunter) -> bool:
         """Tarihsel swing kontrolü - DÜZELTİLMİŞ"""
         try:
@@ -205,6 +238,10 @@ class RealisticBacktester:
         if not isinstance(df.index, pd.DatetimeIndex):
             df.index = pd.to_datetime(df.index)
         
+        # ✅ İndikatörler nedensel (sadece geçmiş barları kullanır) - tüm geçmiş bir kez hesaplanır
+        analyzed_full = hunter.calculate_indicators(df)
+        entry_signals = self.entry_signal_series(analyzed_full, hunter)
+        
         for idx in range(start_idx, len(df)):
             if self._should_stop_backtest():
                 break
@@ -241,9 +278,8 @@ class RealisticBacktester:
             
             # 2. Yeni pozisyon kontrolü
             if len(open_trades) < self.max_positions and capital > 1000:
-                if self.check_entry_signal(df, idx, hunter):
-                    historical_data = df.iloc[:idx+1].copy()
-                    analyzed_data = hunter.calculate_indicators(historical_data)
+                if entry_signals[idx]:
+                    analyzed_data = analyzed_full.iloc[:idx+1]
                     
                     if analyzed_data is not None and not analyzed_data.empty:
                         latest = analyzed_data.iloc[-1]
@@ -242,6 +242,46 @@ class DataCache:
                     "cache_set"
                 )
 
+    def _get_state_filepath(self, symbol: str, name: str) -> str:
+        """Sembol durum dosyası yolu (bar cache'i ile aynı dizinde)"""
+        safe_symbol = "".join(c for c in symbol if c.isalnum() or c in ('-', '_'))
+        return os.path.join(self.cache_dir, f"{safe_symbol}_{name}.state.pkl")
+
+    def get_state(self, symbol: str, name: str) -> Optional[Any]:
+        """Sembole ait durum nesnesini getir (ör. S/R takipçisi) - TTL bar cache'i ile aynı"""
+        filepath = self._get_state_filepath(symbol, name)
+        with self.lock:
+            try:
+                if os.path.exists(filepath):
+                    file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
+                    if datetime.now() - file_time < self.ttl:
+                        with open(filepath, 'rb') as f:
+                            return pickle.load(f)
+                    os.remove(filepath)
+            except Exception as e:
+                self.error_handler.log_error(
+                    f"Durum okuma hatası: {e}",
+                    ErrorSeverity.LOW,
+                    symbol,
+                    "state_get"
+                )
+        return None
+
+    def set_state(self, symbol: str, name: str, state: Any):
+        """Sembole ait durum nesnesini kaydet"""
+        filepath = self._get_state_filepath(symbol, name)
+        with self.lock:
+            try:
+                with open(filepath, 'wb') as f:
+                    pickle.dump(state, f)
+            except Exception as e:
+                self.error_handler.log_error(
+                    f"Durum yazma hatası: {e}",
+                    ErrorSeverity.LOW,
+                    symbol,
+                    "state_set"
+                )
+
 class ConfigValidator:
     """Config doğrulama sınıfı"""
     
@@ -0,0 +1,90 @@
+# core/deadline.py
+"""
+Sembol başına süre sınırı ve işbirlikçi iptal.
+
+tv.get_hist kesilemeyen, bloklayan bir çağrıdır. Bu yüzden ayrı bir daemon thread'de
+çalıştırılır ve çağıran taraf en fazla kalan süre kadar bekler. Süre dolar veya tarama
+durdurulursa çağrı terk edilir (thread, websocket zaman aşımıyla kendiliğinden biter).
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+_POLL_SECONDS = 0.1
+
+
+class DeadlineExceeded(TimeoutError):
+    """Süre sınırı aşıldı"""
+
+
+class ScanCancelled(Exception):
+    """Tarama durduruldu"""
+
+
+class Deadline:
+    """
+    Mutlak bitiş zamanı (time.monotonic) + iptal olayı.
+    seconds None/0: süre sınırı yok. parent verilirse ikisinden erken biten geçerlidir
+    (ör. sembol süresi tarama süresini aşamaz).
+    """
+    def __init__(self, seconds: Optional[float] = None, cancel_event: Optional[threading.Event] = None,
+                 parent: Optional['Deadline'] = None):
+        expires = time.monotonic() + seconds if seconds else None
+        if parent is not None:
+            if parent.expires is not None:
+                expires = parent.expires if expires is None else min(expires, parent.expires)
+            cancel_event = cancel_event or parent.cancel_event
+        self.expires = expires
+        self.cancel_event = cancel_event
+
+    def remaining(self) -> Optional[float]:
+        """Kalan saniye (sınırsızsa None)"""
+        return None if self.expires is None else max(self.expires - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def check(self):
+        """İptal veya süre aşımında ilgili istisnayı fırlat"""
+        if self.cancelled():
+            raise ScanCancelled()
+        if self.expired():
+            raise DeadlineExceeded()
+
+    def sleep(self, seconds: float):
+        """Süre sınırını ve iptali gözeterek bekle"""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        if self.cancel_event is not None:
+            self.cancel_event.wait(seconds)
+        else:
+            time.sleep(seconds)
+        self.check()
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """fn'i süre sınırı içinde çalıştır - aşılırsa DeadlineExceeded, durdurulursa ScanCancelled"""
+        self.check()
+        if self.expires is None and self.cancel_event is None:
+            return fn(*args, **kwargs)
+
+        outcome = {}
+        done = threading.Event()
+
+        def target():
+            try:
+                outcome['value'] = fn(*args, **kwargs)
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=target, daemon=True, name='deadline-call').start()
+        while not done.wait(_POLL_SECONDS if self.remaining() is None else min(_POLL_SECONDS, self.remaining())):
+            self.check()
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('value')
@@ -0,0 +1,90 @@
+# core/telemetry.py
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class RejectionRecord(NamedTuple):
+    """Tek red kaydı"""
+    symbol: str
+    stage: str
+    reason: str
+    value: Optional[float] = None
+    threshold: Optional[object] = None
+
+
+class RejectionTelemetry:
+    """
+    Düşük maliyetli red telemetrisi - debug print'lerinin yerine.
+    Son kayıtlar önceden ayrılmış halka tamponda, toplamlar sayaçlarda tutulur.
+    """
+    def __init__(self, capacity: int = 4096):
+        self.capacity = max(1, capacity)
+        self.lock = threading.Lock()
+        self._buffer: List[Optional[RejectionRecord]] = [None] * self.capacity
+        self._next = 0
+        self._evaluations: Dict[str, int] = {}
+        self._rejections: Dict[tuple, int] = {}  # (stage, reason) -> adet
+
+    def evaluated(self, stage: str, count: int = 1):
+        """Aşamanın çalıştığı sembol sayısını artır (red oranının paydası)"""
+        with self.lock:
+            self._evaluations[stage] = self._evaluations.get(stage, 0) + count
+
+    def record(self, symbol: str, stage: str, reason: str, value=None, threshold=None):
+        """Red kaydı ekle - tampon dolduğunda en eski kaydın üzerine yazılır"""
+        key = (stage, reason)
+        with self.lock:
+            self._buffer[self._next % self.capacity] = RejectionRecord(symbol, stage, reason, value, threshold)
+            self._next += 1
+            self._rejections[key] = self._rejections.get(key, 0) + 1
+
+    def recent(self, limit: Optional[int] = None) -> List[RejectionRecord]:
+        """Tampondaki son kayıtlar (eskiden yeniye)"""
+        with self.lock:
+            count = min(self._next, self.capacity)
+            start = self._next - count
+            records = [self._buffer[i % self.capacity] for i in range(start, self._next)]
+        return records[-limit:] if limit else records
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aşama -> {sebep: red yüzdesi}"""
+        with self.lock:
+            evaluations = dict(self._evaluations)
+            rejections = dict(self._rejections)
+        result: Dict[str, Dict[str, float]] = {}
+        for (stage, reason), count in rejections.items():
+            total = evaluations.get(stage, 0)
+            result.setdefault(stage, {})[reason] = count / total * 100 if total else 0.0
+        return result
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        if not summary:
+            return "Red kaydı yok"
+        parts = []
+        for stage, reasons in summary.items():
+            ordered = sorted(reasons.items(), key=lambda x: -x[1])
+            parts.append(f"{stage}: " + ", ".join(f"{reason} %{pct:.0f}" for reason, pct in ordered))
+        return " | ".join(parts)
+
+    def drain(self) -> Tuple[Dict[str, int], List[RejectionRecord]]:
+        """Sayaçları ve tampondaki kayıtları al ve sıfırla (process worker -> ana process aktarımı)"""
+        records = self.recent()
+        with self.lock:
+            evaluations = dict(self._evaluations)
+        self.reset()
+        return evaluations, records
+
+    def absorb(self, evaluations: Dict[str, int], records: List[RejectionRecord]):
+        """Başka bir telemetriden (drain) gelen sayaç ve kayıtları ekle"""
+        for stage, count in evaluations.items():
+            self.evaluated(stage, count)
+        for record in records:
+            self.record(*record)
+
+    def reset(self):
+        with self.lock:
+            self._buffer = [None] * self.capacity
+            self._next = 0
+            self._evaluations.clear()
+            self._rejections.clear()
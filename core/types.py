@@ -36,6 +36,7 @@ class MultiTimeframeAnalysis:
     weekly_rsi: float
     weekly_macd_positive: bool
     recommendation: str
+    timeframes: Dict[str, str] = field(default_factory=dict)  # zaman dilimi -> trend (ör. 'weekly', 'monthly')
 
 @dataclass
 class MarketAnalysis:
@@ -110,4 +111,140 @@ class FilterScore:
     max_score: float
     weight: float
     details: Dict
-    passed: bool
\ No newline at end of file
+    passed: bool
+@dataclass
+class PortfolioRisk:
+    volatility_pct: float                                           # yıllık portföy volatilitesi
+    weights: Dict[str, float] = field(default_factory=dict)         # sermaye ağırlıkları
+    marginal_risk: Dict[str, float] = field(default_factory=dict)   # d(vol)/d(ağırlık), yıllık %
+    risk_contribution_pct: Dict[str, float] = field(default_factory=dict)  # toplam riske katkı (%)
+    diversification_ratio: float = 1.0
+    effective_positions: float = 0.0
+    warnings: List[str] = field(default_factory=list)
+
+_CONSOLIDATION_LABELS = {'upward': "Kırılım ↑", 'potential_upward': "Kırılım yakın", 'none': "Sıkışma"}
+
+class ScanResult:
+    """
+    Tarama sonucu - sayısal alanlar, __slots__ ile kompakt.
+    Sıralama, filtreleme ve dışa aktarma sayılarla çalışır; metin biçimi sadece gösterimde (to_row) üretilir.
+    """
+    __slots__ = ('symbol', 'price', 'score', 'pattern_score', 'patterns', 'entry', 'stop_loss',
+                 'target1', 'target2', 'rr_ratio', 'risk_pct', 'shares', 'investment',
+                 'market_regime', 'market_score', 'rs_score', 'allocation',
+                 'mtf', 'consolidation', 'fib_entry')
+
+    def __init__(self, symbol: str, price: float, score: float, pattern_score: float, patterns: Tuple[str, ...],
+                 entry: float, stop_loss: float, target1: float, target2: float, rr_ratio: float,
+                 risk_pct: float, shares: int, investment: float, market_regime: str, market_score: float,
+                 rs_score: Optional[float] = None, allocation: str = "",
+                 mtf: str = "", consolidation: str = "", fib_entry: Optional[float] = None):
+        self.symbol = symbol
+        self.price = price
+        self.score = score
+        self.pattern_score = pattern_score
+        self.patterns = tuple(patterns)
+        self.entry = entry
+        self.stop_loss = stop_loss
+        self.target1 = target1
+        self.target2 = target2
+        self.rr_ratio = rr_ratio
+        self.risk_pct = risk_pct
+        self.shares = shares
+        self.investment = investment
+        self.market_regime = market_regime
+        self.market_score = market_score
+        self.rs_score = rs_score
+        self.allocation = allocation   # portföy tahsis sonucu ('' = tahsis yapılmadı)
+        self.mtf = mtf                 # MTF önerisi ('' = analiz kapalı)
+        self.consolidation = consolidation  # konsolidasyon kırılım tipi ('' = konsolidasyon yok)
+        self.fib_entry = fib_entry     # en yakın 0.618-0.786 Fibonacci giriş seviyesi
+
+    @property
+    def signal(self) -> str:
+        signal = "🔥 Güçlü" if self.score >= 75 else "⚡ Orta"
+        return "🎯 " + signal if self.pattern_score >= 15 else signal
+
+    def replace(self, **changes) -> 'ScanResult':
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return ScanResult(**values)
+
+    def to_record(self) -> Dict[str, Any]:
+        """Sütun adı -> ham değer (DataFrame / Excel için)"""
+        record = {
+            'Hisse': self.symbol,
+            'Fiyat': self.price,
+            'Sinyal': self.signal,
+            'Skor': self.score,
+            'Pattern Skor': self.pattern_score,
+            'Bullish Patternler': ", ".join(self.patterns) or "Yok",
+            'Optimal Giriş': self.entry,
+            'Stop Loss': self.stop_loss,
+            'Hedef 1': self.target1,
+            'Hedef 2': self.target2,
+            'R/R': self.rr_ratio,
+            'Risk %': self.risk_pct,
+            'Pozisyon': self.shares,
+            'Yatırım': self.investment,
+            'Piyasa': self.market_regime.title(),
+            'Piyasa Skoru': self.market_score,
+            'RS Skoru': self.rs_score,
+            'MTF': self.mtf,
+            'Konsolidasyon': self.consolidation,
+            'Fib Giriş': self.fib_entry
+        }
+        if self.allocation:
+            record['Tahsis'] = self.allocation
+        return record
+
+    def to_row(self) -> Dict[str, str]:
+        """Sütun adı -> gösterim metni (tablo)"""
+        row = {
+            'Hisse': self.symbol,
+            'Fiyat': f"{self.price:.2f}",
+            'Sinyal': self.signal,
+            'Skor': f"{int(self.score)}/100",
+            'Pattern Skor': f"{self.pattern_score}/20",
+            'Bullish Patternler': ", ".join(self.patterns) or "Yok",
+            'Optimal Giriş': f"{self.entry:.2f}",
+            'Stop Loss': f"{self.stop_loss:.2f}",
+            'Hedef 1': f"{self.target1:.2f}",
+            'Hedef 2': f"{self.target2:.2f}",
+            'R/R': f"1:{self.rr_ratio:.1f}",
+            'Risk %': f"{self.risk_pct:.1f}",
+            'Pozisyon': f"{self.shares} adet",
+            'Yatırım': f"{self.investment:,.0f} TL",
+            'Piyasa': self.market_regime.title(),
+            'Piyasa Skoru': f"{self.market_score:.0f}/100",
+            'RS Skoru': f"{self.rs_score:.0f}/100" if self.rs_score is not None else "-",
+            'MTF': self.mtf or "-",
+            'Konsolidasyon': _CONSOLIDATION_LABELS.get(self.consolidation, self.consolidation) or "-",
+            'Fib Giriş': f"{self.fib_entry:.2f}" if self.fib_entry is not None else "-"
+        }
+        if self.allocation:
+            row['Tahsis'] = self.allocation
+        return row
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ScanResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ScanResult({self.symbol}, skor={self.score:.1f}, giriş={self.entry:.2f}, stop={self.stop_loss:.2f})"
+
+@dataclass
+class WatchlistChange:
+    """Sürekli taramada bir turun sonuç farkı"""
+    entered: List[ScanResult] = field(default_factory=list)   # listeye giren adaylar
+    left: List[str] = field(default_factory=list)             # listeden çıkan semboller
+    updated: List[ScanResult] = field(default_factory=list)   # değerleri değişen adaylar
+    checked: int = 0                                          # kontrol edilen sembol
+    evaluated: int = 0                                        # verisi değiştiği için yeniden analiz edilen
+    timed_out: List[str] = field(default_factory=list)        # bu turda süre aşımına uğrayan semboller
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.entered or self.left or self.updated)
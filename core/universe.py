@@ -0,0 +1,38 @@
+# core/universe.py
+import pandas as pd
+import numpy as np
+from typing import Dict
+
+HIGHER_LOWS_WINDOW = 20
+
+def column_values(frame: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """Tablodan float sütun al - sütun yoksa varsayılan değerle doldur"""
+    if name in frame.columns:
+        return frame[name].to_numpy(dtype=float)
+    return np.full(len(frame), default, dtype=float)
+
+def build_universe_frame(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    İndikatörü hesaplanmış sembol DataFrame'lerinden evren tablosu oluşturur.
+    Her satır bir sembolün son barıdır (index = sembol).
+    """
+    rows = {}
+    higher_lows = {}
+    for symbol, df in frames.items():
+        if df is None or df.empty:
+            continue
+        rows[symbol] = df.iloc[-1]
+        if len(df) >= HIGHER_LOWS_WINDOW:
+            lows = df['low'].to_numpy(dtype=float)[-HIGHER_LOWS_WINDOW:]
+            higher_lows[symbol] = np.count_nonzero(lows[1:] > lows[:-1])
+        else:
+            higher_lows[symbol] = np.nan
+
+    if not rows:
+        return pd.DataFrame()
+
+    universe = pd.DataFrame.from_dict(rows, orient='index')
+    universe.index.name = 'symbol'
+    universe['Higher_Lows'] = pd.Series(higher_lows, dtype=float)
+    universe['Bar_Count'] = pd.Series({symbol: len(frames[symbol]) for symbol in rows}, dtype=float)
+    return universe
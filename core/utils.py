@@ -6,6 +6,28 @@ import random
 import time
 from tvDatafeed import TvDatafeed
 
+class FrozenDict(dict):
+    """
+    Değiştirilemez sözlük - config ve analizör ayarları için.
+    Thread ve process'ler arasında kilitsiz paylaşılabilir (pickle edilebilir).
+    Değişiklik için with_updates ile yeni kopya oluşturulur.
+    """
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict değiştirilemez - with_updates() ile yeni kopya oluşturun")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def with_updates(self, updates: dict) -> 'FrozenDict':
+        return type(self)({**self, **updates})
+
+def freeze_config(config) -> FrozenDict:
+    """Config'i değiştirilemez hale getir (zaten donmuşsa aynı nesne)"""
+    return config if isinstance(config, FrozenDict) else FrozenDict(config or {})
+
 def setup_logging(log_file='swing_hunter_ultimate.log'):
     logging.basicConfig(
         level=logging.INFO,
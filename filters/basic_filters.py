@@ -1,6 +1,9 @@
 # filters/basic_filters.py - GÜVENLİ VERSİYON
 import pandas as pd
 import numpy as np
+from typing import List, Tuple
+from filters.expressions import compile_expression
+from core.universe import column_values, HIGHER_LOWS_WINDOW
 
 def has_higher_lows(df: pd.DataFrame, min_count: int = 2) -> bool:
     """Son 20 barda en az min_count adet yükselen dip kontrolü"""
@@ -16,121 +19,84 @@ def has_higher_lows(df: pd.DataFrame, min_count: int = 2) -> bool:
     
     return higher_low_count >= min_count
 
-def basic_filters(latest: dict, config: dict, df: pd.DataFrame = None) -> bool:
+def _reject(telemetry, symbol: str, reason: str, value=None, threshold=None) -> bool:
+    """Red sebebini telemetriye yaz (varsa) ve False döndür"""
+    if telemetry is not None:
+        telemetry.record(symbol, 'basic_filters', reason, value, threshold)
+    return False
+
+def basic_filters(latest: dict, config: dict, df: pd.DataFrame = None,
+                  telemetry=None, symbol: str = None) -> bool:
     """
     Temel filtreleri uygular - GÜVENLİ VERSİYON
+    telemetry: RejectionTelemetry - red sebepleri print yerine buraya kaydedilir
     """
-    symbol = latest.get('symbol', 'UNKNOWN')
-    debug_mode = config.get('debug_mode', False)
-    
-    if debug_mode:
-        print(f"\n🔍 {symbol} - FİLTRE ANALİZİ:")
+    symbol = symbol or latest.get('symbol', 'UNKNOWN')
+    if telemetry is not None:
+        telemetry.evaluated('basic_filters')
     
     # 1. RSI kontrolü
     rsi = latest.get('RSI', 50)
     min_rsi = config.get('min_rsi', 30)
     max_rsi = config.get('max_rsi', 70)
     if not (min_rsi <= rsi <= max_rsi):
-        if debug_mode:
-            print(f"   ❌ RSI: {rsi:.1f} → [{min_rsi}-{max_rsi}] aralığında DEĞİL")
-        return False
-    if debug_mode:
-        print(f"   ✅ RSI: {rsi:.1f}")
+        return _reject(telemetry, symbol, 'RSI', rsi, (min_rsi, max_rsi))
     
     # 2. Relative volume - GÜVENLİ
     rel_vol = latest.get('Relative_Volume', 1.0)
     min_rel_vol = config.get('min_relative_volume', 0.6)
     if rel_vol < min_rel_vol:
-        if debug_mode:
-            print(f"   ❌ RelVol: {rel_vol:.3f} → Min {min_rel_vol}'ten DÜŞÜK")
-        return False
-    if debug_mode:
-        print(f"   ✅ RelVol: {rel_vol:.3f}")
+        return _reject(telemetry, symbol, 'RelVol', rel_vol, min_rel_vol)
     
     # 3. EMA20 kontrolü - OPSİYONEL
     if config.get('price_above_ema20', False):
         price = latest.get('close', 0)
         ema20 = latest.get('EMA20', 0)
         if price <= ema20:
-            if debug_mode:
-                print(f"   ❌ EMA20: {price:.2f} ≤ {ema20:.2f}")
-            return False
-        if debug_mode:
-            print(f"   ✅ EMA20: {price:.2f} > {ema20:.2f}")
+            return _reject(telemetry, symbol, 'EMA20', price, ema20)
     
     # 4. EMA50 kontrolü - OPSİYONEL
     if config.get('price_above_ema50', False):
         price = latest.get('close', 0)
         ema50 = latest.get('EMA50', 0)
         if price <= ema50:
-            if debug_mode:
-                print(f"   ❌ EMA50: {price:.2f} ≤ {ema50:.2f}")
-            return False
-        if debug_mode:
-            print(f"   ✅ EMA50: {price:.2f} > {ema50:.2f}")
+            return _reject(telemetry, symbol, 'EMA50', price, ema50)
     
     # 5. MACD kontrolü
     if config.get('macd_positive', False):
         macd_level = latest.get('MACD_Level', 0)
         macd_signal = latest.get('MACD_Signal', 0)
         if macd_level <= macd_signal:
-            if debug_mode:
-                print(f"   ❌ MACD: {macd_level:.4f} ≤ {macd_signal:.4f}")
-            return False
-        if debug_mode:
-            print(f"   ✅ MACD: {macd_level:.4f} > {macd_signal:.4f}")
+            return _reject(telemetry, symbol, 'MACD', macd_level, macd_signal)
     
     # 6. ADX kontrolü
     if config.get('check_adx', False):
         adx = latest.get('ADX', 0)
         min_adx = 20
         if adx < min_adx:
-            if debug_mode:
-                print(f"   ❌ ADX: {adx:.1f} → Min {min_adx}'ten DÜŞÜK")
-            return False
-        if debug_mode:
-            print(f"   ✅ ADX: {adx:.1f}")
+            return _reject(telemetry, symbol, 'ADX', adx, min_adx)
     
     # 7. CMF kontrolü (kurumsal akış)
     if config.get('check_institutional_flow', False):
         cmf = latest.get('CMF', 0)
         if cmf < 0:
-            if debug_mode:
-                print(f"   ❌ CMF: {cmf:.3f} → Negatif (kurumsal satış)")
-            return False
-        if debug_mode:
-            print(f"   ✅ CMF: {cmf:.3f}")
+            return _reject(telemetry, symbol, 'CMF', cmf, 0)
     
     # 8. Momentum divergens kontrolü
     if config.get('check_momentum_divergence', False):
         rsi_val = latest.get('RSI', 50)
         daily_pct = latest.get('Daily_Change_Pct', 0)
         
-        if rsi_val > 70 and daily_pct < 0:
-            if debug_mode:
-                print(f"   ❌ Momentum: AŞIRI alımda düşüş (RSI={rsi_val:.1f}, Change={daily_pct:.1f}%)")
-            return False
-        
-        if rsi_val < 30 and daily_pct > 0:
-            if debug_mode:
-                print(f"   ❌ Momentum: AŞIRI satımda yükseliş (RSI={rsi_val:.1f}, Change={daily_pct:.1f}%)")
-            return False
-        if debug_mode:
-            print(f"   ✅ Momentum: Uyumlu")
+        # Aşırı alımda düşüş / aşırı satımda yükseliş
+        if (rsi_val > 70 and daily_pct < 0) or (rsi_val < 30 and daily_pct > 0):
+            return _reject(telemetry, symbol, 'Momentum', rsi_val, daily_pct)
     
-    # ✅ 9. Yükselen dipler kontrolü - GÜVENLİ
+    # ✅ 9. Yükselen dipler kontrolü - GÜVENLİ (veri yetersizse atlanır)
     if config.get('min_higher_lows', 0) > 0:
         if df is not None and len(df) >= 20:
             min_higher_lows = config.get('min_higher_lows', 1)
             if not has_higher_lows(df, min_higher_lows):
-                if debug_mode:
-                    print(f"   ❌ Yükselen Dip: {min_higher_lows} adet bulunamadı")
-                return False
-            if debug_mode:
-                print(f"   ✅ Yükselen Dip: {min_higher_lows}+ adet")
-        else:
-            if debug_mode:
-                print(f"   ⚠️ Yükselen Dip: Veri yetersiz (df: {len(df) if df is not None else 0} bar)")
+                return _reject(telemetry, symbol, 'HigherLows', None, min_higher_lows)
     
     # 10. Likidite kontrolü
     min_liquidity = config.get('min_liquidity_ratio', 0.3)
@@ -140,13 +106,114 @@ def basic_filters(latest: dict, config: dict, df: pd.DataFrame = None) -> bool:
     if volume_20d_avg > 0:
         liquidity_ratio = current_volume / volume_20d_avg
         if liquidity_ratio < min_liquidity:
-            if debug_mode:
-                print(f"   ❌ Likidite: {liquidity_ratio:.2f} → Min {min_liquidity}'ten DÜŞÜK")
-            return False
-        if debug_mode:
-            print(f"   ✅ Likidite: {liquidity_ratio:.2f}")
-    
-    if debug_mode:
-        print(f"   🎉 {symbol}: TÜM FİLTRELERDEN GEÇTİ!")
+            return _reject(telemetry, symbol, 'Liquidity', liquidity_ratio, min_liquidity)
+
+    # 11. Bildirimsel filtre ifadesi (swing_config.json -> filter_expression)
+    expression = config.get('filter_expression', '')
+    if expression:
+        if not compile_expression(expression).evaluate(latest):
+            return _reject(telemetry, symbol, 'Expression', None, expression)
     
     return True
+
+
+def _rejection_masks(frame: pd.DataFrame, config: dict, higher_lows: np.ndarray) -> dict:
+    """
+    basic_filters kontrollerinin NumPy maskeleri - satır başına "reddedildi" bilgisi.
+    higher_lows: Son 20 bardaki yükselen dip sayısı (veri yetersizse NaN).
+    """
+    rejections = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 1. RSI kontrolü
+        rsi = column_values(frame, 'RSI', 50)
+        min_rsi = config.get('min_rsi', 30)
+        max_rsi = config.get('max_rsi', 70)
+        rejections['RSI'] = ~((min_rsi <= rsi) & (rsi <= max_rsi))
+
+        # 2. Relative volume
+        rel_vol = column_values(frame, 'Relative_Volume', 1.0)
+        rejections['RelVol'] = rel_vol < config.get('min_relative_volume', 0.6)
+
+        close = column_values(frame, 'close', 0)
+
+        # 3-4. EMA kontrolleri - OPSİYONEL
+        if config.get('price_above_ema20', False):
+            rejections['EMA20'] = close <= column_values(frame, 'EMA20', 0)
+        if config.get('price_above_ema50', False):
+            rejections['EMA50'] = close <= column_values(frame, 'EMA50', 0)
+
+        # 5. MACD kontrolü
+        if config.get('macd_positive', False):
+            rejections['MACD'] = (column_values(frame, 'MACD_Level', 0) <=
+                                  column_values(frame, 'MACD_Signal', 0))
+
+        # 6. ADX kontrolü
+        if config.get('check_adx', False):
+            rejections['ADX'] = column_values(frame, 'ADX', 0) < 20
+
+        # 7. CMF kontrolü (kurumsal akış)
+        if config.get('check_institutional_flow', False):
+            rejections['CMF'] = column_values(frame, 'CMF', 0) < 0
+
+        # 8. Momentum divergens kontrolü
+        if config.get('check_momentum_divergence', False):
+            daily_pct = column_values(frame, 'Daily_Change_Pct', 0)
+            rejections['Momentum'] = (((rsi > 70) & (daily_pct < 0)) |
+                                      ((rsi < 30) & (daily_pct > 0)))
+
+        # 9. Yükselen dipler - veri yetersizse (NaN) kontrol atlanır
+        if config.get('min_higher_lows', 0) > 0:
+            rejections['HigherLows'] = higher_lows < config.get('min_higher_lows', 1)
+
+        # 10. Likidite kontrolü
+        volume_20d_avg = column_values(frame, 'Volume_20d_Avg', 0)
+        liquidity_ratio = column_values(frame, 'volume', 0) / volume_20d_avg
+        rejections['Liquidity'] = ((volume_20d_avg > 0) &
+                                   (liquidity_ratio < config.get('min_liquidity_ratio', 0.3)))
+
+    # 11. Bildirimsel filtre ifadesi
+    expression = config.get('filter_expression', '')
+    if expression:
+        rejections['Expression'] = ~compile_expression(expression).evaluate(frame)
+
+    return rejections
+
+
+def screen_universe(universe: pd.DataFrame, config: dict) -> Tuple[List[str], pd.DataFrame]:
+    """
+    Evren taraması - basic_filters kontrollerini tüm semboller için NumPy maskeleriyle uygular.
+
+    universe: Her satırı bir sembolün son bar değerleri olan tablo (index = sembol).
+    Dönüş: (geçen semboller, kontrol bazında red matrisi)
+    """
+    if universe is None or universe.empty:
+        return [], pd.DataFrame()
+
+    rejections = _rejection_masks(universe, config, column_values(universe, 'Higher_Lows', np.nan))
+    rejection_matrix = pd.DataFrame(rejections, index=universe.index)
+    passed = ~np.logical_or.reduce(list(rejections.values()))
+    survivors = universe.index[passed].tolist()
+    return survivors, rejection_matrix
+
+
+def higher_lows_series(df: pd.DataFrame, window: int = HIGHER_LOWS_WINDOW) -> np.ndarray:
+    """Her bar için son `window` bardaki yükselen dip sayısı (kayan sayım, yetersiz veride NaN)"""
+    rising = (df['low'].diff() > 0).astype(float)
+    counts = np.array(rising.rolling(window - 1).sum(), dtype=float)
+    counts[:window - 1] = np.nan
+    return counts
+
+
+def basic_filters_series(df: pd.DataFrame, config: dict) -> np.ndarray:
+    """
+    Geçmiş sinyal serisi - basic_filters'ı tüm barlar için tek vektörel geçişte uygular.
+
+    df: İndikatörleri hesaplanmış tek sembol geçmişi.
+    Dönüş: Bar başına giriş uygunluğu (bool dizisi). i. eleman,
+           basic_filters(df.iloc[i], config, df.iloc[:i+1]) ile aynıdır.
+    """
+    if df is None or df.empty:
+        return np.zeros(0, dtype=bool)
+
+    rejections = _rejection_masks(df, config, higher_lows_series(df))
+    return ~np.logical_or.reduce(list(rejections.values()))
@@ -0,0 +1,213 @@
+# filters/expressions.py
+"""
+Bildirimsel filtre ifadeleri - swing_config.json içinden tarama koşulu tanımlama.
+
+Örnek: "RSI between 40 and 65 and close > EMA50 and CMF > 0"
+
+İfade bir kez ayrıştırılır ve NumPy üzerinde çalışan bir fonksiyona derlenir.
+Aynı derlenmiş ifade tek sembolün tüm geçmişine (DataFrame), evren tablosuna
+(sembol başına bir satır) veya tek bir bara (dict / Series) uygulanabilir.
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Set
+
+import numpy as np
+import pandas as pd
+
+
+class ExpressionError(ValueError):
+    """Filtre ifadesi ayrıştırma / değerlendirme hatası"""
+
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+\.\d*|\.\d+|\d+)|([A-Za-z_][A-Za-z0-9_]*)|(<=|>=|==|!=|<|>|\+|-|\*|/|\(|\)))")
+_KEYWORDS = {'and', 'or', 'not', 'between'}
+
+_COMPARISONS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+_ARITHMETIC = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide,
+}
+
+
+def _tokenize(text: str) -> List[tuple]:
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ExpressionError(f"Geçersiz karakter ({pos}. konum): {text[pos:pos + 10]!r}")
+        number, name, op = match.groups()
+        if number is not None:
+            tokens.append(('num', float(number)))
+        elif name is not None:
+            lowered = name.lower()
+            tokens.append(('kw', lowered) if lowered in _KEYWORDS else ('name', name))
+        else:
+            tokens.append(('op', op))
+        pos = match.end()
+    tokens.append(('end', None))
+    return tokens
+
+
+def _resolve_column(data, name: str) -> np.ndarray:
+    """Alan adını veriden float dizisi olarak al (büyük/küçük harf duyarsız)"""
+    columns = data.columns if isinstance(data, pd.DataFrame) else data.keys()
+    if name not in columns:
+        matches = [c for c in columns if isinstance(c, str) and c.lower() == name.lower()]
+        if not matches:
+            raise ExpressionError(f"Bilinmeyen alan: {name}")
+        name = matches[0]
+    if isinstance(data, pd.DataFrame):
+        return data[name].to_numpy(dtype=float)
+    return np.asarray(data[name], dtype=float)
+
+
+class _Parser:
+    """Özyinelemeli iniş ayrıştırıcı - AST yerine doğrudan NumPy kapanışları üretir"""
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.columns: Set[str] = set()
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def take(self, kind=None, value=None):
+        token = self.tokens[self.pos]
+        if (kind is not None and token[0] != kind) or (value is not None and token[1] != value):
+            expected = value or kind
+            raise ExpressionError(f"'{expected}' bekleniyordu, '{token[1]}' bulundu")
+        self.pos += 1
+        return token
+
+    def accept(self, kind, value):
+        if self.peek() == (kind, value):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Callable:
+        node = self.parse_or()
+        self.take('end')
+        return node
+
+    def parse_or(self) -> Callable:
+        node = self.parse_and()
+        while self.accept('kw', 'or'):
+            left, right = node, self.parse_and()
+            node = lambda d, l=left, r=right: np.logical_or(l(d), r(d))
+        return node
+
+    def parse_and(self) -> Callable:
+        node = self.parse_not()
+        while self.accept('kw', 'and'):
+            left, right = node, self.parse_not()
+            node = lambda d, l=left, r=right: np.logical_and(l(d), r(d))
+        return node
+
+    def parse_not(self) -> Callable:
+        if self.accept('kw', 'not'):
+            operand = self.parse_not()
+            return lambda d, o=operand: np.logical_not(o(d))
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> Callable:
+        left = self.parse_arith()
+        token = self.peek()
+        if token == ('kw', 'between'):
+            self.pos += 1
+            low = self.parse_arith()
+            self.take('kw', 'and')
+            high = self.parse_arith()
+            return lambda d, x=left, lo=low, hi=high: np.logical_and(lo(d) <= x(d), x(d) <= hi(d))
+        if token[0] == 'op' and token[1] in _COMPARISONS:
+            self.pos += 1
+            right = self.parse_arith()
+            func = _COMPARISONS[token[1]]
+            return lambda d, l=left, r=right, f=func: f(l(d), r(d))
+        return left
+
+    def parse_arith(self) -> Callable:
+        node = self.parse_term()
+        while self.peek()[0] == 'op' and self.peek()[1] in ('+', '-'):
+            func = _ARITHMETIC[self.take()[1]]
+            left, right = node, self.parse_term()
+            node = lambda d, l=left, r=right, f=func: f(l(d), r(d))
+        return node
+
+    def parse_term(self) -> Callable:
+        node = self.parse_factor()
+        while self.peek()[0] == 'op' and self.peek()[1] in ('*', '/'):
+            func = _ARITHMETIC[self.take()[1]]
+            left, right = node, self.parse_factor()
+            node = lambda d, l=left, r=right, f=func: f(l(d), r(d))
+        return node
+
+    def parse_factor(self) -> Callable:
+        kind, value = self.take()
+        if kind == 'num':
+            return lambda d, v=value: v
+        if kind == 'name':
+            self.columns.add(value)
+            return lambda d, n=value: _resolve_column(d, n)
+        if (kind, value) == ('op', '-'):
+            operand = self.parse_factor()
+            return lambda d, o=operand: np.negative(o(d))
+        if (kind, value) == ('op', '('):
+            node = self.parse_or()
+            self.take('op', ')')
+            return node
+        raise ExpressionError(f"Beklenmeyen ifade öğesi: {value!r}")
+
+
+class CompiledExpression:
+    """Derlenmiş filtre ifadesi"""
+    def __init__(self, text: str):
+        parser = _Parser(text)
+        self.text = text
+        self._func = parser.parse()
+        self.columns = frozenset(parser.columns)
+
+    def evaluate(self, data) -> np.ndarray:
+        """
+        İfadeyi değerlendir.
+        DataFrame için satır başına bool dizisi, dict / Series için tek bool döner.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = self._func(data)
+        if isinstance(data, pd.DataFrame):
+            return np.broadcast_to(np.asarray(result, dtype=bool), (len(data),))
+        return bool(result)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text: str) -> CompiledExpression:
+    """İfadeyi derle - aynı metin tekrar ayrıştırılmaz"""
+    if not text or not text.strip():
+        raise ExpressionError("Boş filtre ifadesi")
+    return CompiledExpression(text.strip())
+
+
+def evaluate_screen_variants(data: pd.DataFrame, variants: Dict[str, str]) -> pd.DataFrame:
+    """
+    Birden fazla tarama varyantını aynı veriye uygula.
+    Dönüş: satır = veri satırı (sembol veya bar), sütun = varyant adı.
+    """
+    return pd.DataFrame(
+        {name: compile_expression(text).evaluate(data) for name, text in variants.items()},
+        index=data.index
+    )
@@ -19,6 +19,8 @@ import pyqtgraph as pg
 from datetime import datetime
 from collections import deque
 
+from patterns.price_action import pattern_arrays
+
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QGridLayout, QWidget, QScrollArea, QCheckBox,
                              QGroupBox, QMessageBox, QProgressDialog, QInputDialog,
@@ -89,11 +91,15 @@ class PatternRecognizer:
     def detect_patterns(df: pd.DataFrame) -> dict:
         """Mum çubuğu pattern'lerini tespit et"""
         
-        if not TALIB_AVAILABLE:  # ✅ Kontrol ekle
-            return {
-                "hammer": [], "shooting_star": [], "engulfing_bullish": [],
-                "engulfing_bearish": [], "doji": [], "morning_star": [], "evening_star": []
+        if not TALIB_AVAILABLE:  # ✅ TA-Lib yoksa vektörel formasyon motoru
+            arrays = pattern_arrays(df)
+            c = df["close"].values
+            names = {
+                "hammer": "hammer", "shooting_star": "shooting_star",
+                "engulfing_bullish": "bullish_engulfing", "engulfing_bearish": "bearish_engulfing",
+                "doji": "doji", "morning_star": "morning_star", "evening_star": "evening_star"
             }
+            return {key: [(i, c[i]) for i in np.flatnonzero(arrays[name])] for key, name in names.items()}
         
         patterns = {
             "hammer": [],
@@ -29,6 +29,10 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['EMA50'] = df['close'].ewm(span=50, adjust=False).mean()
     df['EMA200'] = df['close'].ewm(span=200, adjust=False).mean()
     
+    # EMA eğimleri (5 bar, %) - smart filter toplu skorlama için
+    df['EMA20_Slope_5'] = df['EMA20'].pct_change(5) * 100
+    df['EMA50_Slope_5'] = df['EMA50'].pct_change(5) * 100
+    
     # 2. Diğer indikatörler (TA_AVAILABLE kontrolü)
     if TA_AVAILABLE:
         try:
@@ -70,6 +74,9 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
         print("ℹ️ TA-Lib yok, fallback indikatörler kullanılıyor")
         _calculate_fallback_indicators(df)
     
+    # Önceki bar MACD histogramı (momentum ivmesi için)
+    df['MACD_Hist_Prev'] = df['MACD_Hist'].shift(1)
+    
     # 3. Hacim hesaplamaları (her zaman)
     _calculate_volume_indicators(df)
     
@@ -4,42 +4,98 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 import logging
 
+PATTERN_NAMES = (
+    'bullish_engulfing', 'morning_star', 'hammer', 'piercing_line', 'inverse_hammer',
+    'three_white_soldiers', 'bullish_harami', 'doji', 'spinning_top',
+    'bearish_engulfing', 'shooting_star', 'evening_star'
+)
+BULLISH_PATTERNS = PATTERN_NAMES[:7]
+
+def _shift(values: np.ndarray, periods: int, fill=np.nan) -> np.ndarray:
+    """values[i - periods] (baştaki boşluklar fill ile doldurulur)"""
+    shifted = np.full(len(values), fill, dtype=values.dtype if values.dtype == bool else float)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
+def candlestick_patterns(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    12 mum formasyonunu tüm geçmiş için tek geçişte boolean dizi olarak hesapla.
+    i. eleman, detect_* metodlarının i. barda biten seride döndürdüğü değerdir.
+    """
+    o, h, l, c = (np.asarray(x, dtype=float) for x in (open_, high, low, close))
+    n = len(c)
+    positions = np.arange(n)
+
+    body = np.abs(c - o)
+    total_range = h - l
+    upper_shadow = h - np.maximum(o, c)
+    lower_shadow = np.minimum(o, c) - l
+    bullish = c > o
+    bearish = c < o
+    midpoint = (o + c) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        body_ratio = body / total_range
+        upper_ratio = upper_shadow / total_range
+
+    o1, h1, l1, c1 = (_shift(x, 1) for x in (o, h, l, c))
+    o2, h2, l2, c2 = (_shift(x, 2) for x in (o, h, l, c))
+    body1, body2 = _shift(body, 1), _shift(body, 2)
+    range1, range2 = _shift(total_range, 1), _shift(total_range, 2)
+    bullish1, bullish2 = c1 > o1, c2 > o2
+    bearish1 = c1 < o1
+    bearish2 = c2 < o2
+    mid1, mid2 = _shift(midpoint, 1), _shift(midpoint, 2)
+
+    # Çekiç için düşüş trendi sadece en az 5 bar varsa aranır
+    downtrend = np.where(positions >= 4, _shift(c, 4) > c, True)
+    hammer_shape = (lower_shadow > body * 2.0) & (upper_shadow < body * 0.3) & (body < total_range * 0.3)
+    inverse_shape = (upper_shadow > body * 2.0) & (lower_shadow < body * 0.3) & (body < total_range * 0.3)
+    strong = (body_ratio > 0.6) & (upper_ratio < 0.2)
+    valid_range = total_range != 0
+
+    return {
+        'bullish_engulfing': bearish1 & bullish & (o <= c1) & (c >= o1),
+        'morning_star': (bearish2 & (body2 > range2 * 0.6) & (body1 < range2 * 0.3) & (h1 < c2)
+                         & bullish & (l > h1) & (c > mid2)),
+        'hammer': hammer_shape & downtrend,
+        'piercing_line': bearish1 & bullish & (o < c1) & (c > mid1) & (c < o1),
+        'inverse_hammer': inverse_shape,
+        'three_white_soldiers': (bullish2 & bullish1 & bullish & (c1 > c2) & (c > c1)
+                                 & strong & _shift(strong, 1, False) & _shift(strong, 2, False)),
+        'bullish_harami': bearish1 & bullish & (h < o1) & (l > c1) & (body1 > range1 * 0.5),
+        'doji': valid_range & (body_ratio < 0.1),
+        'spinning_top': (valid_range & (body_ratio >= 0.1) & (body_ratio <= 0.3)
+                         & (upper_shadow > total_range * 0.3) & (lower_shadow > total_range * 0.3)),
+        'bearish_engulfing': bullish1 & bearish & (o >= c1) & (c <= o1),
+        'shooting_star': inverse_shape,
+        'evening_star': (bullish2 & (body2 > range2 * 0.6) & (body1 < range2 * 0.3) & (l1 > h2)
+                         & bearish & (h < l1) & (c < mid2))
+    }
+
+def pattern_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """DataFrame'in OHLC sütunlarından formasyon dizileri"""
+    return candlestick_patterns(*(df[column].to_numpy(dtype=float) for column in ('open', 'high', 'low', 'close')))
+
+def pattern_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Tüm geçmiş için formasyon tablosu (index = df.index, sütun başına bool)"""
+    return pd.DataFrame(pattern_arrays(df), index=df.index)
+
 class PriceActionDetector:
-    """Swing trade için TÜM mum formasyonları - TYPE-SAFE VERSİYON"""
+    """Swing trade için TÜM mum formasyonları - durumsuz, thread'ler arasında paylaşılabilir"""
     def __init__(self, enable_all_patterns: bool = True):
-        self.patterns_detected: Dict[str, bool] = {}
         self.enable_all = enable_all_patterns
         self.logger = logging.getLogger(__name__)
 
     def analyze_patterns(self, df: pd.DataFrame, lookback: int = 20) -> Dict[str, bool]:
-        """Tüm pattern'leri tara - TYPE SAFE"""
+        """Tüm pattern'leri tara - vektörel motorun son barı"""
         if df is None or len(df) < 3:
             return {}
         try:
             recent_df = df.tail(lookback) if len(df) > lookback else df
-            # TEMEL PATTERNLER (mutlaka tanımlı)
-            self.patterns_detected = {
-                # 1. Bullish Patterns
-                'bullish_engulfing': self.detect_bullish_engulfing(recent_df),
-                'morning_star': self.detect_morning_star(recent_df),
-                'hammer': self.detect_hammer(recent_df),
-                'piercing_line': self.detect_piercing_line(recent_df),
-                'inverse_hammer': self.detect_inverse_hammer(recent_df),
-                'three_white_soldiers': self.detect_three_white_soldiers(recent_df),
-                'bullish_harami': self.detect_bullish_harami(recent_df),
-                # 2. Neutral/Reversal Patterns
-                'doji': self.detect_doji(recent_df),
-                'spinning_top': self.detect_spinning_top(recent_df),
-                # 3. Bearish Patterns (bilgi amaçlı)
-                'bearish_engulfing': self.detect_bearish_engulfing(recent_df),
-                'shooting_star': self.detect_shooting_star(recent_df),
-                'evening_star': self.detect_evening_star(recent_df)
-            }
+            arrays = pattern_arrays(recent_df)
             # Sadece bullish pattern'leri döndür (swing için)
-            bullish_patterns = {k: v for k, v in self.patterns_detected.items() 
-                               if k in ['bullish_engulfing', 'morning_star', 'hammer', 
-                                       'piercing_line', 'inverse_hammer', 
-                                       'three_white_soldiers', 'bullish_harami']}
+            bullish_patterns = {name: bool(arrays[name][-1]) for name in BULLISH_PATTERNS}
             active = [p for p, d in bullish_patterns.items() if d]
             if active:
                 self.logger.debug(f"🎯 Pattern'ler: {active}")
@@ -48,158 +104,57 @@ class PriceActionDetector:
             self.logger.error(f"Pattern analiz hatası: {e}")
             return {}
 
+    def pattern_history(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Tüm geçmiş için formasyon tablosu (backtest / grafik için)"""
+        return pattern_frame(df)
+
+    def _latest_pattern(self, df: pd.DataFrame, name: str) -> bool:
+        """Tek formasyonun son bardaki değeri (formasyonlar en fazla 5 bar geriye bakar)"""
+        if df is None or len(df) < 1:
+            return False
+        return bool(pattern_arrays(df.tail(5))[name][-1])
+
     # ========== BULLISH PATTERNS ==========
     def detect_bullish_engulfing(self, df: pd.DataFrame) -> bool:
-        if len(df) < 2: return False
-        prev = df.iloc[-2]; curr = df.iloc[-1]
-        prev_bearish = prev['close'] < prev['open']
-        curr_bullish = curr['close'] > curr['open']
-        engulfing = (curr['open'] <= prev['close'] and curr['close'] >= prev['open'])
-        return prev_bearish and curr_bullish and engulfing
+        return self._latest_pattern(df, 'bullish_engulfing')
 
     def detect_morning_star(self, df: pd.DataFrame) -> bool:
-        if len(df) < 3: return False
-        day1 = df.iloc[-3]; day2 = df.iloc[-2]; day3 = df.iloc[-1]
-        day1_bearish = day1['close'] < day1['open']
-        day1_body = abs(day1['close'] - day1['open'])
-        day1_range = day1['high'] - day1['low']
-        day1_long = day1_body > day1_range * 0.6
-        day2_body = abs(day2['close'] - day2['open'])
-        day2_small = day2_body < day1_range * 0.3
-        gap_down = day2['high'] < day1['close']
-        day3_bullish = day3['close'] > day3['open']
-        gap_up = day3['low'] > day2['high']
-        day1_mid = (day1['open'] + day1['close']) / 2
-        closes_above = day3['close'] > day1_mid
-        return (day1_bearish and day1_long and day2_small and gap_down and
-                day3_bullish and gap_up and closes_above)
+        return self._latest_pattern(df, 'morning_star')
 
     def detect_hammer(self, df: pd.DataFrame) -> bool:
-        if len(df) < 1: return False
-        candle = df.iloc[-1]
-        body = abs(candle['close'] - candle['open'])
-        lower_shadow = min(candle['open'], candle['close']) - candle['low']
-        upper_shadow = candle['high'] - max(candle['open'], candle['close'])
-        total_range = candle['high'] - candle['low']
-        is_hammer = (lower_shadow > body * 2.0 and 
-                     upper_shadow < body * 0.3 and
-                     body < total_range * 0.3)
-        if len(df) >= 5:
-            downtrend = df['close'].iloc[-5] > candle['close']
-            return is_hammer and downtrend
-        return is_hammer
+        return self._latest_pattern(df, 'hammer')
 
     def detect_piercing_line(self, df: pd.DataFrame) -> bool:
-        if len(df) < 2: return False
-        prev = df.iloc[-2]; curr = df.iloc[-1]
-        prev_bearish = prev['close'] < prev['open']
-        curr_bullish = curr['close'] > curr['open']
-        if not (prev_bearish and curr_bullish): return False
-        gap_down = curr['open'] < prev['close']
-        prev_mid = (prev['open'] + prev['close']) / 2
-        closes_above_mid = curr['close'] > prev_mid
-        not_above_open = curr['close'] < prev['open']
-        return gap_down and closes_above_mid and not_above_open
+        return self._latest_pattern(df, 'piercing_line')
 
     def detect_inverse_hammer(self, df: pd.DataFrame) -> bool:
-        if len(df) < 1: return False
-        candle = df.iloc[-1]
-        body = abs(candle['close'] - candle['open'])
-        upper_shadow = candle['high'] - max(candle['open'], candle['close'])
-        lower_shadow = min(candle['open'], candle['close']) - candle['low']
-        total_range = candle['high'] - candle['low']
-        return (upper_shadow > body * 2.0 and
-                lower_shadow < body * 0.3 and
-                body < total_range * 0.3)
+        return self._latest_pattern(df, 'inverse_hammer')
 
     def detect_three_white_soldiers(self, df: pd.DataFrame) -> bool:
-        if len(df) < 3: return False
-        candles = [df.iloc[-3], df.iloc[-2], df.iloc[-1]]
-        all_bullish = all(c['close'] > c['open'] for c in candles)
-        if not all_bullish: return False
-        higher_closes = all(candles[i]['close'] > candles[i-1]['close'] for i in range(1, 3))
-        strong_bodies = all(abs(c['close'] - c['open']) / (c['high'] - c['low']) > 0.6 for c in candles)
-        small_shadows = all((c['high'] - max(c['open'], c['close'])) / (c['high'] - c['low']) < 0.2 for c in candles)
-        return higher_closes and strong_bodies and small_shadows
+        return self._latest_pattern(df, 'three_white_soldiers')
 
     def detect_bullish_harami(self, df: pd.DataFrame) -> bool:
-        if len(df) < 2: return False
-        prev = df.iloc[-2]; curr = df.iloc[-1]
-        prev_bearish = prev['close'] < prev['open']
-        curr_bullish = curr['close'] > curr['open']
-        if not (prev_bearish and curr_bullish): return False
-        inside = (curr['high'] < prev['open'] and curr['low'] > prev['close'])
-        prev_body = abs(prev['close'] - prev['open'])
-        prev_range = prev['high'] - prev['low']
-        prev_long = prev_body > prev_range * 0.5
-        return inside and prev_long
+        return self._latest_pattern(df, 'bullish_harami')
 
     # ========== NEUTRAL/REVERSAL PATTERNS ==========
     def detect_doji(self, df: pd.DataFrame) -> bool:
-        if len(df) < 1: return False
-        candle = df.iloc[-1]
-        body = abs(candle['close'] - candle['open'])
-        total_range = candle['high'] - candle['low']
-        if total_range == 0: return False
-        body_ratio = body / total_range
-        is_doji = body_ratio < 0.1
-        return is_doji
+        return self._latest_pattern(df, 'doji')
 
     def detect_spinning_top(self, df: pd.DataFrame) -> bool:
-        if len(df) < 1: return False
-        candle = df.iloc[-1]
-        body = abs(candle['close'] - candle['open'])
-        total_range = candle['high'] - candle['low']
-        if total_range == 0: return False
-        body_ratio = body / total_range
-        upper_shadow = candle['high'] - max(candle['open'], candle['close'])
-        lower_shadow = min(candle['open'], candle['close']) - candle['low']
-        is_spinning_top = (0.1 <= body_ratio <= 0.3 and
-                          upper_shadow > total_range * 0.3 and
-                          lower_shadow > total_range * 0.3)
-        return is_spinning_top
+        return self._latest_pattern(df, 'spinning_top')
 
     # ========== BEARISH PATTERNS ==========
     def detect_bearish_engulfing(self, df: pd.DataFrame) -> bool:
-        if len(df) < 2: return False
-        prev = df.iloc[-2]; curr = df.iloc[-1]
-        prev_bullish = prev['close'] > prev['open']
-        curr_bearish = curr['close'] < curr['open']
-        engulfing = (curr['open'] >= prev['close'] and curr['close'] <= prev['open'])
-        return prev_bullish and curr_bearish and engulfing
+        return self._latest_pattern(df, 'bearish_engulfing')
 
     def detect_shooting_star(self, df: pd.DataFrame) -> bool:
-        if len(df) < 1: return False
-        candle = df.iloc[-1]
-        body = abs(candle['close'] - candle['open'])
-        upper_shadow = candle['high'] - max(candle['open'], candle['close'])
-        lower_shadow = min(candle['open'], candle['close']) - candle['low']
-        total_range = candle['high'] - candle['low']
-        return (upper_shadow > body * 2.0 and
-                lower_shadow < body * 0.3 and
-                body < total_range * 0.3)
+        return self._latest_pattern(df, 'shooting_star')
 
     def detect_evening_star(self, df: pd.DataFrame) -> bool:
-        if len(df) < 3: return False
-        day1 = df.iloc[-3]; day2 = df.iloc[-2]; day3 = df.iloc[-1]
-        day1_bullish = day1['close'] > day1['open']
-        day1_body = abs(day1['close'] - day1['open'])
-        day1_range = day1['high'] - day1['low']
-        day1_long = day1_body > day1_range * 0.6
-        day2_body = abs(day2['close'] - day2['open'])
-        day2_small = day2_body < day1_range * 0.3
-        gap_up = day2['low'] > day1['high']
-        day3_bearish = day3['close'] < day3['open']
-        gap_down = day3['high'] < day2['low']
-        day1_mid = (day1['open'] + day1['close']) / 2
-        closes_below = day3['close'] < day1_mid
-        return (day1_bullish and day1_long and day2_small and gap_up and
-                day3_bearish and gap_down and closes_below)
+        return self._latest_pattern(df, 'evening_star')
 
     # ========== UTILITY METHODS ==========
     def get_pattern_score(self, patterns: Optional[Dict[str, bool]] = None) -> int:
-        if patterns is None:
-            patterns = self.patterns_detected
         if not patterns:
             return 0
         weights = {
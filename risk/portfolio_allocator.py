@@ -0,0 +1,110 @@
+# risk/portfolio_allocator.py
+"""
+Portföy seviyesinde sermaye dağıtımı.
+
+calculate_trade_plan her adayı tüm sermayeye göre tek başına boyutlandırır.
+Burada geçen tüm adaylar skor sırasıyla (açgözlü) yerleştirilir; toplam sermaye,
+pozisyon başına sermaye / risk ve toplam risk bütçeleri ile korelasyon sınırı
+birlikte uygulanır. Yüzlerce aday için milisaniyeler içinde tutarlı bir portföy verir.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+REASON_ALLOCATED = "✅ Tahsis"
+REASON_CORRELATION = "Korelasyon"
+REASON_CAPITAL = "Sermaye yetersiz"
+REASON_RISK = "Risk bütçesi dolu"
+REASON_MAX_POSITIONS = "Pozisyon limiti"
+REASON_INVALID = "Geçersiz stop"
+
+
+def correlation_matrix(closes: pd.DataFrame, window: int = 60) -> pd.DataFrame:
+    """Son window barın günlük getiri korelasyonları (tarih x sembol kapanış matrisinden)"""
+    if closes is None or closes.empty:
+        return pd.DataFrame()
+    returns = closes.tail(window + 1).pct_change().iloc[1:]
+    return returns.corr(min_periods=max(10, window // 3))
+
+def allocate_portfolio(candidates: pd.DataFrame, capital: float,
+                       max_position_pct: float = 25.0, max_risk_pct: float = 2.0,
+                       max_total_risk_pct: float = 6.0, max_positions: int = 10,
+                       max_correlation: float = 0.8, min_position_pct: float = 2.0,
+                       correlations: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    candidates: index = sembol, sütunlar 'entry', 'stop', 'score'
+    Döndürür: candidates + 'shares', 'investment', 'risk_amount', 'reason'
+    Bütçeler sermayenin yüzdesi olarak: pozisyon başına sermaye (max_position_pct),
+    pozisyon başına risk (max_risk_pct), toplam açık risk (max_total_risk_pct).
+    Kalan bütçeyle min_position_pct altına düşen kırıntı pozisyonlar açılmaz.
+    """
+    result = candidates.copy()
+    n = len(result)
+    shares = np.zeros(n, dtype=np.int64)
+    reasons = np.full(n, REASON_ALLOCATED, dtype=object)
+    if n == 0 or capital <= 0:
+        return result.assign(shares=shares, investment=0.0, risk_amount=0.0, reason=reasons)
+
+    entry = result['entry'].to_numpy(dtype=float)
+    risk_per_share = entry - result['stop'].to_numpy(dtype=float)
+    score = result['score'].to_numpy(dtype=float)
+
+    position_cap = capital * max_position_pct / 100
+    min_investment = capital * min_position_pct / 100
+    risk_cap = capital * max_risk_pct / 100
+    cash_left = float(capital)
+    risk_left = capital * max_total_risk_pct / 100
+
+    corr = None
+    if correlations is not None and not correlations.empty:
+        corr = correlations.reindex(index=result.index, columns=result.index).to_numpy(dtype=float)
+    selected = np.zeros(n, dtype=bool)
+    count = 0
+
+    # Skor sırası; eşitlikte hisse başı riski düşük olan önce
+    for i in np.lexsort((risk_per_share, -score)):
+        if not (entry[i] > 0 and risk_per_share[i] > 0):
+            reasons[i] = REASON_INVALID
+            continue
+        if count >= max_positions:
+            reasons[i] = REASON_MAX_POSITIONS
+            continue
+        if corr is not None and count:
+            # Seçilmiş pozisyonlarla en yüksek korelasyon (veri yoksa yok sayılır)
+            peers = np.where(selected & ~np.isnan(corr[i]), corr[i], -1.0)
+            j = int(np.argmax(peers))
+            if peers[j] > max_correlation:
+                reasons[i] = f"{REASON_CORRELATION} ({result.index[j]} {peers[j]:.2f})"
+                continue
+
+        size = int(min(position_cap, cash_left) // entry[i])
+        size = min(size, int(min(risk_cap, risk_left) // risk_per_share[i]))
+        if size <= 0 or size * entry[i] < min_investment:
+            reasons[i] = REASON_CAPITAL if cash_left < max(entry[i], min_investment) or position_cap < entry[i] else REASON_RISK
+            continue
+
+        shares[i] = size
+        selected[i] = True
+        count += 1
+        cash_left -= size * entry[i]
+        risk_left -= size * risk_per_share[i]
+
+    return result.assign(
+        shares=shares,
+        investment=shares * entry,
+        risk_amount=shares * np.where(risk_per_share > 0, risk_per_share, 0.0),
+        reason=reasons
+    )
+
+def summarize_allocation(allocation: pd.DataFrame, capital: float) -> str:
+    """Log için kısa portföy özeti"""
+    if allocation.empty:
+        return "Aday yok"
+    chosen = allocation[allocation['shares'] > 0]
+    invested = chosen['investment'].sum()
+    risk = chosen['risk_amount'].sum()
+    if capital <= 0:
+        return f"{len(chosen)}/{len(allocation)} pozisyon"
+    return (f"{len(chosen)}/{len(allocation)} pozisyon, yatırım {invested:,.0f} TL "
+            f"(%{invested / capital * 100:.0f}), toplam risk {risk:,.0f} TL (%{risk / capital * 100:.1f})")
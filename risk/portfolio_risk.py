@@ -0,0 +1,175 @@
+# risk/portfolio_risk.py
+"""
+Korelasyon farkındalıklı portföy riski.
+
+Evrenin günlük getirilerinden kayan pencereli kovaryans matrisi tutulur. Yeni bar
+geldiğinde sadece o barın getirisi toplamlara eklenir, pencereden çıkan bar çıkarılır
+(pencere baştan hesaplanmaz). Eksik veriler çift bazında sayılır.
+Portföy volatilitesi, marjinal risk ve risk katkıları matris işlemleriyle hesaplanır.
+"""
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.types import PortfolioRisk
+
+TRADING_DAYS = 252
+
+
+class RollingCovariance:
+    """Evren için kayan pencereli, artımlı güncellenen getiri kovaryansı (pickle ile saklanabilir)"""
+    def __init__(self, window: int = 60, min_periods: int = 20):
+        self.window = window
+        self.min_periods = min_periods
+        self.symbols: List[str] = []
+        self.last_timestamp = None
+        self._rows: deque = deque()    # (zaman, getiriler, önceki zaman, önceki kapanışlar)
+        self._last_close: Optional[np.ndarray] = None
+        self._reset_sums(0)
+
+    def _reset_sums(self, n: int):
+        self._count = np.zeros((n, n))   # iki sembolün de verisi olan bar sayısı
+        self._sum = np.zeros((n, n))     # [i, j]: j'nin de verisi olan barlarda i getirisi toplamı
+        self._sum_sq = np.zeros((n, n))  # çarpımlar toplamı
+        self._sum_own_sq = np.zeros((n, n))  # [i, j]: j'nin de verisi olan barlarda i getirisinin karesi
+
+    def _add(self, returns: np.ndarray, sign: float = 1.0):
+        valid = ~np.isnan(returns)
+        values = np.where(valid, returns, 0.0)
+        mask = valid.astype(float)
+        self._count += sign * np.outer(mask, mask)
+        self._sum += sign * np.outer(values, mask)
+        self._sum_sq += sign * np.outer(values, values)
+        self._sum_own_sq += sign * np.outer(values * values, mask)
+
+    def rebuild(self, closes: pd.DataFrame):
+        """Kapanış matrisinin son window barından baştan kur"""
+        self.symbols = list(closes.columns)
+        self._rows.clear()
+        self._last_close = None
+        self.last_timestamp = None
+        self._reset_sums(len(self.symbols))
+        self._append_rows(closes.tail(self.window + 1))
+
+    def update(self, closes: pd.DataFrame) -> 'RollingCovariance':
+        """
+        closes: tarih x sembol kapanış matrisi. Sadece son işlenen bardan sonraki barlar eklenir;
+        son bar güncellenmişse (gün içi) o bar geri alınıp yeniden eklenir. Sembol seti değişirse baştan kurulur.
+        """
+        if closes is None or closes.empty:
+            return self
+        if list(closes.columns) != self.symbols or self.last_timestamp is None:
+            self.rebuild(closes)
+            return self
+
+        index = closes.index
+        position = index.searchsorted(self.last_timestamp)
+        if position >= len(index) or index[position] != self.last_timestamp:
+            self.rebuild(closes)
+            return self
+
+        latest = closes.iloc[position].to_numpy(dtype=float)
+        if not np.array_equal(latest, self._last_close, equal_nan=True):
+            self._pop_last()
+            position -= 1
+        self._append_rows(closes.iloc[position + 1:])
+        return self
+
+    def _append_rows(self, closes: pd.DataFrame):
+        values = closes.to_numpy(dtype=float)
+        for timestamp, row in zip(closes.index, values):
+            if self._last_close is not None:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    returns = row / self._last_close - 1
+                self._add(returns)
+                self._rows.append((timestamp, returns, self.last_timestamp, self._last_close))
+                if len(self._rows) > self.window:
+                    self._add(self._rows.popleft()[1], -1.0)
+            self._last_close = row
+            self.last_timestamp = timestamp
+
+    def _pop_last(self):
+        """Son barı geri al (gün içi güncellenen bar yeniden eklenecek)"""
+        if not self._rows:
+            self._last_close = None
+            self.last_timestamp = None
+            return
+        _, returns, self.last_timestamp, self._last_close = self._rows.pop()
+        self._add(returns, -1.0)
+
+    def covariance(self) -> pd.DataFrame:
+        """Günlük getiri kovaryansı - çift bazında ortak barlardan (yetersizse NaN)"""
+        count = self._count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (self._sum_sq - self._sum * self._sum.T / count) / (count - 1)
+        cov[count < self.min_periods] = np.nan
+        return pd.DataFrame(cov, index=self.symbols, columns=self.symbols)
+
+    def correlation(self) -> pd.DataFrame:
+        """Çift bazında korelasyon (varyanslar da sadece ortak barlardan)"""
+        count = self._count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cross = self._sum_sq - self._sum * self._sum.T / count
+            own = self._sum_own_sq - self._sum * self._sum / count
+            corr = cross / np.sqrt(own * own.T)
+        corr[count < self.min_periods] = np.nan
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+
+def portfolio_risk(covariance: pd.DataFrame, weights: Dict[str, float],
+                   max_contribution_pct: float = 35.0, max_pair_correlation: float = 0.8,
+                   min_effective_positions: float = 3.0) -> PortfolioRisk:
+    """
+    Aday set için portföy riski - covariance: günlük getiri kovaryansı, weights: sembol -> sermaye ağırlığı.
+    Eksik kovaryans değerleri 0 kabul edilir (uyarı eklenir).
+    """
+    symbols = [s for s, w in weights.items() if w and s in covariance.index]
+    missing = [s for s, w in weights.items() if w and s not in covariance.index]
+    warnings = [f"Kovaryans verisi yok: {', '.join(missing)}"] if missing else []
+    if not symbols:
+        return PortfolioRisk(0.0, warnings=warnings)
+
+    w = np.array([weights[s] for s in symbols], dtype=float)
+    sigma = covariance.loc[symbols, symbols].to_numpy(dtype=float)
+    if np.isnan(sigma).any():
+        warnings.append("Eksik kovaryans değerleri 0 kabul edildi")
+        sigma = np.nan_to_num(sigma)
+
+    sigma_w = sigma @ w
+    variance = float(w @ sigma_w)
+    volatility = np.sqrt(max(variance, 0.0))
+    annual = np.sqrt(TRADING_DAYS) * 100
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        marginal = sigma_w / volatility if volatility > 0 else np.zeros_like(w)
+        contribution = w * marginal / volatility * 100 if volatility > 0 else np.zeros_like(w)
+        stand_alone = np.sqrt(np.clip(np.diag(sigma), 0, None)) @ np.abs(w)
+        diversification = stand_alone / volatility if volatility > 0 else 1.0
+        effective = 1.0 / np.sum((contribution / 100) ** 2) if volatility > 0 else float(len(symbols))
+
+    # Uyarılar - yoğunlaşma, yüksek korelasyonlu çiftler, düşük efektif pozisyon sayısı
+    # Eşit dağılımdaki pay (100 / n) eşiği aşıyorsa yoğunlaşma sayılmaz (ör. tek pozisyon riskin %100'ü)
+    concentration_limit = max(max_contribution_pct, 100 / len(symbols))
+    for symbol, pct in zip(symbols, contribution):
+        if pct > concentration_limit + 1e-9:
+            warnings.append(f"{symbol} riskin %{pct:.0f}'ini taşıyor")
+    std = np.sqrt(np.clip(np.diag(sigma), 0, None))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = sigma / np.outer(std, std)
+    rows, cols = np.nonzero(np.triu(np.nan_to_num(corr) > max_pair_correlation, k=1))
+    for i, j in zip(rows, cols):
+        warnings.append(f"{symbols[i]}-{symbols[j]} korelasyonu {corr[i, j]:.2f}")
+    if len(symbols) > 1 and effective < min_effective_positions:
+        warnings.append(f"Efektif pozisyon sayısı düşük: {effective:.1f}")
+
+    return PortfolioRisk(
+        volatility_pct=round(float(volatility * annual), 2),
+        weights={s: round(float(x), 4) for s, x in zip(symbols, w)},
+        marginal_risk={s: round(float(x * annual), 2) for s, x in zip(symbols, marginal)},
+        risk_contribution_pct={s: round(float(x), 1) for s, x in zip(symbols, contribution)},
+        diversification_ratio=round(float(diversification), 2),
+        effective_positions=round(float(effective), 2),
+        warnings=warnings
+    )
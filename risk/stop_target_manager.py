@@ -1,5 +1,6 @@
 # risk/stop_target_manager.py
 import numpy as np
+import pandas as pd
 from typing import Tuple, Optional
 
 def _calculate_stops_targets(df: 'pd.DataFrame', symbol: str, config: dict) -> Tuple[Optional[float], Optional[float], Optional[float]]:
@@ -36,4 +37,83 @@ def _calculate_stops_targets(df: 'pd.DataFrame', symbol: str, config: dict) -> T
         target1 = min(df['BB_Upper'].iloc[-1], target1 * 1.2)
         target2 = target1 * 1.3
 
-    return float(stop_loss), float(target1), float(target2)
\ No newline at end of file
+    return float(stop_loss), float(target1), float(target2)
+
+def _forward_window(values: np.ndarray, horizon: int) -> np.ndarray:
+    """[t, k] = values[t + 1 + k] (veri dışı NaN) - N x horizon"""
+    padded = np.concatenate([values[1:], np.full(horizon, np.nan)])
+    return np.lib.stride_tricks.sliding_window_view(padded, horizon)[:len(values)]
+
+def stop_target_grid(df: 'pd.DataFrame', atr_multipliers=(1.0, 1.5, 2.0, 2.5), swing_lookbacks=(0, 10, 20),
+                     rr_levels=(1.5, 2.0, 3.0), horizon: int = 20, entry_mask=None) -> 'pd.DataFrame':
+    """
+    Stop/hedef ayarları için what-if ızgarası - her kombinasyon tüm giriş barlarında tek seferde değerlendirilir.
+    Stop: max(close - ATR * çarpan, lookback barın dibi * 0.98) (lookback 0 ise sadece ATR), hedef: giriş + risk * R:R.
+    Her giriş için sonraki horizon barın ileriye dönük kümülatif max/min'i ile ilk stop ve ilk hedef barı bulunur;
+    aynı barda ikisi birden olursa stop önce sayılır, hiçbiri olmazsa horizon sonundaki kapanıştan çıkılır.
+    entry_mask: değerlendirilecek giriş barları (ör. backtest sinyalleri / belirli rejim); None ise tüm barlar.
+    """
+    columns = ['atr_multiplier', 'swing_lookback', 'rr', 'trades', 'hit_rate', 'stop_rate',
+               'avg_r', 'avg_bars_to_target', 'avg_risk_pct']
+    n = len(df)
+    if n <= horizon + 1:
+        return pd.DataFrame(columns=columns)
+
+    high, low, close = (df[column].to_numpy(dtype=float) for column in ('high', 'low', 'close'))
+    atr = df['ATR14'].to_numpy(dtype=float) if 'ATR14' in df.columns else (high - low) * 0.1
+    atr_ready = atr > 0  # ATR ısınma barları (0 / NaN) giriş sayılmaz
+    atr = np.fmax(atr, 0.01)
+
+    # Giriş barları: ATR'si hazır ve tam horizon ileriye bakılabilenler
+    valid = atr_ready & (np.arange(n) < n - horizon)
+    if entry_mask is not None:
+        valid &= np.asarray(entry_mask, dtype=bool)
+    entries = np.flatnonzero(valid)
+    if len(entries) == 0:
+        return pd.DataFrame(columns=columns)
+
+    entry = close[entries]
+    future_high = np.fmax.accumulate(_forward_window(high, horizon)[entries], axis=1)
+    future_low = np.fmin.accumulate(_forward_window(low, horizon)[entries], axis=1)
+    exit_close = close[entries + horizon]
+
+    # Stop ızgarası: (ATR çarpanı, lookback) -> E x S
+    combos = [(m, lb) for m in atr_multipliers for lb in swing_lookbacks]
+    swing_lows = {lb: pd.Series(low).rolling(lb, min_periods=1).min().to_numpy()[entries] * 0.98
+                  for lb in swing_lookbacks if lb}
+    stops = np.empty((len(entries), len(combos)))
+    for s, (multiplier, lookback) in enumerate(combos):
+        stop = close[entries] - atr[entries] * multiplier
+        stops[:, s] = np.maximum(stop, swing_lows[lookback]) if lookback else stop
+    risk = entry[:, None] - stops                                        # E x S
+    rr = np.asarray(rr_levels, dtype=float)
+    targets = entry[:, None, None] + risk[:, :, None] * rr[None, None, :]  # E x S x R
+
+    # İlk stop / hedef barı = eşiği geçmeyen kümülatif bar sayısı (horizon: olmadı)
+    stop_bar = (future_low[:, :, None] > stops[:, None, :]).sum(axis=1)                     # E x S
+    target_bar = (future_high[:, :, None, None] < targets[:, None, :, :]).sum(axis=1)       # E x S x R
+    stop_bar = stop_bar[:, :, None]
+
+    valid_risk = (risk > 0)[:, :, None]
+    win = valid_risk & (target_bar < stop_bar)
+    loss = valid_risk & (stop_bar <= target_bar) & (stop_bar < horizon)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        open_r = (exit_close[:, None] - entry[:, None]) / risk                               # E x S
+    r_multiple = np.where(win, rr[None, None, :], np.where(loss, -1.0, open_r[:, :, None]))
+    r_multiple = np.where(valid_risk, r_multiple, 0.0)
+
+    trades = valid_risk.sum(axis=0).repeat(len(rr), axis=1)                                 # S x R
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = win.sum(axis=0) / trades * 100
+        stop_rate = loss.sum(axis=0) / trades * 100
+        avg_r = r_multiple.sum(axis=0) / trades
+        bars_to_target = np.where(win, target_bar + 1, 0).sum(axis=0) / win.sum(axis=0)
+        avg_risk_pct = np.where(risk > 0, risk / entry[:, None] * 100, 0.0).sum(axis=0) / (risk > 0).sum(axis=0)
+
+    rows = []
+    for s, (multiplier, lookback) in enumerate(combos):
+        for r, level in enumerate(rr):
+            rows.append((multiplier, lookback, level, int(trades[s, r]), hit_rate[s, r], stop_rate[s, r],
+                         avg_r[s, r], bars_to_target[s, r], avg_risk_pct[s]))
+    return pd.DataFrame(rows, columns=columns).round(
+        {'hit_rate': 1, 'stop_rate': 1, 'avg_r': 3, 'avg_bars_to_target': 1, 'avg_risk_pct': 2})
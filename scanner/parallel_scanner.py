@@ -1,28 +1,80 @@
 # parallel_scanner.py
 import concurrent.futures
+import os
 import threading
 import time
 from typing import List, Dict, Optional
 import logging
+from tvDatafeed import Interval
+from scanner.stage_stats import StageTrace
+from scanner.process_scanner import frame_to_payload, init_worker, analyze_payload
+from core.types import ScanResult
+from core.deadline import DeadlineExceeded, ScanCancelled
+from scanner.result_stream import TopKResults
 
 logger = logging.getLogger(__name__)
 
+STOP_POLL_SECONDS = 0.2
+
 class ParallelScanner:
     """Paralel hisse tarayıcı - GÜNCELLENMİŞ"""
     def __init__(self, hunter, max_workers=4):
         self.hunter = hunter
         self.max_workers = max_workers
-        self.results_lock = threading.Lock()
         self.progress_lock = threading.Lock()
         self.scan_results = []
+        self.top_results = TopKResults()
         self.processed_count = 0
         self.total_count = 0
         self.progress_callback = None
+        self.result_callback = None
+
+    def _wait(self, *pending_maps: Dict) -> set:
+        """
+        Tamamlanan future'lar (future -> sembol sözlüklerinden). Tarama durdurulduysa henüz başlamamış
+        olanlar iptal edilip sözlükten çıkarılır; çalışanlar iptal olayını görüp kısa sürede biter.
+        """
+        futures = set().union(*pending_maps)
+        done, _ = concurrent.futures.wait(futures, timeout=STOP_POLL_SECONDS,
+                                          return_when=concurrent.futures.FIRST_COMPLETED)
+        if self.hunter.stop_scan:
+            for pending in pending_maps:
+                for future in [f for f in pending if f not in done and f.cancel()]:
+                    del pending[future]
+        return done
+
+    def _report(self, label: str, elapsed_time: float):
+        timed_out = len(self.hunter.timed_out_symbols)
+        logger.info(f"✅ {label} tamamlandı: {self.top_results.seen} sonuç "
+                    f"(ilk {len(self.scan_results)} tutuldu), {timed_out} zaman aşımı, {elapsed_time:.1f} saniye")
+
+    def _start(self, symbols: List[str], progress_callback, result_callback):
+        """Tarama durumunu sıfırla - sonuçlar sadece en iyi scan_top_k kadar tutulur"""
+        self.scan_results = []
+        self.top_results = TopKResults(self.hunter.cfg.get('scan_top_k', 200))
+        self.processed_count = 0
+        self.total_count = len(symbols)
+        self.progress_callback = progress_callback
+        self.result_callback = result_callback
 
-    def process_symbol_safe(self, symbol: str) -> Optional[Dict]:
+    def _publish(self, result: ScanResult):
+        """Sonucu hazır olur olmaz yayınla ve top-K listesine ekle"""
+        self.top_results.push(result)
+        if self.result_callback:
+            try:
+                self.result_callback(result)
+            except Exception as e:
+                logger.error(f"Sonuç callback hatası: {e}")
+
+    def _finish(self) -> Dict:
+        self.scan_results = self.top_results.items()
+        return {"Swing Uygun": self.scan_results}
+
+    def process_symbol_safe(self, symbol: str) -> Optional[ScanResult]:
         """Güvenli sembol işleme - GÜNCELLENMİŞ: process_symbol_advanced çağrılıyor"""
         try:
-            result = self.hunter.process_symbol_advanced(symbol)  # ✅ DOĞRU METOD
+            # Süre görev başladığında başlar (kuyrukta beklenen süre sayılmaz)
+            result = self.hunter.process_symbol_advanced(symbol, self.hunter.symbol_deadline())  # ✅ DOĞRU METOD
             with self.progress_lock:
                 self.processed_count += 1
                 progress_pct = int((self.processed_count / self.total_count) * 100)
@@ -33,38 +85,111 @@ class ParallelScanner:
             logger.error(f"Paralel tarama hatası - {symbol}: {e}")
             return None
 
-    def scan_parallel(self, symbols: List[str], progress_callback=None) -> Dict:
-        """Paralel tarama"""
-        self.scan_results = []
-        self.processed_count = 0
-        self.total_count = len(symbols)
-        self.progress_callback = progress_callback
+    def scan_parallel(self, symbols: List[str], progress_callback=None, result_callback=None) -> Dict:
+        """Paralel tarama - result_callback her uygun sonuç için hazır olduğu anda çağrılır"""
+        if self.hunter.cfg.get('scan_mode', 'thread') == 'process':
+            return self.scan_process_pool(symbols, progress_callback, result_callback)
+        self._start(symbols, progress_callback, result_callback)
 
         start_time = time.time()
         logger.info(f"🚀 Paralel tarama başlıyor: {len(symbols)} sembol, {self.max_workers} thread")
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_symbol = {
+            pending = {
                 executor.submit(self.process_symbol_safe, symbol): symbol 
                 for symbol in symbols
             }
-            for future in concurrent.futures.as_completed(future_to_symbol):
-                symbol = future_to_symbol[future]
-                try:
-                    result = future.result(timeout=30)
-                    if result:
-                        with self.results_lock:
-                            self.scan_results.append(result)
-                except concurrent.futures.TimeoutError:
-                    logger.warning(f"⏱️ Timeout: {symbol}")
-                except Exception as e:
-                    logger.error(f"❌ Hata - {symbol}: {e}")
+            # Süre sınırı worker içinde (veri çekme + denemeler) uygulanır; burada tamamlananlar toplanır
+            while pending:
+                for future in self._wait(pending):
+                    symbol = pending.pop(future)
+                    try:
+                        result = future.result()
+                        if result:
+                            self._publish(result)
+                    except Exception as e:
+                        logger.error(f"❌ Hata - {symbol}: {e}")
+
+        elapsed_time = time.time() - start_time
+        output = self._finish()
+        self._report("Paralel tarama", elapsed_time)
+        return output
+
+    def _fetch_payload(self, symbol: str):
+        """I/O thread'i: günlük veriyi süre sınırı içinde çek ve worker'a gidecek kompakt diziye çevir"""
+        if self.hunter.stop_scan:
+            return None
+        trace = StageTrace()
+        cfg = self.hunter.cfg
+        try:
+            df = trace.run('fetch', self.hunter.safe_api_call, symbol, cfg['exchange'], Interval.in_daily,
+                           cfg['lookback_bars'], deadline=self.hunter.symbol_deadline())
+        except DeadlineExceeded:
+            self.hunter.record_timeout(symbol)
+            return None
+        except ScanCancelled:
+            return None
+        finally:
+            self.hunter.stage_stats.merge(trace)
+        if df is None or len(df) < 50:
+            return None
+        return frame_to_payload(symbol, df)
+
+    def scan_process_pool(self, symbols: List[str], progress_callback=None, result_callback=None) -> Dict:
+        """
+        Process havuzu modu - veri I/O thread'lerinde çekilir, analiz CPU çekirdekleri kadar
+        worker process'te yapılır. Çekilen her sembol hemen analize gönderilir (iki aşama örtüşür).
+        """
+        hunter = self.hunter
+        cfg = hunter.cfg
+        self._start(symbols, progress_callback, result_callback)
+        fetch_workers = cfg.get('fetch_workers', self.max_workers)
+        process_workers = cfg.get('process_workers') or os.cpu_count() or 1
+
+        start_time = time.time()
+        logger.info(f"🚀 Process havuzu taraması: {len(symbols)} sembol, {fetch_workers} I/O thread, {process_workers} process")
+
+        def completed(symbol):
+            self.processed_count += 1
+            if self.progress_callback:
+                progress_pct = int((self.processed_count / self.total_count) * 100)
+                self.progress_callback(progress_pct, f"{self.processed_count}/{self.total_count} - {symbol} tarandı")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=fetch_workers) as fetchers, \
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=process_workers, initializer=init_worker,
+                    initargs=(dict(cfg), hunter.current_market(), hunter.relative_strength,
+                              dict(hunter.sector_markets))) as pool:
+            fetching = {fetchers.submit(self._fetch_payload, symbol): symbol for symbol in symbols}
+            analyzing = {}
+            while fetching or analyzing:
+                for future in self._wait(fetching, analyzing):
+                    if future in fetching:
+                        # Veri çekildi - hemen analize gönder
+                        symbol = fetching.pop(future)
+                        try:
+                            payload = future.result()
+                        except Exception as e:
+                            logger.error(f"❌ Veri hatası - {symbol}: {e}")
+                            payload = None
+                        if payload is not None and not hunter.stop_scan:
+                            analyzing[pool.submit(analyze_payload, payload)] = symbol
+                        else:
+                            completed(symbol)
+                        continue
+
+                    symbol = analyzing.pop(future)
+                    try:
+                        _, result, trace, evaluations, records = future.result()
+                        hunter.stage_stats.merge(trace)
+                        hunter.rejection_telemetry.absorb(evaluations, records)
+                        if result:
+                            self._publish(result)
+                    except Exception as e:
+                        logger.error(f"❌ Hata - {symbol}: {e}")
+                    completed(symbol)
 
         elapsed_time = time.time() - start_time
-        if self.scan_results:
-            self.scan_results.sort(
-                key=lambda x: int(x.get('Skor', '0/100').split('/')[0]),
-                reverse=True
-            )
-        logger.info(f"✅ Paralel tarama tamamlandı: {len(self.scan_results)} sonuç, {elapsed_time:.1f} saniye")
-        return {"Swing Uygun": self.scan_results}
\ No newline at end of file
+        output = self._finish()
+        self._report("Process havuzu taraması", elapsed_time)
+        return output
\ No newline at end of file
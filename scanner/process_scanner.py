@@ -0,0 +1,58 @@
+# scanner/process_scanner.py
+"""
+Process havuzu tarama modu yardımcıları.
+
+Veri çekme ana process'teki I/O thread'lerinde yapılır; GIL'e bağlı analiz
+(indikatörler, pattern, S/R, skorlama) ProcessPoolExecutor worker'larında çalışır.
+Worker'lara DataFrame yerine kompakt numpy dizileri gönderilir.
+"""
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.types import ScanResult
+from scanner.stage_stats import StageTrace
+
+PAYLOAD_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+_worker_hunter = None
+
+
+def frame_to_payload(symbol: str, df: pd.DataFrame) -> Tuple:
+    """DataFrame -> (sembol, tarih dizisi, saat dilimi, sütunlar, float64 değer matrisi)"""
+    columns = tuple(c for c in PAYLOAD_COLUMNS if c in df.columns)
+    index = df.index
+    tz = getattr(index, 'tz', None)
+    if tz is not None:
+        index = index.tz_convert(None)
+    dates = index.to_numpy() if isinstance(index, pd.DatetimeIndex) else np.asarray(index)
+    values = np.ascontiguousarray(df[list(columns)].to_numpy(dtype=float))
+    return symbol, dates, str(tz) if tz is not None else None, columns, values
+
+def payload_to_frame(payload: Tuple) -> pd.DataFrame:
+    """frame_to_payload'un tersi"""
+    _, dates, tz, columns, values = payload
+    index = pd.DatetimeIndex(dates) if np.issubdtype(np.asarray(dates).dtype, np.datetime64) else pd.Index(dates)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return pd.DataFrame(values, index=index, columns=list(columns))
+
+def init_worker(cfg, market, relative_strength, sector_markets=None):
+    """Worker process başlangıcı - analiz bileşenleri process başına bir kez kurulur"""
+    global _worker_hunter
+    from scanner.swing_hunter import SwingHunterUltimate
+    _worker_hunter = SwingHunterUltimate.analysis_worker(cfg, market, relative_strength, sector_markets)
+
+def analyze_payload(payload: Tuple) -> Tuple[str, Optional[ScanResult], StageTrace, dict, list]:
+    """Worker'da sembol analizi - sonuç, aşama izi ve red telemetrisi ana process'e döner"""
+    symbol = payload[0]
+    trace = StageTrace()
+    try:
+        result = _worker_hunter.analyze_symbol(symbol, payload_to_frame(payload), _worker_hunter.market_analysis, trace)
+    except Exception as e:
+        logging.error(f"❌ {symbol} hatası: {e}")
+        result = None
+    evaluations, records = _worker_hunter.rejection_telemetry.drain()
+    return symbol, result, trace, evaluations, records
@@ -0,0 +1,159 @@
+# scanner/rescan_service.py
+"""
+Sürekli gün içi yeniden tarama.
+
+Her turda izlenen semboller eşzamanlı ve süre sınırlı çekilir; son barı (zaman, kapanış, hacim)
+değişmeyen semboller yeniden analiz edilmez. Güncel sonuç seti bellekte tutulur, listeye giren /
+çıkan / değişen adaylar WatchlistChange olarak yayımlanır. Bir turun analiz maliyeti değişen sembol
+sayısı kadardır. Piyasa snapshot'ı değişirse tüm semboller kirli sayılır.
+"""
+import concurrent.futures
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from tvDatafeed import Interval
+
+from core.deadline import Deadline, DeadlineExceeded, ScanCancelled
+from core.types import ScanResult, WatchlistChange
+from scanner.stage_stats import StageTrace
+
+
+def bar_key(df) -> Optional[tuple]:
+    """Son barın kimliği - değişmişse sembol yeniden analiz edilir"""
+    if df is None or df.empty:
+        return None
+    last = df.iloc[-1]
+    return df.index[-1], float(last['close']), float(last.get('volume', 0.0))
+
+
+class RescanService:
+    """İzleme listesini canlı tutan, sadece değişen sembolleri yeniden değerlendiren tarayıcı"""
+    def __init__(self, hunter, symbols: Iterable[str], interval_minutes: float = 5,
+                 on_change: Optional[Callable[[WatchlistChange], None]] = None,
+                 max_workers: int = 8):
+        self.hunter = hunter
+        self.symbols: List[str] = list(dict.fromkeys(symbols))
+        self.interval_seconds = interval_minutes * 60
+        self.on_change = on_change
+        self.max_workers = max_workers
+
+        self._bar_keys: Dict[str, tuple] = {}
+        self._results: Dict[str, ScanResult] = {}
+        self._market = None
+        self._poll_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def cancel_event(self) -> threading.Event:
+        """stop() ile tetiklenen olay - servis adına yapılan çekimler bununla iptal edilir"""
+        return self._stop_event
+
+    def watch(self, symbols: Iterable[str]):
+        """İzlenen sembolleri değiştir - yeniler sonraki turda değerlendirilir, çıkarılanlar listeden düşer"""
+        with self._poll_lock:
+            self.symbols = list(dict.fromkeys(symbols))
+            watched = set(self.symbols)
+            for symbol in [s for s in self._bar_keys if s not in watched]:
+                del self._bar_keys[symbol]
+            left = [s for s in self._results if s not in watched]
+            for symbol in left:
+                del self._results[symbol]
+        if left:
+            self._publish(WatchlistChange(left=left))
+
+    def results(self) -> List[ScanResult]:
+        """Güncel adaylar - skora göre azalan"""
+        return sorted(self._results.values(), key=lambda r: r.score, reverse=True)
+
+    def poll(self) -> WatchlistChange:
+        """Tek tur: çek, değişenleri analiz et, farkı yayımla"""
+        with self._poll_lock:
+            market = self.hunter.analyze_market_condition()
+            context = (market, dict(self.hunter.sector_markets))
+            force = context != self._market
+            self._market = context
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                checks = list(executor.map(lambda s: self._check(s, market, force), self.symbols))
+
+            change = WatchlistChange(checked=len(checks))
+            for symbol, key, evaluated, result, timed_out in checks:
+                if timed_out:
+                    change.timed_out.append(symbol)
+                if not evaluated:
+                    continue
+                change.evaluated += 1
+                self._bar_keys[symbol] = key
+                previous = self._results.get(symbol)
+                if result is None:
+                    if previous is not None:
+                        del self._results[symbol]
+                        change.left.append(symbol)
+                    continue
+                self._results[symbol] = result
+                if previous is None:
+                    change.entered.append(result)
+                elif result != previous:
+                    change.updated.append(result)
+
+        logging.info(f"🔁 Yeniden tarama: {change.evaluated}/{change.checked} sembol analiz edildi, "
+                     f"+{len(change.entered)} -{len(change.left)} ~{len(change.updated)}, "
+                     f"{len(self._results)} aday"
+                     + (f", {len(change.timed_out)} zaman aşımı" if change.timed_out else ""))
+        if change.changed:
+            self._publish(change)
+        return change
+
+    def _check(self, symbol: str, market, force: bool):
+        """(sembol, bar anahtarı, analiz edildi mi, sonuç, zaman aşımı) - veri alınamazsa önceki sonuç korunur"""
+        hunter = self.hunter
+        cfg = hunter.cfg
+        trace = StageTrace()
+        deadline = Deadline(cfg.get('symbol_timeout_seconds', 30), cancel_event=self._stop_event)
+        try:
+            df = trace.run('fetch', hunter.safe_api_call, symbol, cfg['exchange'], Interval.in_daily,
+                           cfg['lookback_bars'], use_cache=False, deadline=deadline)
+            key = bar_key(df)
+            if key is None or (not force and key == self._bar_keys.get(symbol)):
+                return symbol, key, False, None, False
+            return symbol, key, True, hunter.analyze_symbol(symbol, df, market, trace), False
+        except DeadlineExceeded:
+            hunter.record_timeout(symbol, report=False)  # tarama raporuna değil, turun listesine
+            return symbol, None, False, None, True
+        except ScanCancelled:
+            pass
+        except Exception as e:
+            logging.error(f"❌ {symbol} yeniden tarama hatası: {e}")
+        finally:
+            hunter.stage_stats.merge(trace)
+        return symbol, None, False, None, False
+
+    def _publish(self, change: WatchlistChange):
+        if self.on_change:
+            try:
+                self.on_change(change)
+            except Exception as e:
+                logging.error(f"Değişiklik callback hatası: {e}")
+
+    def start(self):
+        """Arka planda periyodik tarama (daemon thread) - ilk tur hemen çalışır"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def loop():
+            while not self._stop_event.is_set():
+                try:
+                    self.poll()
+                except Exception as e:
+                    logging.error(f"Yeniden tarama hatası: {e}")
+                if self._stop_event.wait(self.interval_seconds):
+                    break
+
+        self._thread = threading.Thread(target=loop, name='rescan-service', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
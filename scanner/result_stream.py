@@ -0,0 +1,50 @@
+# scanner/result_stream.py
+import heapq
+import itertools
+import threading
+from typing import List
+
+import pandas as pd
+
+from core.types import ScanResult
+
+
+def results_frame(results: List[ScanResult]) -> pd.DataFrame:
+    """Sonuç listesi -> sayısal sütunlu DataFrame (dışa aktarma / kayıt)"""
+    return pd.DataFrame([r.to_record() for r in results])
+
+
+class TopKResults:
+    """
+    Skora göre sınırlı en iyi K sonuç - thread-safe min-heap.
+    Sonuçlar geldikçe eklenir; K'nın dışında kalanlar tutulmaz (büyük evrenlerde bellek sabit).
+    Eşit skorlarda ilk gelen önde kalır.
+    """
+    def __init__(self, k: int = 200):
+        self.k = max(1, k)
+        self.lock = threading.Lock()
+        self._heap: List[tuple] = []  # (skor, -sıra, sonuç) - en zayıf en üstte
+        self._counter = itertools.count()
+        self.seen = 0
+
+    def push(self, result: ScanResult) -> bool:
+        """Sonucu ekle - listede kaldıysa True"""
+        entry = (result.score, -next(self._counter), result)
+        with self.lock:
+            self.seen += 1
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+                return True
+            if entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+                return True
+            return False
+
+    def items(self) -> List[ScanResult]:
+        """Skora göre azalan sırada sonuçlar"""
+        with self.lock:
+            entries = list(self._heap)
+        return [result for _, _, result in sorted(entries, key=lambda e: e[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
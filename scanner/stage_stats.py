@@ -0,0 +1,85 @@
+# scanner/stage_stats.py
+import threading
+import time
+from typing import Dict, List
+
+
+class StageTrace:
+    """Tek sembol taramasının aşama kayıtları - thread'e özel, kilit gerektirmez"""
+    def __init__(self):
+        self.records: List[tuple] = []
+
+    def run(self, stage: str, func, *args, **kwargs):
+        """Aşamayı çalıştır ve süresini kaydet (reddetme bilgisi sonradan işaretlenir)"""
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.records.append([stage, time.perf_counter() - start, False])
+
+    def reject(self, stage: str):
+        """Son kaydedilen aşamayı red olarak işaretle"""
+        for record in reversed(self.records):
+            if record[0] == stage:
+                record[2] = True
+                return
+
+
+class StageStats:
+    """Aşama bazlı maliyet ve red oranı istatistikleri - thread-safe"""
+    def __init__(self, min_samples: int = 20):
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+        self._stats: Dict[str, List[float]] = {}  # stage -> [çağrı, red, toplam süre]
+
+    def merge(self, trace: StageTrace):
+        """Sembol izini genel istatistiklere ekle"""
+        with self.lock:
+            for stage, elapsed, rejected in trace.records:
+                stat = self._stats.setdefault(stage, [0, 0, 0.0])
+                stat[0] += 1
+                stat[1] += int(rejected)
+                stat[2] += elapsed
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Aşama istatistiklerinin kopyası"""
+        with self.lock:
+            items = [(stage, list(stat)) for stage, stat in self._stats.items()]
+        return {
+            stage: {
+                'calls': int(calls),
+                'rejections': int(rejections),
+                'reject_rate': rejections / calls if calls else 0.0,
+                'avg_ms': total / calls * 1000 if calls else 0.0
+            }
+            for stage, (calls, rejections, total) in items
+        }
+
+    def order_gates(self, gates: List[str]) -> List[str]:
+        """
+        Kapıları maliyet / red oranına göre sırala (ucuz ve seçici olan önce).
+        Yeterli örnek yoksa verilen sıra korunur.
+        """
+        stats = self.snapshot()
+        if any(stats.get(g, {}).get('calls', 0) < self.min_samples for g in gates):
+            return list(gates)
+
+        def rank(gate):
+            stat = stats[gate]
+            return stat['avg_ms'] / max(stat['reject_rate'], 1e-6)
+
+        return sorted(gates, key=rank)
+
+    def format_summary(self) -> str:
+        stats = self.snapshot()
+        if not stats:
+            return "Aşama istatistiği yok"
+        parts = [
+            f"{stage}: {s['avg_ms']:.2f} ms, red %{s['reject_rate'] * 100:.0f} ({s['calls']})"
+            for stage, s in sorted(stats.items(), key=lambda x: -x[1]['avg_ms'])
+        ]
+        return " | ".join(parts)
+
+    def reset(self):
+        with self.lock:
+            self._stats.clear()
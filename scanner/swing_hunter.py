@@ -1,153 +1,168 @@
 # scanner/swing_hunter.py - TAM DÜZELTİLMİŞ VERSİYON
 import logging
+import threading
 import time
 import random
-from typing import Dict, List, Optional
+import concurrent.futures
+import pandas as pd
+from typing import Dict, List, Mapping, Optional
 from tvDatafeed import TvDatafeed, Interval
 
 # Core
-from core.types import MarketAnalysis, MultiTimeframeAnalysis, ConsolidationPattern
-from core.utils import load_config, setup_logging
+from core.types import MarketAnalysis, MultiTimeframeAnalysis, ScanResult
+from core.utils import load_config, setup_logging, freeze_config
+from core.deadline import Deadline, DeadlineExceeded, ScanCancelled
 
 # Modüller
 from indicators.ta_manager import calculate_indicators
-from filters.basic_filters import basic_filters
+from filters.basic_filters import basic_filters, screen_universe
 from risk.stop_target_manager import _calculate_stops_targets
 from risk.trade_validator import validate_trade_parameters, calculate_trade_plan
+from risk.portfolio_allocator import allocate_portfolio, correlation_matrix, summarize_allocation
+from risk.portfolio_risk import RollingCovariance, portfolio_risk
 from analysis.trend_score import calculate_advanced_trend_score
-from analysis.multi_timeframe import analyze_multi_timeframe_from_data
-from analysis.fibonacci import calculate_fibonacci_levels
+from analysis.multi_timeframe import analyze_multi_timeframe_from_data, analyze_multi_timeframe_from_frame
+from analysis.fibonacci import calculate_fibonacci_levels, find_fibonacci_entry_zone
 from analysis.consolidation import detect_consolidation_pattern
 from analysis.support_resistance import SupportResistanceFinder
-from analysis.market_condition import analyze_market_condition, _empty_market_analysis
+from analysis.sr_tracker import SupportResistanceTracker
+from analysis.market_condition import _empty_market_analysis
+from analysis.market_context import MarketContextService, DEFAULT_SECTOR_INDICES, sector_map
+from analysis.relative_strength import rank_relative_strength, close_matrix, RS_HORIZONS, RS_WEIGHTS
 from patterns.price_action import PriceActionDetector
 from smart_filter.smart_filter import SmartFilterSystem
 from backtest.backtester import RealisticBacktester
 from scanner.parallel_scanner import ParallelScanner
+from scanner.result_stream import TopKResults, results_frame
+from scanner.rescan_service import RescanService
+from scanner.stage_stats import StageStats, StageTrace
 from cache.data_cache import DataCache, ErrorHandler
+from core.universe import build_universe_frame
+from core.telemetry import RejectionTelemetry
 
 
 class SwingHunterUltimate:
     def __init__(self, config_path='swing_config.json'):
-        self.cfg = load_config(config_path)
+        # Değiştirilemez config - analizörler thread'ler arasında kilitsiz paylaşılır
+        self.cfg = freeze_config(load_config(config_path))
         setup_logging(self.cfg.get("log_file", "swing_hunter_ultimate.log"))
         self.tv = TvDatafeed()
         self.error_handler = ErrorHandler()
-        self.data_cache = DataCache(
-            cache_dir=self.cfg.get('cache_dir', 'data_cache'),
-            ttl_hours=self.cfg.get('cache_ttl_hours', 1)
-        )
-        self.pattern_detector = PriceActionDetector()
-        self.sr_finder = SupportResistanceFinder()
-        self.smart_filter = SmartFilterSystem(self.cfg)
+        self._init_analyzers()
         self.backtester = RealisticBacktester(self.cfg)
         self.parallel_scanner = ParallelScanner(self, max_workers=self.cfg.get('max_workers', 4))
         self.market_analysis = None
-        import threading
+        self.sector_markets: Mapping[str, MarketAnalysis] = {}
+        self.market_context = MarketContextService(
+            fetch=lambda symbol, exchange, interval, n_bars: self.safe_api_call(symbol, exchange, interval, n_bars, use_cache=False),
+            sectors=self.cfg.get('market_sector_indices', list(DEFAULT_SECTOR_INDICES)),
+            exchange=self.cfg['exchange'],
+            refresh_minutes=self.cfg.get('market_refresh_minutes', 15),
+            max_workers=self.cfg.get('max_workers', 4)
+        )
+        self.relative_strength = None  # Tarama başına RS tablosu (index = sembol)
+        self.risk_model = self.data_cache.get_state('_universe', 'covariance') \
+            or RollingCovariance(window=self.cfg.get('correlation_window', 60))
+        self.portfolio_risk = None
         self._stop_event = threading.Event()
         
         # ✅ KRİTİK DÜZELTME: stop_scan attribute'u ekle
         self.stop_scan = False
+        self.scan_deadline = Deadline(cancel_event=self._stop_event)  # tarama geneli süre + iptal
+        self.timed_out_symbols: List[str] = []
+        self.rescan_service: Optional[RescanService] = None
         
         logging.info("🚀 SwingHunterUltimate başlatıldı (modüler sürüm)")
 
-    def safe_api_call(self, symbol, exchange, interval, n_bars):
-        """Interval artık tvDatafeed.Interval enum olmalı!"""
+    def _init_analyzers(self):
+        """Sembol analizinde kullanılan bileşenler (ana process ve process havuzu worker'ları ortak)"""
+        self.data_cache = DataCache(
+            cache_dir=self.cfg.get('cache_dir', 'data_cache'),
+            ttl_hours=self.cfg.get('cache_ttl_hours', 1)
+        )
+        self.pattern_detector = PriceActionDetector()
+        self.sr_finder = SupportResistanceFinder()
+        self.sr_trackers: Dict[str, SupportResistanceTracker] = {}
+        self._tracker_locks: Dict[str, threading.Lock] = {}  # tarama ve sürekli tarama aynı takipçiyi günceller
+        self._tracker_locks_guard = threading.Lock()
+        self.smart_filter = SmartFilterSystem(self.cfg)
+        self.stage_stats = StageStats(min_samples=self.cfg.get('stage_stats_min_samples', 20))
+        self.rejection_telemetry = RejectionTelemetry(capacity=self.cfg.get('telemetry_capacity', 4096))
+        self.symbol_sectors = sector_map(self.cfg.get('market_sector_members', {}))
+
+    @classmethod
+    def analysis_worker(cls, cfg, market: MarketAnalysis, relative_strength=None,
+                        sector_markets: Optional[Dict[str, MarketAnalysis]] = None) -> 'SwingHunterUltimate':
+        """
+        Process havuzu worker'ı için sadece analiz bileşenleriyle kurulan örnek.
+        Ağ bağlantısı, log dosyası ve piyasa servisi oluşturulmaz; veri ana process'ten gelir.
+        """
+        hunter = cls.__new__(cls)
+        hunter.cfg = freeze_config(cfg)
+        hunter._init_analyzers()
+        hunter.market_analysis = market
+        hunter.sector_markets = sector_markets or {}
+        hunter.relative_strength = relative_strength
+        hunter.stop_scan = False
+        return hunter
+
+    def update_config(self, updates: Dict):
+        """
+        Yeni config snapshot'ı oluştur ve config'ten kurulan analizörleri yeniden oluştur.
+        Devam eden tarama eski (değişmeyen) nesnelerle tamamlanır.
+        """
+        self.cfg = self.cfg.with_updates(updates)
+        self.smart_filter = SmartFilterSystem(self.cfg)
+        self.backtester = RealisticBacktester(self.cfg)
+        self.parallel_scanner.max_workers = self.cfg.get('max_workers', 4)
+        return self.cfg
+
+    def safe_api_call(self, symbol, exchange, interval, n_bars, use_cache=True, deadline: Optional[Deadline] = None):
+        """
+        Interval artık tvDatafeed.Interval enum olmalı! use_cache=False: cache okunmaz (sonuç yine yazılır)
+        deadline: bekleme ve denemeler kalan süreyle sınırlı - aşılırsa DeadlineExceeded, durdurulursa ScanCancelled
+        """
         # Cache key için interval string'e çevrilmeli
         cache_key = interval if isinstance(interval, str) else str(interval)
-        cached = self.data_cache.get(symbol, cache_key, n_bars)
-        if cached is not None:
-            return cached
+        if use_cache:
+            cached = self.data_cache.get(symbol, cache_key, n_bars)
+            if cached is not None:
+                return cached
         
+        deadline = deadline or Deadline()
         for attempt in range(3):
             try:
-                time.sleep(random.uniform(0.1, 0.3))
-                data = self.tv.get_hist(symbol=symbol, exchange=exchange, interval=interval, n_bars=n_bars)
+                deadline.sleep(random.uniform(0.1, 0.3))
+                data = deadline.call(self.tv.get_hist, symbol=symbol, exchange=exchange, interval=interval, n_bars=n_bars)
                 if data is not None and not data.empty:
                     self.data_cache.set(symbol, cache_key, n_bars, data)
                     return data
+            except (DeadlineExceeded, ScanCancelled):
+                raise
             except Exception as e:
                 if attempt == 2:
                     logging.error(f"API hatası {symbol}: {e}")
         return None
 
     def analyze_market_condition(self):
-        """Piyasa durumu analizi - BIST100 - GÜVENLİ"""
-        if self.market_analysis is not None:
-            return self.market_analysis
+        """Piyasa durumu analizi - BIST100 (+ sektör endeksleri) - yenileme aralığı dolduysa günceller"""
         try:
-            bist_data = self.safe_api_call('XU100', 'BIST', Interval.in_daily, 100)
-            
-            # ✅ DÜZELTME: None kontrolü
-            if bist_data is None or len(bist_data) < 50:
-                self.market_analysis = _empty_market_analysis()
-                return self.market_analysis
-
-            df = calculate_indicators(bist_data)
-            latest = df.iloc[-1]
-
-            # Trend gücü
-            trend_strength = 0
-            if latest['close'] > latest['EMA20'] > latest['EMA50']:
-                trend_strength += 40
-            elif latest['close'] > latest['EMA20']:
-                trend_strength += 20
-            if latest.get('ADX', 0) > 25:
-                trend_strength += 30
-            elif latest.get('ADX', 0) > 20:
-                trend_strength += 15
-            if latest.get('MACD_Level', 0) > latest.get('MACD_Signal', 0):
-                trend_strength += 30
-            trend_strength = min(trend_strength, 100)
-
-            # Volatilite
-            returns = df['close'].pct_change().dropna()
-            volatility = returns.std() * (252 ** 0.5) * 100 if len(returns) > 1 else 25.0
-
-            # Hacim trendi
-            volume_trend = latest['volume'] / df['volume'].rolling(20).mean().iloc[-1] if 'volume' in df.columns else 1.0
-
-            # Piyasa skoru
-            vol_score = max(0, 100 - volatility * 2)
-            vol_trend_score = min(volume_trend * 50, 100)
-            market_score = (trend_strength * 0.4) + (vol_score * 0.3) + (vol_trend_score * 0.3)
-
-            # Rejim
-            if trend_strength >= 70 and volatility < 25:
-                regime = "bullish"
-            elif trend_strength <= 30 and volatility > 35:
-                regime = "bearish"
-            elif volatility > 40:
-                regime = "volatile"
-            elif 40 <= trend_strength <= 60 and volatility < 30:
-                regime = "sideways"
-            else:
-                regime = "neutral"
-
-            recommendations = {
-                "bullish": "🟢 AĞIRLIKLI ALIM",
-                "bearish": "🔴 DİKKATLİ ALIM",
-                "volatile": "🟡 SEÇİCİ ALIM",
-                "sideways": "🔵 DİKEY PAZAR",
-                "neutral": "⚪ NÖTR"
-            }
-            recommendation = recommendations.get(regime, "⚪ NÖTR")
-
-            self.market_analysis = MarketAnalysis(
-                regime=regime,
-                trend_strength=round(trend_strength, 1),
-                volatility=round(volatility, 1),
-                volume_trend=round(volume_trend, 2),
-                market_score=round(market_score, 1),
-                recommendation=recommendation
-            )
-            return self.market_analysis
+            snapshot = self.market_context.refresh_if_stale()
+            self.market_analysis = snapshot.market
+            self.sector_markets = snapshot.sectors
         except Exception as e:
             logging.error(f"Piyasa analizi hatası: {e}")
             self.market_analysis = _empty_market_analysis()
-            return self.market_analysis
+            self.sector_markets = {}
+        return self.market_analysis
 
-    def analyze_multi_timeframe(self, symbol: str, exchange: str) -> MultiTimeframeAnalysis:
+    def analyze_multi_timeframe(self, symbol: str, exchange: str, df_daily=None) -> MultiTimeframeAnalysis:
+        """
+        df_daily verilirse (tarayıcının indikatör tablosu) haftalık/aylık görünüm ondan türetilir -
+        ek ağ çağrısı yapılmaz.
+        """
+        if df_daily is not None:
+            return analyze_multi_timeframe_from_frame(df_daily, self.cfg.get('mtf_timeframes', ['weekly', 'monthly']))
         try:
             # Günlük veri
             df_daily = self.safe_api_call(symbol, exchange, Interval.in_daily, 100)
@@ -164,133 +179,512 @@ class SwingHunterUltimate:
             logging.error(f"MTF analiz hatası {symbol}: {e}")
             return MultiTimeframeAnalysis('unknown', 'unknown', False, 50.0, False, 'hold')
 
-    def process_symbol_advanced(self, symbol: str) -> Optional[Dict]:
+    def symbol_deadline(self) -> Deadline:
+        """Sembol için süre sınırı (symbol_timeout_seconds) - tarama süresini ve iptali devralır"""
+        return Deadline(self.cfg.get('symbol_timeout_seconds', 30), parent=self.scan_deadline)
+
+    def record_timeout(self, symbol: str, stage: str = 'fetch', report: bool = True):
+        """
+        Süre aşımına uğrayan sembolü red telemetrisine ve (report=True ise) tarama raporuna ekle.
+        Tarama dışı çağrılar (sürekli tarama servisi) kendi listesini tutar.
+        """
+        if report and symbol not in self.timed_out_symbols:
+            self.timed_out_symbols.append(symbol)
+        self.rejection_telemetry.record(symbol, stage, 'Zaman aşımı', threshold=self.cfg.get('symbol_timeout_seconds', 30))
+        logging.warning(f"⏱️ Zaman aşımı: {symbol} ({stage})")
+
+    def process_symbol_advanced(self, symbol: str, deadline: Optional[Deadline] = None) -> Optional[ScanResult]:
+        trace = StageTrace()
         try:
             if self.stop_scan:
                 return None
+            deadline = deadline or self.symbol_deadline()
             logging.info(f"🔍 {symbol} analiz ediliyor...")
 
-            # Piyasa analizi
-            if self.market_analysis is None:
-                self.market_analysis = self.analyze_market_condition()
-            
-            # ✅ DÜZELTME: Güvenlik kontrolü
-            if self.market_analysis is None:
-                self.market_analysis = _empty_market_analysis()
+            # Piyasa analizi - thread'ler aynı değişmez snapshot'ı kilitsiz okur
+            market = self.current_market()
 
             # Veri çek (GÜNLÜK)
-            df = self.safe_api_call(
+            df = trace.run(
+                'fetch', self.safe_api_call,
                 symbol,
                 self.cfg['exchange'],
                 Interval.in_daily,
-                self.cfg['lookback_bars']
+                self.cfg['lookback_bars'],
+                deadline=deadline
             )
-            if df is None or len(df) < 50:
-                return None
+            deadline.check()
+            return self.analyze_symbol(symbol, df, market, trace)
 
-            df = calculate_indicators(df)
-            if df.empty:
-                return None
-            latest = df.iloc[-1]
+        except DeadlineExceeded:
+            self.record_timeout(symbol)
+            return None
+        except ScanCancelled:
+            return None
+        except Exception as e:
+            logging.error(f"❌ {symbol} hatası: {e}")
+            return None
+        finally:
+            self.stage_stats.merge(trace)
+
+    def current_market(self) -> MarketAnalysis:
+        """Güncel piyasa snapshot'ı (yoksa yenilenir)"""
+        snapshot = self.market_context.current()
+        return snapshot.market if snapshot is not None else self.analyze_market_condition()
+
+    def symbol_market(self, symbol: str, market: MarketAnalysis) -> MarketAnalysis:
+        """Sembolün sektör endeksi (market_sector_members) analiz edildiyse onun rejimi, değilse genel piyasa"""
+        index = self.symbol_sectors.get(symbol)
+        return self.sector_markets.get(index, market) if index else market
+
+    def analyze_symbol(self, symbol: str, df, market: MarketAnalysis, trace: StageTrace) -> Optional[ScanResult]:
+        """Çekilmiş günlük veriden sembol analizi - ağ erişimi yok (process havuzunda da çalışır)"""
+        if df is None or len(df) < 50:
+            return None
+        market = self.symbol_market(symbol, market)
+
+        df = trace.run('indicators', calculate_indicators, df)
+        if df.empty:
+            return None
+        latest = df.iloc[-1]
+
+        if self.cfg.get('adaptive_stage_order', False):
+            return self._evaluate_adaptive(symbol, df, latest, market, trace)
+        return self._evaluate_fixed(symbol, df, latest, market, trace)
+
+    def _evaluate_fixed(self, symbol: str, df, latest, market, trace: StageTrace) -> Optional[ScanResult]:
+        """Sabit aşama sırası - tüm analizler skor ve risk kontrollerinden önce"""
+        # 1. Temel filtreler
+        if not trace.run('basic_filters', basic_filters, latest, self.cfg, df, self.rejection_telemetry, symbol):
+            trace.reject('basic_filters')
+            return None
+
+        # 2. Pattern analizi
+        patterns = trace.run('patterns', self.pattern_detector.analyze_patterns, df)
+        pattern_score = self.pattern_detector.get_pattern_score(patterns)
+
+        # 3. Destek / direnç (skorun PA bileşeni)
+        sr_levels = self._run_support_resistance(symbol, df, trace)
+
+        # 4. Skor
+        score = trace.run(
+            'trend_score', calculate_advanced_trend_score,
+            df, symbol, self.cfg,
+            market_analysis={'regime': market.regime, 'levels': sr_levels},
+            telemetry=self.rejection_telemetry
+        )
+        if not score['passed']:
+            trace.reject('trend_score')
+            return None
+
+        # 5. Stop / Target
+        stop_loss, target1, target2, rr_ratio, risk_pct = trace.run('stops', self._calculate_risk_levels, df, symbol, latest)
 
-            # 1. Temel filtreler
-            if not basic_filters(latest, self.cfg, df):
+        # 6-7. Validasyon + Trade Plan
+        trade = trace.run('risk', self._validate_and_plan, latest, stop_loss, target1, target2)
+        if trade is None:
+            trace.reject('risk')
+            return None
+
+        # 8. Smart Filter
+        smart_score = None
+        if self.cfg.get('use_smart_filter', True):
+            passed, smart_score, _ = trace.run(
+                'smart_filter', self.smart_filter.evaluate_stock,
+                df, latest, {'rr_ratio': rr_ratio, 'risk_pct': risk_pct}, symbol
+            )
+            if not passed:
+                trace.reject('smart_filter')
                 return None
 
-            # 2. Pattern analizi
-            patterns = self.pattern_detector.analyze_patterns(df)
-            pattern_score = self.pattern_detector.get_pattern_score(patterns)
+        # 9. Bağlam analizleri - sadece tüm kapılardan geçen semboller için
+        context = self._run_context_analyses(symbol, df, trace)
+
+        return self._build_result(symbol, latest, market, score, smart_score, patterns, pattern_score,
+                                  stop_loss, target1, target2, rr_ratio, risk_pct, trade, context)
+
+    def _evaluate_adaptive(self, symbol: str, df, latest, market, trace: StageTrace) -> Optional[ScanResult]:
+        """
+        Uyarlanabilir aşama sırası - ucuz ve seçici kapılar önce çalışır,
+        S/R, pattern ve MTF sadece bu kapılardan geçen semboller için yapılır.
+        """
+        regime = market.regime
+        use_sr = self.cfg.get('use_support_resistance', True)
+        stop_loss, target1, target2, rr_ratio, risk_pct = trace.run('stops', self._calculate_risk_levels, df, symbol, latest)
+        state = {'smart_score': None}
+
+        def trend_gate():
+            # S/R ertelendiği için destek fiyatta kabul edilir (PA bileşeni en yüksek).
+            # Bu üst sınır geçemiyorsa gerçek skor da geçemez.
+            levels = {'nearest_support': latest['close']} if use_sr else {}
+            state['score'] = calculate_advanced_trend_score(
+                df, symbol, self.cfg, market_analysis={'regime': regime, 'levels': levels},
+                telemetry=self.rejection_telemetry
+            )
+            return state['score']['passed']
+
+        def risk_gate():
+            state['trade'] = self._validate_and_plan(latest, stop_loss, target1, target2)
+            return state['trade'] is not None
 
-            # 3. Analizler
-            fib_analysis = calculate_fibonacci_levels(df) if self.cfg.get('use_fibonacci', True) else {}
-            sr_levels = self.sr_finder.find_levels(df) if self.cfg.get('use_support_resistance', True) else {}
-            breakout_info = self.sr_finder.check_breakout(df, sr_levels) if sr_levels else {'breakout': False}
-            consolidation = detect_consolidation_pattern(df) if self.cfg.get('use_consolidation', True) else ConsolidationPattern(False,0,0,'',0,0,0)
-            mtf_analysis = self.analyze_multi_timeframe(symbol, self.cfg['exchange']) if self.cfg.get('use_multi_timeframe', True) else MultiTimeframeAnalysis('unknown','unknown',False,50.0,False,'hold')
+        def smart_gate():
+            passed, state['smart_score'], _ = self.smart_filter.evaluate_stock(
+                df, latest, {'rr_ratio': rr_ratio, 'risk_pct': risk_pct}, symbol
+            )
+            return passed
+
+        gates = {
+            'basic_filters': lambda: basic_filters(latest, self.cfg, df, self.rejection_telemetry, symbol),
+            'trend_score': trend_gate,
+            'risk': risk_gate
+        }
+        if self.cfg.get('use_smart_filter', True):
+            gates['smart_filter'] = smart_gate
+
+        for stage in self.stage_stats.order_gates(list(gates)):
+            if not trace.run(stage, gates[stage]):
+                trace.reject(stage)
+                return None
 
-            # 4. Skor
-            score = calculate_advanced_trend_score(
+        # Pahalı analizler - ucuz kapılardan geçen semboller için
+        patterns = trace.run('patterns', self.pattern_detector.analyze_patterns, df)
+        pattern_score = self.pattern_detector.get_pattern_score(patterns)
+
+        score = state['score']
+        if use_sr:
+            sr_levels = self._run_support_resistance(symbol, df, trace)
+            score = trace.run(
+                'trend_score_exact', calculate_advanced_trend_score,
                 df, symbol, self.cfg,
-                market_analysis={'regime': self.market_analysis.regime, 'levels': sr_levels}
+                market_analysis={'regime': regime, 'levels': sr_levels}
             )
-            
-            total_score = min(score['total_score'] + pattern_score * 0.5, 100)
-            
             if not score['passed']:
+                # Üst sınır geçtiği için fark sadece gerçek destek mesafesinden gelir
+                self.rejection_telemetry.record(symbol, 'trend_score', 'Price Action (Destek Yakınlığı)',
+                                                score['total_score'], self.cfg.get('min_trend_score', 40))
+                trace.reject('trend_score_exact')
                 return None
 
-            # 5. Stop / Target
-            stop_loss, target1, target2 = _calculate_stops_targets(df, symbol, self.cfg)
-            if stop_loss is None or stop_loss >= latest['close']:
-                stop_loss = latest['close'] * 0.95
-                risk = latest['close'] - stop_loss
-                target1 = latest['close'] + risk * 2
-                target2 = latest['close'] + risk * 3
+        context = self._run_context_analyses(symbol, df, trace)
 
-            rr_ratio = (target1 - latest['close']) / (latest['close'] - stop_loss) if stop_loss < latest['close'] else 0
-            risk_pct = ((latest['close'] - stop_loss) / latest['close']) * 100
+        return self._build_result(symbol, latest, market, score, state['smart_score'], patterns, pattern_score,
+                                  stop_loss, target1, target2, rr_ratio, risk_pct, state['trade'], context)
 
-            # 6. Validasyon
-            validation = validate_trade_parameters(latest['close'], stop_loss, target1, target2, self.cfg)
-            if not validation['valid']:
-                return None
-            
-            # 7. Trade Plan
-            trade = calculate_trade_plan(latest['close'], stop_loss, target1, target2, self.cfg, self.cfg.get('initial_capital', 10000))
-            if trade is None:
-                return None
+    def _run_support_resistance(self, symbol: str, df, trace: StageTrace) -> Dict:
+        """Destek/direnç seviyeleri ve kırılım kontrolü"""
+        if not self.cfg.get('use_support_resistance', True):
+            return {}
+        if self.cfg.get('use_sr_tracker', True):
+            sr_levels = trace.run('support_resistance', self._tracked_levels, symbol, df)
+        else:
+            sr_levels = trace.run('support_resistance', self.sr_finder.find_levels, df)
+        if sr_levels:
+            trace.run('breakout', self.sr_finder.check_breakout, df, sr_levels)
+        return sr_levels
+
+    def _tracked_levels(self, symbol: str, df) -> Dict:
+        """Sembolün artımlı S/R takipçisini güncelle (bellekte yoksa cache'ten yüklenir) - sembol başına kilitli"""
+        with self._tracker_locks_guard:
+            lock = self._tracker_locks.setdefault(symbol, threading.Lock())
+        with lock:
+            tracker = self.sr_trackers.get(symbol)
+            if tracker is None:
+                tracker = self.data_cache.get_state(symbol, 'sr_tracker') or SupportResistanceTracker()
+                self.sr_trackers[symbol] = tracker
+            previous = (tracker.last_timestamp, tracker.last_bar)
+            levels = tracker.update(df, self.sr_finder)
+            if (tracker.last_timestamp, tracker.last_bar) != previous:
+                self.data_cache.set_state(symbol, 'sr_tracker', tracker)
+            return levels
+
+    def _run_context_analyses(self, symbol: str, df, trace: StageTrace) -> Dict:
+        """Fibonacci, konsolidasyon ve MTF analizleri - sonuç kaydına bilgi alanı olarak yazılır (kapalıysa None)"""
+        fib_analysis = trace.run('fibonacci', calculate_fibonacci_levels, df) if self.cfg.get('use_fibonacci', True) else None
+        consolidation = trace.run('consolidation', detect_consolidation_pattern, df) if self.cfg.get('use_consolidation', True) else None
+        mtf_analysis = trace.run('mtf', self.analyze_multi_timeframe, symbol, self.cfg['exchange'], df) if self.cfg.get('use_multi_timeframe', True) else None
+        return {'fibonacci': fib_analysis, 'consolidation': consolidation, 'mtf': mtf_analysis}
+
+    def _calculate_risk_levels(self, df, symbol: str, latest):
+        """Stop/hedef seviyeleri, R/R ve risk yüzdesi"""
+        stop_loss, target1, target2 = _calculate_stops_targets(df, symbol, self.cfg)
+        if stop_loss is None or stop_loss >= latest['close']:
+            stop_loss = latest['close'] * 0.95
+            risk = latest['close'] - stop_loss
+            target1 = latest['close'] + risk * 2
+            target2 = latest['close'] + risk * 3
+
+        rr_ratio = (target1 - latest['close']) / (latest['close'] - stop_loss) if stop_loss < latest['close'] else 0
+        risk_pct = ((latest['close'] - stop_loss) / latest['close']) * 100
+        return stop_loss, target1, target2, rr_ratio, risk_pct
+
+    def _validate_and_plan(self, latest, stop_loss, target1, target2):
+        """Validasyon + trade planı - geçersizse None"""
+        validation = validate_trade_parameters(latest['close'], stop_loss, target1, target2, self.cfg)
+        if not validation['valid']:
+            return None
+        return calculate_trade_plan(latest['close'], stop_loss, target1, target2, self.cfg, self.cfg.get('initial_capital', 10000))
+
+    def _build_result(self, symbol, latest, market, score, smart_score, patterns, pattern_score,
+                      stop_loss, target1, target2, rr_ratio, risk_pct, trade, context) -> ScanResult:
+        total_score = min(score['total_score'] + pattern_score * 0.5, 100)
+        if smart_score is not None:
+            total_score = max(total_score, smart_score)
+
+        # Göreceli güç: evren ortalamasının (50) üstü/altı skora eklenir
+        rs_score = self._relative_strength_score(symbol)
+        if rs_score is not None:
+            total_score = min(max(total_score + (rs_score - 50) * self.cfg.get('rs_score_weight', 0.1), 0), 100)
+
+        # 10. Sonuç - sayısal kayıt, biçimlendirme gösterimde
+        close = float(latest['close'])
+        mtf, consolidation, fib = context['mtf'], context['consolidation'], context['fibonacci']
+        fib_entry = find_fibonacci_entry_zone(fib['levels'], close)['entry_zone'] if fib else None
+        return ScanResult(
+            symbol=symbol,
+            price=close,
+            score=float(total_score),
+            pattern_score=pattern_score,
+            patterns=tuple(p for p, d in patterns.items() if d),
+            entry=close,
+            stop_loss=float(stop_loss),
+            target1=float(target1),
+            target2=float(target2),
+            rr_ratio=float(rr_ratio),
+            risk_pct=float(risk_pct),
+            shares=int(trade.shares),
+            investment=trade.shares * close,
+            market_regime=market.regime,
+            market_score=float(market.market_score),
+            rs_score=rs_score,
+            mtf=mtf.recommendation if mtf is not None else "",
+            consolidation=consolidation.breakout_type if consolidation is not None and consolidation.detected else "",
+            fib_entry=float(fib_entry) if fib_entry is not None else None
+        )
 
-            # 8. Smart Filter
-            if self.cfg.get('use_smart_filter', True):
-                passed, smart_score, _ = self.smart_filter.evaluate_stock(
-                    df, latest, {'rr_ratio': rr_ratio, 'risk_pct': risk_pct}, symbol
-                )
-                if not passed:
-                    return None
-                total_score = max(total_score, smart_score)
+    def _relative_strength_score(self, symbol: str) -> Optional[float]:
+        """Son taramanın RS tablosundan sembol skoru (tablo yoksa None)"""
+        table = self.relative_strength
+        if table is None or table.empty or symbol not in table.index:
+            return None
+        value = table.at[symbol, 'RS_Score']
+        return None if value != value else float(value)
 
-            # 9. Sonuç
-            signal_strength = "🔥 Güçlü" if total_score >= 75 else "⚡ Orta"
-            if pattern_score >= 15:
-                signal_strength = "🎯 " + signal_strength
+    def allocate_candidates(self, results: List[ScanResult]) -> List[ScanResult]:
+        """
+        Geçen tüm adaylara sermayeyi portföy olarak dağıt - pozisyon / yatırım
+        toplam sermaye, risk bütçeleri ve korelasyon sınırına göre yeniden yazılır.
+        """
+        capital = self.cfg.get('initial_capital', 10000)
+        candidates = pd.DataFrame({
+            'entry': [r.entry for r in results],
+            'stop': [r.stop_loss for r in results],
+            'score': [r.score for r in results]
+        }, index=[r.symbol for r in results])
+
+        correlations = None
+        if len(results) > 1:
+            if set(candidates.index) <= set(self.risk_model.symbols):
+                correlations = self.risk_model.correlation()
+            else:
+                frames = {symbol: self._fetch_daily(symbol, 'allocation') for symbol in candidates.index}
+                correlations = correlation_matrix(close_matrix(frames), self.cfg.get('correlation_window', 60))
+
+        allocation = allocate_portfolio(
+            candidates, capital,
+            max_position_pct=self.cfg.get('max_position_size_pct', 25.0),
+            max_risk_pct=self.cfg.get('max_risk_pct', 2.0),
+            max_total_risk_pct=self.cfg.get('max_portfolio_risk_pct', 6.0),
+            max_positions=self.cfg.get('max_open_positions', 10),
+            max_correlation=self.cfg.get('max_position_correlation', 0.8),
+            min_position_pct=self.cfg.get('min_position_pct', 2.0),
+            correlations=correlations
+        )
+        logging.info(f"💼 Portföy dağıtımı: {summarize_allocation(allocation, capital)}")
+        if self.cfg.get('use_portfolio_risk', True) and self.risk_model.symbols:
+            weights = (allocation['investment'] / capital).to_dict()
+            self.portfolio_risk = portfolio_risk(
+                self.risk_model.covariance(), weights,
+                max_contribution_pct=self.cfg.get('max_risk_contribution_pct', 35.0),
+                max_pair_correlation=self.cfg.get('max_position_correlation', 0.8)
+            )
+            logging.info(f"📉 Portföy volatilitesi: %{self.portfolio_risk.volatility_pct:.1f} (yıllık), "
+                         f"efektif pozisyon: {self.portfolio_risk.effective_positions:.1f}")
+            for warning in self.portfolio_risk.warnings:
+                logging.warning(f"⚠️ Portföy riski: {warning}")
 
-            return {
-                'Hisse': symbol,
-                'Fiyat': f"{latest['close']:.2f}",
-                'Sinyal': signal_strength,
-                'Skor': f"{int(total_score)}/100",
-                'Pattern Skor': f"{pattern_score}/20",
-                'Bullish Patternler': ", ".join([p for p, d in patterns.items() if d]) or "Yok",
-                'Optimal Giriş': f"{latest['close']:.2f}",
-                'Stop Loss': f"{stop_loss:.2f}",
-                'Hedef 1': f"{target1:.2f}",
-                'Hedef 2': f"{target2:.2f}",
-                'R/R': f"1:{rr_ratio:.1f}",
-                'Risk %': f"{risk_pct:.1f}",
-                'Pozisyon': f"{trade.shares} adet",
-                'Yatırım': f"{trade.shares * latest['close']:,.0f} TL",
-                'Piyasa': self.market_analysis.regime.title(),
-                'Piyasa Skoru': f"{self.market_analysis.market_score:.0f}/100"
-            }
+        return [result.replace(shares=int(shares), investment=float(investment), allocation=reason)
+                for result, shares, investment, reason in zip(
+                    results, allocation['shares'], allocation['investment'], allocation['reason'])]
+
+    def _fetch_daily(self, symbol: str, stage: str, cancel_event=None):
+        """
+        Tarama sırasında günlük veri - sembol süre sınırıyla; aşılırsa veya durdurulursa None (sembol atlanır).
+        cancel_event verilirse tarama yerine bu olay iptal eder (ör. sürekli tarama servisi).
+        """
+        if cancel_event is not None:
+            deadline = Deadline(self.cfg.get('symbol_timeout_seconds', 30), cancel_event=cancel_event)
+        else:
+            deadline = self.symbol_deadline()
+        try:
+            return self.safe_api_call(symbol, self.cfg['exchange'], Interval.in_daily, self.cfg['lookback_bars'],
+                                      deadline=deadline)
+        except DeadlineExceeded:
+            self.record_timeout(symbol, stage, report=cancel_event is None)
+        except ScanCancelled:
+            pass
+        return None
 
+    def rank_universe(self, symbols: List[str], cancel_event=None):
+        """
+        Evren seviyesindeki tarama başı hesaplar - kapanışlar cache'ten tek matrise hizalanır,
+        RS sıralaması ve kovaryans modeli aynı matristen güncellenir.
+        """
+        def load(symbol):
+            if cancel_event.is_set() if cancel_event is not None else self.stop_scan:
+                return symbol, None
+            return symbol, self._fetch_daily(symbol, 'rank', cancel_event)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.cfg.get('max_workers', 4)) as executor:
+            frames = {symbol: df for symbol, df in executor.map(load, symbols) if df is not None and not df.empty}
+        closes = close_matrix(frames)
+        if self.cfg.get('use_relative_strength', True):
+            self.rank_relative_strength(closes, cancel_event)
+        if self.cfg.get('use_portfolio_risk', True):
+            self.update_risk_model(closes)
+
+    def update_risk_model(self, closes):
+        """Evren kovaryansını yeni barlarla artımlı güncelle ve durumu cache'e yaz"""
+        try:
+            previous = self.risk_model.last_timestamp
+            self.risk_model.update(closes)
+            if self.risk_model.last_timestamp != previous:
+                self.data_cache.set_state('_universe', 'covariance', self.risk_model)
         except Exception as e:
-            logging.error(f"❌ {symbol} hatası: {e}")
-            return None
+            logging.error(f"Kovaryans güncelleme hatası: {e}")
+            self.risk_model = RollingCovariance(window=self.cfg.get('correlation_window', 60))
+
+    def rank_relative_strength(self, closes, cancel_event=None):
+        """
+        Tüm evren için kesitsel RS sıralaması (closes: tarih x sembol kapanış matrisi).
+        Tablo referansı atomik olarak değiştirilir, tarama thread'leri kilitsiz okur.
+        """
+        benchmark = self._fetch_daily(self.market_context.benchmark, 'rank', cancel_event)
+        table = rank_relative_strength(
+            closes, benchmark,
+            horizons=self.cfg.get('rs_horizons', list(RS_HORIZONS)),
+            weights=self.cfg.get('rs_weights', list(RS_WEIGHTS))
+        )
+        self.relative_strength = table
+        if not table.empty:
+            leaders = table['RS_Score'].nlargest(5).round(0).to_dict()
+            logging.info(f"💪 Göreceli güç: {len(table)} sembol sıralandı - Liderler: {leaders}")
+        return table
+
+    def _load_indicator_frames(self, symbols: List[str], progress_callback=None) -> Dict:
+        """Sembollerin günlük verisini (cache üzerinden) çek ve indikatörleri hesapla"""
+        def load(symbol):
+            if self.stop_scan:
+                return symbol, None
+            df = self._fetch_daily(symbol, 'prescreen')
+            if df is None or len(df) < 50:
+                return symbol, None
+            return symbol, calculate_indicators(df)
 
-    def run_advanced_scan(self, symbols: List[str], progress_callback=None):
+        frames = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.cfg.get('max_workers', 4)) as executor:
+            for i, (symbol, df) in enumerate(executor.map(load, symbols), 1):
+                if progress_callback:
+                    progress_callback(int(i / len(symbols) * 100), f"Ön tarama {i}/{len(symbols)} - {symbol}")
+                if df is not None and not df.empty:
+                    frames[symbol] = df
+        return frames
+
+    def prescreen_universe(self, symbols: List[str], progress_callback=None) -> List[str]:
+        """
+        Evren ön taraması - temel filtreleri tüm semboller için tek seferde uygular.
+        S/R, pattern ve MTF gibi pahalı analizler sadece geçen semboller için çalışır.
+        Geçen semboller indikatörleri tarama sırasında yeniden hesaplar; bu yüzden varsayılan kapalıdır
+        (elenme oranı yüksek büyük evrenlerde açılır).
+        """
+        frames = self._load_indicator_frames(symbols, progress_callback)
+        universe = build_universe_frame(frames)
+        survivors, rejections = screen_universe(universe, self.cfg)
+        if not rejections.empty:
+            # Telemetri: her elenen sembol için ilk başarısız kontrol (basic_filters sırası)
+            self.rejection_telemetry.evaluated('prescreen', len(rejections))
+            failed = rejections[rejections.any(axis=1)]
+            for symbol, reason in failed.idxmax(axis=1).items():
+                self.rejection_telemetry.record(symbol, 'prescreen', reason)
+            reject_rates = (rejections.mean() * 100).round(1).to_dict()
+            logging.info(f"🧹 Ön tarama: {len(survivors)}/{len(symbols)} sembol geçti - Red oranları: {reject_rates}")
+        return survivors
+
+    def run_advanced_scan(self, symbols: List[str], progress_callback=None, result_callback=None):
+        """
+        Tam tarama. result_callback(sonuç) her uygun sembol için hazır olduğu anda çağrılır
+        (tahsis öncesi satır); dönüşte skora göre en iyi scan_top_k sonuç tahsisle birlikte verilir.
+        """
+        self.rejection_telemetry.reset()
+        self.stop_scan = False
+        self._stop_event.clear()
+        self.timed_out_symbols = []
+        self.scan_deadline = Deadline(self.cfg.get('scan_timeout_seconds', 0), cancel_event=self._stop_event)
+        self.analyze_market_condition()
+        if (self.cfg.get('use_relative_strength', True) or self.cfg.get('use_portfolio_risk', True)) and len(symbols) > 10:
+            self.rank_universe(symbols)
+        if self.cfg.get('use_universe_prescreen', False) and len(symbols) > 10:
+            symbols = self.prescreen_universe(symbols, progress_callback)
         if self.cfg.get('use_parallel_scan', True) and len(symbols) > 10:
-            return self.parallel_scanner.scan_parallel(symbols, progress_callback)
+            output = self.parallel_scanner.scan_parallel(symbols, progress_callback, result_callback)
         else:
-            results = []
+            results = TopKResults(self.cfg.get('scan_top_k', 200))
             for i, sym in enumerate(symbols):
                 if self.stop_scan:
                     break
                 if progress_callback:
                     progress_callback(int((i+1)/len(symbols)*100), f"{i+1}/{len(symbols)} - {sym}")
-                res = self.process_symbol_advanced(sym)
+                res = self.process_symbol_advanced(sym, self.symbol_deadline())
                 if res:
-                    results.append(res)
-            return {"Swing Uygun": sorted(results, key=lambda x: float(x['Skor'].split('/')[0]), reverse=True)}
+                    results.push(res)
+                    if result_callback:
+                        result_callback(res)
+            output = {"Swing Uygun": results.items()}
+        if self.cfg.get('use_portfolio_allocation', True) and output.get("Swing Uygun"):
+            output["Swing Uygun"] = self.allocate_candidates(output["Swing Uygun"])
+        logging.info(f"⏱️ Aşama istatistikleri: {self.stage_stats.format_summary()}")
+        logging.info(f"🚫 Red telemetrisi: {self.rejection_telemetry.format_summary()}")
+        if self.timed_out_symbols:
+            logging.warning(f"⏱️ Zaman aşımına uğrayan {len(self.timed_out_symbols)} sembol: "
+                            f"{', '.join(sorted(self.timed_out_symbols))}")
+        if self.cfg.get('debug_mode', False):
+            for record in self.rejection_telemetry.recent(self.cfg.get('debug_rejection_limit', 50)):
+                logging.info(f"   ❌ {record.symbol} [{record.stage}] {record.reason}: "
+                              f"{record.value} (eşik: {record.threshold})")
+        return output
+
+    def start_rescan(self, symbols: List[str], on_change=None) -> RescanService:
+        """
+        Gün içi sürekli taramayı başlat - ilk tur tüm sembolleri değerlendirir, sonrakiler sadece
+        son barı değişenleri. on_change(WatchlistChange) listeye giren / çıkan / değişen adaylarla çağrılır.
+        """
+        self.stop_rescan()
+        self.rescan_service = RescanService(
+            self, symbols,
+            interval_minutes=self.cfg.get('rescan_interval_minutes', 5),
+            on_change=on_change,
+            max_workers=self.cfg.get('fetch_workers', self.cfg.get('max_workers', 4))
+        )
+        # RS / kovaryans ön geçişi servisin durdurma olayıyla iptal edilebilir
+        if (self.cfg.get('use_relative_strength', True) or self.cfg.get('use_portfolio_risk', True)) and len(symbols) > 10:
+            self.rank_universe(symbols, self.rescan_service.cancel_event)
+        self.rescan_service.start()
+        logging.info(f"🔁 Sürekli tarama başladı: {len(symbols)} sembol")
+        return self.rescan_service
+
+    def stop_rescan(self):
+        if self.rescan_service is not None:
+            self.rescan_service.stop()
+            self.rescan_service = None
 
     # ✅ YENİ METOD: Backtest için
     def run_backtest(self, symbols: List[str], days: int = 180) -> Dict:
@@ -515,7 +909,7 @@ class SwingHunterUltimate:
         from datetime import datetime
         if not results.get("Swing Uygun"):
             return None
-        df = pd.DataFrame(results["Swing Uygun"])
+        df = results_frame(results["Swing Uygun"])
         filename = f"Swing_Rapor_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
         df.to_excel(filename, index=False)
         return filename
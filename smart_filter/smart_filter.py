@@ -3,24 +3,26 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple
 from core.types import FilterScore, MarketRegime
+from core.universe import column_values
+from core.utils import FrozenDict, freeze_config
 
 class SmartFilterSystem:
-    """Akıllı filtre sistemi - ağırlıklı skorlama"""
+    """Akıllı filtre sistemi - ağırlıklı skorlama (değiştirilemez ayarlar, durumsuz)"""
     def __init__(self, config):
-        self.config = config
-        self.weights = {
+        self.config = freeze_config(config)
+        self.weights = FrozenDict({
             'trend': 30,
             'momentum': 25,
             'volume': 20,
             'volatility': 15,
             'risk': 10
-        }
-        self.min_total_score = config.get('min_total_score', 60)
-        self.min_category_scores = {
+        })
+        self.min_total_score = self.config.get('min_total_score', 60)
+        self.min_category_scores = FrozenDict({
             'trend': 15,
             'momentum': 10,
             'volume': 8,
-        }
+        })
 
     def detect_market_regime(self, market_data: pd.DataFrame) -> MarketRegime:
         if market_data is None or len(market_data) < 50:
@@ -76,6 +78,13 @@ class SmartFilterSystem:
             }
         return adjustments
 
+    @staticmethod
+    def _feature(df: pd.DataFrame, latest: pd.Series, column: str, compute):
+        """Önceden hesaplanmış özellik sütununu kullan, yoksa df'ten hesapla"""
+        if column in latest:
+            return latest[column]
+        return compute(df)
+
     def calculate_trend_score(self, df: pd.DataFrame, latest: pd.Series) -> FilterScore:
         score = 0.0; max_score = 30.0; details = {}
         ema_score = 4 if latest['close'] > latest.get('EMA20', 0) else 0
@@ -84,8 +93,8 @@ class SmartFilterSystem:
         details['ema_alignment'] = ema_score
         score += ema_score
 
-        ema20_slope = df['EMA20'].pct_change(5).iloc[-1] * 100 if 'EMA20' in df.columns else 0
-        ema50_slope = df['EMA50'].pct_change(5).iloc[-1] * 100 if 'EMA50' in df.columns else 0
+        ema20_slope = self._feature(df, latest, 'EMA20_Slope_5', lambda d: d['EMA20'].pct_change(5).iloc[-1] * 100 if 'EMA20' in d.columns else 0)
+        ema50_slope = self._feature(df, latest, 'EMA50_Slope_5', lambda d: d['EMA50'].pct_change(5).iloc[-1] * 100 if 'EMA50' in d.columns else 0)
         slope_score = 0
         if ema20_slope > 0.05: slope_score += 5
         elif ema20_slope > 0: slope_score += 2
@@ -115,8 +124,8 @@ class SmartFilterSystem:
         macd_score = 0
         if macd_level > macd_signal:
             macd_score += 4
-            if macd_hist > 0 and len(df) > 1:
-                prev_hist = df['MACD_Hist'].iloc[-2]
+            if macd_hist > 0:
+                prev_hist = self._feature(df, latest, 'MACD_Hist_Prev', lambda d: d['MACD_Hist'].iloc[-2] if len(d) > 1 else np.nan)
                 if macd_hist > prev_hist:
                     macd_score += 4
         details['macd'] = {'level': macd_level, 'signal': macd_signal}
@@ -141,12 +150,14 @@ class SmartFilterSystem:
         score += vol_score
 
         volume_trend_score = 0
-        if 'volume' in df.columns and len(df) >= 20:
-            vol_ma10 = df['volume'].rolling(10).mean()
-            vol_ma20 = df['volume'].rolling(20).mean()
+        bar_count = len(df) if df is not None else latest.get('Bar_Count', 20)
+        if 'volume' in latest and bar_count >= 20:
+            # ta_manager'ın hesapladığı ortalamalar (20+ barda rolling(10/20) ile aynı)
+            vol_ma10 = self._feature(df, latest, 'Volume_10d_Avg', lambda d: d['volume'].rolling(10).mean().iloc[-1])
+            vol_ma20 = self._feature(df, latest, 'Volume_20d_Avg', lambda d: d['volume'].rolling(20).mean().iloc[-1])
             current_vol = latest.get('volume', 0)
-            if current_vol > vol_ma10.iloc[-1]: volume_trend_score += 4
-            if vol_ma10.iloc[-1] > vol_ma20.iloc[-1]: volume_trend_score += 4
+            if current_vol > vol_ma10: volume_trend_score += 4
+            if vol_ma10 > vol_ma20: volume_trend_score += 4
         details['volume_trend'] = volume_trend_score > 0
         score += volume_trend_score
 
@@ -223,6 +234,89 @@ class SmartFilterSystem:
 
         return passed, total_weighted_score, report
 
+    def evaluate_universe(self, universe: pd.DataFrame, detail_symbols: List[str] = None) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Toplu skorlama - tüm adayları önceden hesaplanmış özellik sütunlarından tek seferde skorlar.
+
+        universe: Sembol başına bir satır (build_universe_frame). Opsiyonel 'rr_ratio' ve
+        'risk_pct' sütunları risk kategorisinde kullanılır.
+        detail_symbols: Detay raporu istenen semboller (ör. son kısa liste). Diğerleri için
+        FilterScore / detay sözlüğü oluşturulmaz.
+        Dönüş: (kategori skorları tablosu, {sembol: evaluate_stock raporu})
+        """
+        if universe is None or universe.empty:
+            return pd.DataFrame(), {}
+
+        col = lambda name, default: column_values(universe, name, default)
+        close = col('close', 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Trend
+            ema20, ema50 = col('EMA20', 0), col('EMA50', 0)
+            above_ema20 = close > ema20
+            ema20_slope, ema50_slope = col('EMA20_Slope_5', 0), col('EMA50_Slope_5', 0)
+            adx = col('ADX', 0)
+            trend = (np.where(above_ema20, 4, 0) + np.where(above_ema20 & (ema20 > ema50), 6, 0) +
+                     np.select([ema20_slope > 0.05, ema20_slope > 0], [5, 2], 0) +
+                     np.select([ema50_slope > 0.02, ema50_slope > 0], [5, 2], 0) +
+                     np.select([adx > 30, adx > 25, adx > 20], [10, 7, 4], 0))
+
+            # Momentum
+            rsi = col('RSI', 50)
+            macd_up = col('MACD_Level', 0) > col('MACD_Signal', 0)
+            macd_hist = col('MACD_Hist', 0)
+            weekly, daily = col('Weekly_Change_Pct', 0), col('Daily_Change_Pct', 0)
+            momentum = (np.select([(40 <= rsi) & (rsi <= 60), (35 <= rsi) & (rsi <= 65), (30 <= rsi) & (rsi <= 70)], [10, 7, 4], 0) +
+                        np.where(macd_up, 4, 0) +
+                        np.where(macd_up & (macd_hist > 0) & (macd_hist > col('MACD_Hist_Prev', np.nan)), 4, 0) +
+                        np.where((0 < weekly) & (weekly <= 15), 4, 0) +
+                        np.where((-3 < daily) & (daily <= 5), 3, 0))
+
+            # Hacim
+            rel_volume = col('Relative_Volume', 1.0)
+            volume = np.select([rel_volume >= 1.5, rel_volume >= 1.2, rel_volume >= 1.0], [12, 9, 6], 0)
+            if 'volume' in universe.columns:
+                enough_history = col('Bar_Count', 20) >= 20
+                vol_ma10, vol_ma20 = col('Volume_10d_Avg', np.nan), col('Volume_20d_Avg', np.nan)
+                volume = (volume + np.where(enough_history & (col('volume', 0) > vol_ma10), 4, 0) +
+                          np.where(enough_history & (vol_ma10 > vol_ma20), 4, 0))
+
+            # Volatilite
+            atr_pct = np.where(close > 0, col('ATR14', 0) / close * 100, 0)
+            bb_width = col('BB_Width_Pct', 0)
+            volatility = (np.select([(1 <= atr_pct) & (atr_pct <= 4), (4 < atr_pct) & (atr_pct <= 6)], [7, 4], 0) +
+                          np.select([(5 <= bb_width) & (bb_width <= 20), (20 < bb_width) & (bb_width <= 30)], [8, 5], 2))
+
+            # Risk
+            rr_ratio, risk_pct = col('rr_ratio', 0), col('risk_pct', 100)
+            risk = (np.select([rr_ratio >= 3.0, rr_ratio >= 2.5, rr_ratio >= 2.0], [6, 5, 4], 0) +
+                    np.select([risk_pct <= 3, risk_pct <= 5, risk_pct <= 8], [4, 3, 1], 0))
+
+        max_scores = {'trend': 30.0, 'momentum': 25.0, 'volume': 20.0, 'volatility': 15.0, 'risk': 10.0}
+        scores = pd.DataFrame({
+            'trend': trend, 'momentum': momentum, 'volume': volume,
+            'volatility': volatility, 'risk': risk
+        }, index=universe.index).astype(float)
+        total = sum(scores[c] / max_scores[c] * self.weights[c] for c in max_scores)
+
+        critical = ((scores['trend'] >= self.min_category_scores.get('trend', 15)) &
+                    (scores['momentum'] >= self.min_category_scores.get('momentum', 10)) &
+                    (scores['volume'] >= self.min_category_scores.get('volume', 8)))
+        scores['total_score'] = total
+        scores['passed'] = (total >= self.min_total_score) & critical
+        scores['signal_quality'] = np.select(
+            [total >= 85, total >= 75, total >= 65, total >= 60],
+            ["🔥🔥🔥 Mükemmel", "🔥🔥 Çok Güçlü", "🔥 Güçlü", "⚡ Orta"], "⚠️ Zayıf"
+        )
+
+        reports = {}
+        for symbol in detail_symbols or []:
+            if symbol in universe.index:
+                row = universe.loc[symbol]
+                risk_reward = {k: row[k] for k in ('rr_ratio', 'risk_pct') if k in row}
+                reports[symbol] = self.evaluate_stock(None, row, risk_reward, symbol)[2]
+        return scores, reports
+
     def _determine_signal_quality(self, score: float) -> str:
         if score >= 85: return "🔥🔥🔥 Mükemmel"
         elif score >= 75: return "🔥🔥 Çok Güçlü"
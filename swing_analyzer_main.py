@@ -33,7 +33,7 @@ def test_enhanced_scanner():
     if results['Swing Uygun']:
         print("\n📊 İlk Sonuç:")
         first = results['Swing Uygun'][0]
-        for key, value in first.items():
+        for key, value in first.to_row().items():
             print(f"  {key}: {value}")
     
     return results
@@ -12,6 +12,7 @@ from PyQt5.QtCore import QObject, QThread, pyqtSignal, Qt
 from PyQt5.QtGui import QColor, QPixmap, QFont
 import pandas as pd
 import numpy as np
+from bisect import bisect_right
 from datetime import datetime
 import time
 
@@ -30,6 +31,7 @@ except ImportError:
 from tvDatafeed import TvDatafeed, Interval
 # YENİ: PyQtGraph chart
 from gui.chart_widget import SwingTradeChart
+from scanner.result_stream import results_frame
 
 # ============================================================================
 # Worker Sınıfları
@@ -38,6 +40,7 @@ from gui.chart_widget import SwingTradeChart
 class ScanWorker(QObject):
     finished = pyqtSignal(dict)
     progress = pyqtSignal(int, str)
+    result = pyqtSignal(object)  # ScanResult - hazır olduğu anda (tablo aşamalı dolar)
     error = pyqtSignal(str)
     
     def __init__(self, hunter, symbols):
@@ -61,7 +64,8 @@ class ScanWorker(QObject):
             
             results = self.hunter.run_advanced_scan(
                 self.symbols,
-                progress_callback=self.progress.emit
+                progress_callback=self.progress.emit,
+                result_callback=self.result.emit
             )
             
             if self.is_running:
@@ -1209,32 +1213,37 @@ class SwingGUIAdvancedPlus(QWidget):
     def save_settings(self):
         """Ayarları kaydet"""
         try:
+            # Config değiştirilemez - değişiklikler toplanıp yeni snapshot oluşturulur
+            updates = {}
+            
             # Sayısal ayarlar
             for key, spin in self.spin_widgets.items():
-                self.cfg[key] = spin.value()
+                updates[key] = spin.value()
             
             # Risk ayarları
             for key, spin in self.risk_spin_widgets.items():
-                self.cfg[key] = spin.value()
+                updates[key] = spin.value()
             
             # Checkbox ayarları
             for key, cb in self.check_widgets.items():
-                self.cfg[key] = cb.isChecked()
+                updates[key] = cb.isChecked()
             
             # Gelişmiş özellikler
             for key, cb in self.advanced_checkboxes.items():
-                self.cfg[key] = cb.isChecked()
+                updates[key] = cb.isChecked()
             
             # Semboller
             symbols = [
                 self.symbol_list_widget.item(i).text() 
                 for i in range(self.symbol_list_widget.count())
             ]
-            self.cfg['symbols'] = symbols
+            updates['symbols'] = symbols
             
             # Genel ayarlar
-            self.cfg['exchange'] = self.exchange_combo.currentText()
-            self.cfg['lookback_bars'] = self.lookback_spin.value()
+            updates['exchange'] = self.exchange_combo.currentText()
+            updates['lookback_bars'] = self.lookback_spin.value()
+            
+            self.cfg = self.hunter.update_config(updates)
             
             # Dosyaya kaydet
             with open('swing_config.json', 'w', encoding='utf-8') as f:
@@ -1270,6 +1279,8 @@ class SwingGUIAdvancedPlus(QWidget):
         self.run_btn.setText("⏳ Tarama Sürüyor...")
         self.progress_bar.setValue(0)
         self.results_table.setRowCount(0)
+        self.results_table.setSortingEnabled(False)  # Aşamalı eklemede satırlar skor sırasında tutulur
+        self.streamed_scores = []
         self.status_label.setText("🔍 Tarama başladı...")
         
         # Worker başlat
@@ -1283,6 +1294,7 @@ class SwingGUIAdvancedPlus(QWidget):
         self.scan_thread.finished.connect(self.scan_thread.deleteLater)
         
         self.scan_worker.progress.connect(self.update_progress)
+        self.scan_worker.result.connect(self.add_result_row)
         self.scan_worker.finished.connect(self.scan_finished)
         self.scan_worker.error.connect(self.scan_error)
         
@@ -1357,81 +1369,14 @@ class SwingGUIAdvancedPlus(QWidget):
                 # trade_info oluştur - GÜVENLİ OKUMA
                 trade_info = {}
                 
-                # Tablodan sembolü bul
-                for row in range(self.results_table.rowCount()):
-                    current_symbol = self.results_table.item(row, 0).text() if self.results_table.item(row, 0) else ""
-                    
-                    if current_symbol == symbol:
-                        try:
-                            # Sütun başlıklarını al
-                            headers = []
-                            for col in range(self.results_table.columnCount()):
-                                header_item = self.results_table.horizontalHeaderItem(col)
-                                if header_item:
-                                    headers.append(header_item.text())
-                            
-                            # Hangi sütunun ne olduğunu bul
-                            entry_col = -1
-                            stop_col = -1
-                            target_col = -1
-                            
-                            for i, header in enumerate(headers):
-                                if 'giriş' in header.lower():
-                                    entry_col = i
-                                elif 'stop' in header.lower():
-                                    stop_col = i
-                                elif 'hedef' in header.lower() and '1' in header:
-                                    target_col = i
-                            
-                            # Değerleri güvenli şekilde oku
-                            def safe_float_conversion(text):
-                                if not text:
-                                    return None
-                                # "96.98-100.94" formatı kontrolü
-                                if '-' in text:
-                                    parts = text.split('-')
-                                    try:
-                                        return (float(parts[0]) + float(parts[1])) / 2
-                                    except:
-                                        return None
-                                # Normal float dönüşümü
-                                try:
-                                    return float(text)
-                                except ValueError:
-                                    # "/" karakteri içeriyorsa (örn: "0/20")
-                                    if '/' in text:
-                                        return None
-                                    # Diğer durumlar
-                                    return None
-                            
-                            # Entry fiyatı
-                            if entry_col >= 0:
-                                entry_item = self.results_table.item(row, entry_col)
-                                if entry_item:
-                                    entry_price = safe_float_conversion(entry_item.text())
-                                    if entry_price:
-                                        trade_info['entry_price'] = entry_price
-                            
-                            # Stop loss
-                            if stop_col >= 0:
-                                stop_item = self.results_table.item(row, stop_col)
-                                if stop_item:
-                                    stop_price = safe_float_conversion(stop_item.text())
-                                    if stop_price:
-                                        trade_info['stop_loss'] = stop_price
-                            
-                            # Hedef fiyat
-                            if target_col >= 0:
-                                target_item = self.results_table.item(row, target_col)
-                                if target_item:
-                                    target_price = safe_float_conversion(target_item.text())
-                                    if target_price:
-                                        trade_info['target_price'] = target_price
-                            
-                            break
-                            
-                        except Exception as e:
-                            logging.error(f"Trade info okuma hatası: {e}")
+                # Tablodan sembolün sonuç kaydını bul
+                result = next((r for r in self._table_results() if r.symbol == symbol), None)
+                if result is not None:
+                    trade_info = {
+                        'entry_price': result.entry,
+                        'stop_loss': result.stop_loss,
+                        'target_price': result.target1
+                    }
                 
                 # Grafik penceresini aç
                 chart_window = SwingTradeChart(data, symbol, trade_info)
@@ -1459,17 +1404,23 @@ class SwingGUIAdvancedPlus(QWidget):
         results_list = output.get('results', {}).get('Swing Uygun', [])
         market_analysis = output.get('market_analysis')
         
+        # Hücreler tek tek yazılır - sıralı tabloda yarım satırlar yer değiştirmesin
+        self.results_table.setSortingEnabled(False)
         if results_list:
             self.populate_table(results_list)
-            
+        self.results_table.setSortingEnabled(True)
+        
+        if results_list:
             # İlk hissenin grafiğini göster
             if results_list:
-                first_symbol = results_list[0]['Hisse']
+                first_symbol = results_list[0].symbol
                 self.generate_and_show_chart(first_symbol)
             
             msg = f"🎉 {len(results_list)} adet uygun hisse bulundu!"
             if market_analysis:
                 msg += f"\n📈 Piyasa Durumu: {market_analysis.regime.title()}"
+            if self.hunter.timed_out_symbols:
+                msg += f"\n⏱️ Zaman aşımı: {len(self.hunter.timed_out_symbols)} hisse (log'a bakın)"
             if output.get('excel_file'):
                 msg += f"\n📊 Excel Raporu: {output['excel_file']}"
             
@@ -1489,6 +1440,7 @@ class SwingGUIAdvancedPlus(QWidget):
         self.stop_btn.setEnabled(False)
         self.run_btn.setText("▶️ Taramayı Başlat")
         self.status_label.setText("❌ Hata oluştu!")
+        self.results_table.setSortingEnabled(True)
         
         logging.error(f"Tarama hatası: {error_message}")
         QMessageBox.critical(
@@ -1651,58 +1603,106 @@ class SwingGUIAdvancedPlus(QWidget):
         try:
             row = selected_items[0].row()
             
-            # Tablo sütunlarını kontrol et
-            column_count = self.results_table.columnCount()
-            
-            # Hangi sütunun hangi veri olduğunu bul
-            symbol_col = -1
-            entry_col = -1
-            stop_loss_col = -1
-            target1_col = -1
-            
-            for col in range(column_count):
-                header = self.results_table.horizontalHeaderItem(col).text()
-                if header == 'Hisse':
-                    symbol_col = col
-                elif header == 'Optimal Giriş':
-                    entry_col = col
-                elif header == 'Stop Loss':
-                    stop_loss_col = col
-                elif header == 'Hedef 1':
-                    target1_col = col
-            
-            if symbol_col == -1 or entry_col == -1 or stop_loss_col == -1 or target1_col == -1:
+            result = self._row_result(row)
+            if result is None:
                 return
             
-            # Değerleri al
-            symbol = self.results_table.item(row, symbol_col).text()
-            
-            # Optimal Giriş değerini al (aralık değil, tek değer)
-            entry_text = self.results_table.item(row, entry_col).text()
-            # Eğer aralık formatındaysa (96.98-100.94), ortasını al
-            if '-' in entry_text:
-                # "96.98-100.94" formatını ayır ve ortalamasını al
-                parts = entry_text.split('-')
-                if len(parts) == 2:
-                    entry_price = (float(parts[0]) + float(parts[1])) / 2
-                else:
-                    entry_price = float(parts[0])
-            else:
-                entry_price = float(entry_text)
-            
-            stop_loss = float(self.results_table.item(row, stop_loss_col).text())
-            target1 = float(self.results_table.item(row, target1_col).text())
-            
             # Grafik göster
-            self.show_selected_chart(self.results_table.item(row, symbol_col))
+            self.show_selected_chart(self.results_table.item(row, 0))
             
             # Trade detaylarını göster
-            self.show_trade_details(symbol, entry_price, stop_loss, target1)
+            self.show_trade_details(result.symbol, result.entry, result.stop_loss, result.target1)
             
         except Exception as e:
             logging.error(f"Tablo seçim hatası: {e}")
             QMessageBox.warning(self, "Hata", f"Veri okuma hatası:\n{str(e)}")
                 
+    def _row_result(self, row):
+        """Tablo satırının ScanResult kaydı (sembol hücresinde saklanır)"""
+        item = self.results_table.item(row, 0)
+        return item.data(Qt.UserRole) if item else None
+    
+    def _table_results(self):
+        """Tablodaki sonuçlar - görünen sırayla"""
+        results = (self._row_result(row) for row in range(self.results_table.rowCount()))
+        return [r for r in results if r is not None]
+    
+    def _fill_table_row(self, row_idx, result, headers):
+        """Tek satırı yaz ve renklendir - renkler sayısal alanlardan"""
+        row_data = result.to_row()
+        for col_idx, key in enumerate(headers):
+            value = str(row_data.get(key, ''))
+            item = QTableWidgetItem(value)
+            if col_idx == 0:
+                item.setData(Qt.UserRole, result)
+                
+            # Renklendirme - YENİ KRİTERLER EKLENDİ
+            if key == 'Skor':
+                score = int(result.score)
+                if score >= 85:
+                    item.setBackground(QColor(50, 205, 50))  # LimeGreen
+                    item.setForeground(QColor(255, 255, 255))
+                elif score >= 75:
+                    item.setBackground(QColor(144, 238, 144))  # LightGreen
+                elif score >= 65:
+                    item.setBackground(QColor(255, 255, 153))  # LightYellow
+                
+            elif key == 'Sinyal':
+                if '🔥🔥🔥' in value:
+                    item.setBackground(QColor(50, 205, 50))
+                    item.setForeground(QColor(255, 255, 255))
+                elif '🔥🔥' in value:
+                    item.setBackground(QColor(144, 238, 144))
+                elif '🎯' in value:
+                    item.setBackground(QColor(255, 215, 0))  # Gold
+                
+            elif key == 'Pattern Skor':
+                if result.pattern_score >= 15:
+                    item.setBackground(QColor(255, 182, 193))  # LightPink
+                    item.setForeground(QColor(139, 0, 0))  # DarkRed
+                elif result.pattern_score >= 10:
+                    item.setBackground(QColor(255, 228, 225))  # MistyRose
+                
+            elif key == 'Bullish Patternler' and value != 'Yok':
+                item.setBackground(QColor(230, 230, 250))  # Lavender
+                item.setFont(QFont('Arial', 9, QFont.Bold))
+                
+            elif key == 'R/R':
+                rr_value = round(result.rr_ratio, 1)  # gösterilen değerle aynı eşik
+                if rr_value >= 3.0:
+                    item.setBackground(QColor(152, 251, 152))  # PaleGreen
+                    item.setFont(QFont('Arial', 9, QFont.Bold))
+                elif rr_value >= 2.5:
+                    item.setBackground(QColor(144, 238, 144))
+                
+            elif key == 'Piyasa Skoru':
+                if round(result.market_score) >= 70:
+                    item.setBackground(QColor(135, 206, 250))  # LightSkyBlue
+                
+            self.results_table.setItem(row_idx, col_idx, item)
+    
+    def add_result_row(self, result):
+        """Tarama sürerken gelen sonucu skor sırasına göre tabloya ekle (en iyi scan_top_k satır tutulur)"""
+        if self.results_table.rowCount() == 0:
+            headers = list(result.to_row().keys())
+            self.results_table.setColumnCount(len(headers))
+            self.results_table.setHorizontalHeaderLabels(headers)
+        headers = [self.results_table.horizontalHeaderItem(i).text()
+                   for i in range(self.results_table.columnCount())]
+        
+        key = -result.score
+        row_idx = bisect_right(self.streamed_scores, key)
+        top_k = self.cfg.get('scan_top_k', 200)
+        if row_idx >= top_k:
+            return
+        self.streamed_scores.insert(row_idx, key)
+        self.results_table.insertRow(row_idx)
+        self._fill_table_row(row_idx, result, headers)
+        if len(self.streamed_scores) > top_k:
+            self.streamed_scores.pop()
+            self.results_table.removeRow(self.results_table.rowCount() - 1)
+        self.results_stats.setText(f"Sonuç: {len(self.streamed_scores)} hisse (tarama sürüyor...)")
+    
     def populate_table(self, data):
         """Tabloyu doldur - YENİ ÖZELLİKLER EKLENDİ"""
         if not data:
@@ -1710,78 +1710,14 @@ class SwingGUIAdvancedPlus(QWidget):
             return
         
         # Varsayılan sütunlar
-        if data and isinstance(data[0], dict):
-            headers = list(data[0].keys())
-        else:
-            return
+        headers = list(data[0].to_row().keys())
         
         self.results_table.setColumnCount(len(headers))
         self.results_table.setHorizontalHeaderLabels(headers)
         self.results_table.setRowCount(len(data))
         
-        for row_idx, row_data in enumerate(data):
-            for col_idx, key in enumerate(headers):
-                value = str(row_data.get(key, ''))
-                item = QTableWidgetItem(value)
-                
-                # Renklendirme - YENİ KRİTERLER EKLENDİ
-                if key == 'Skor':
-                    try:
-                        score = float(value.split('/')[0])
-                        if score >= 85:
-                            item.setBackground(QColor(50, 205, 50))  # LimeGreen
-                            item.setForeground(QColor(255, 255, 255))
-                        elif score >= 75:
-                            item.setBackground(QColor(144, 238, 144))  # LightGreen
-                        elif score >= 65:
-                            item.setBackground(QColor(255, 255, 153))  # LightYellow
-                    except:
-                        pass
-                
-                elif key == 'Sinyal':
-                    if '🔥🔥🔥' in value:
-                        item.setBackground(QColor(50, 205, 50))
-                        item.setForeground(QColor(255, 255, 255))
-                    elif '🔥🔥' in value:
-                        item.setBackground(QColor(144, 238, 144))
-                    elif '🎯' in value:
-                        item.setBackground(QColor(255, 215, 0))  # Gold
-                
-                elif key == 'Pattern Skor':
-                    try:
-                        pattern_score = float(value.split('/')[0])
-                        if pattern_score >= 15:
-                            item.setBackground(QColor(255, 182, 193))  # LightPink
-                            item.setForeground(QColor(139, 0, 0))  # DarkRed
-                        elif pattern_score >= 10:
-                            item.setBackground(QColor(255, 228, 225))  # MistyRose
-                    except:
-                        pass
-                
-                elif key == 'Bullish Patternler' and value != 'Yok':
-                    item.setBackground(QColor(230, 230, 250))  # Lavender
-                    item.setFont(QFont('Arial', 9, QFont.Bold))
-                
-                elif key == 'R/R':
-                    try:
-                        rr_value = float(value.split(':')[1])
-                        if rr_value >= 3.0:
-                            item.setBackground(QColor(152, 251, 152))  # PaleGreen
-                            item.setFont(QFont('Arial', 9, QFont.Bold))
-                        elif rr_value >= 2.5:
-                            item.setBackground(QColor(144, 238, 144))
-                    except:
-                        pass
-                
-                elif key == 'Piyasa Skoru':
-                    try:
-                        market_score = float(value.split('/')[0])
-                        if market_score >= 70:
-                            item.setBackground(QColor(135, 206, 250))  # LightSkyBlue
-                    except:
-                        pass
-                
-                self.results_table.setItem(row_idx, col_idx, item)
+        for row_idx, result in enumerate(data):
+            self._fill_table_row(row_idx, result, headers)
         
         self.results_table.resizeColumnsToContents()
         self.results_stats.setText(f"Sonuç: {len(data)} hisse")
@@ -1797,19 +1733,8 @@ class SwingGUIAdvancedPlus(QWidget):
                 QMessageBox.warning(self, "Uyarı", "Aktarılacak veri yok!")
                 return
             
-            data = []
-            headers = []
-            for col in range(self.results_table.columnCount()):
-                headers.append(self.results_table.horizontalHeaderItem(col).text())
-            
-            for row in range(self.results_table.rowCount()):
-                row_data = []
-                for col in range(self.results_table.columnCount()):
-                    item = self.results_table.item(row, col)
-                    row_data.append(item.text() if item else "")
-                data.append(row_data)
-            
-            df = pd.DataFrame(data, columns=headers)
+            # Sayısal sütunlarla - tablo metni yeniden ayrıştırılmaz
+            df = results_frame(self._table_results())
             filename = f"Swing_Advanced_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
             df.to_excel(filename, index=False)
             
@@ -1827,19 +1752,8 @@ class SwingGUIAdvancedPlus(QWidget):
                 QMessageBox.warning(self, "Uyarı", "Aktarılacak veri yok!")
                 return
             
-            data = []
-            headers = []
-            for col in range(self.results_table.columnCount()):
-                headers.append(self.results_table.horizontalHeaderItem(col).text())
-            
-            for row in range(self.results_table.rowCount()):
-                row_data = []
-                for col in range(self.results_table.columnCount()):
-                    item = self.results_table.item(row, col)
-                    row_data.append(item.text() if item else "")
-                data.append(row_data)
-            
-            df = pd.DataFrame(data, columns=headers)
+            # Sayısal sütunlarla - tablo metni yeniden ayrıştırılmaz
+            df = results_frame(self._table_results())
             filename = f"Swing_Advanced_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             df.to_csv(filename, index=False, encoding='utf-8-sig')
             